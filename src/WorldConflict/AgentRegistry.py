@@ -0,0 +1,66 @@
+from .IAgent import IAgent
+from .RandomAgent import RandomAgent
+from .MCTSAgent import MCTSAgent
+from functools import partial
+from importlib import import_module
+from inspect import signature
+from typing import Callable
+
+AgentFactory = Callable[[], IAgent]
+
+AGENTS: dict[str, AgentFactory] = {
+    "random": RandomAgent,
+    "mcts": MCTSAgent,
+    "mcts-belief": partial(MCTSAgent, beliefs=True),
+}
+
+def cfr_agent(tables: str) -> AgentFactory:
+    """Factory of CFRAgents playing the tables saved to a directory by train_cfr"""
+    # CFR needs numpy, it is only imported once a CFR agent is asked for
+    from .CFR import CFRAgent
+    return partial(CFRAgent, tables)
+
+# agents built from an argument, given on the command line as name=argument
+AGENTS_WITH_ARGUMENT: dict[str, Callable[[str], AgentFactory]] = {
+    "cfr": cfr_agent,
+}
+
+def resolve_agent(spec: str) -> AgentFactory:
+    """Finds the agent factory for a command line agent specification
+
+    Args:
+        spec (str):
+            Either a name registered in AGENTS, a name registered in AGENTS_WITH_ARGUMENT followed
+            by "=argument" (e.g. "cfr=tables" for CFR tables saved to the tables directory),
+            or a "package.module:ClassName" path to any IAgent implementation constructible without arguments
+
+    Returns:
+        AgentFactory: callable creating a fresh agent
+    """
+    if spec in AGENTS:
+        return AGENTS[spec]
+
+    name, separator, argument = spec.partition("=")
+    if separator:
+        if name not in AGENTS_WITH_ARGUMENT:
+            raise ValueError(f"Unknown agent '{name}', expected one of {sorted(AGENTS_WITH_ARGUMENT)} with an argument")
+        return AGENTS_WITH_ARGUMENT[name](argument)
+
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown agent '{spec}', expected one of {sorted(AGENTS)}, "
+                         f"{', '.join(f'{name}=argument' for name in sorted(AGENTS_WITH_ARGUMENT))} or module:ClassName")
+
+    factory = getattr(import_module(module_name), class_name)
+    if not (isinstance(factory, type) and issubclass(factory, IAgent)):
+        raise ValueError(f"'{spec}' is not an IAgent implementation")
+
+    return factory
+
+def create_agent(factory: AgentFactory, seed: int) -> IAgent:
+    """Creates an agent, passing the seed to factories that take a seed argument"""
+    try:
+        parameters = signature(factory).parameters
+    except (TypeError, ValueError):
+        return factory()
+    return factory(seed=seed) if "seed" in parameters else factory()
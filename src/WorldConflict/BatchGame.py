@@ -0,0 +1,387 @@
+from .GameState import GameState
+from .LegalMoves import LEGAL_MOVES, MONEY_BUCKETS, MOVE_SLOTS, JACK_COST, AFFAIR_COST, FORCED_AFFAIR
+from .Card import Card
+from .Move import Move
+import random
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("BatchGame needs numpy, an optional dependency installed with pip install numpy") from error
+
+CARD_TYPES = 5
+DECK_SIZE = 15
+MAX_SEQUENCE = 2
+ANY = Card.ANY.value
+
+FULL_DECK = np.array([Card.ACE.value, Card.KING.value, Card.QUEEN.value, Card.JACK.value, Card.TWO.value] * 3, dtype=np.int8)
+DEFAULT_DISCARD_ORDER = np.array([Card.TWO.value, Card.QUEEN.value, Card.JACK.value, Card.KING.value, Card.ACE.value], dtype=np.int8)
+
+# LEGAL_MOVE_TABLE[last_move, money_bucket, move]
+LEGAL_MOVE_TABLE = np.zeros((MOVE_SLOTS, MONEY_BUCKETS, MOVE_SLOTS), dtype=bool)
+for _last_move in range(MOVE_SLOTS):
+    for _bucket in range(MONEY_BUCKETS):
+        for _move in LEGAL_MOVES[_last_move][_bucket]:
+            LEGAL_MOVE_TABLE[_last_move, _bucket, _move.value] = True
+
+# card the claiming player must hold for a move not to be a bluff, -1 if it can't be challenged
+REQUIRED_CARD = np.full(MOVE_SLOTS, -1, dtype=np.int8)
+for _move, _card in [(Move.PLAY_ACE, Card.ACE), (Move.BLOCK_TWO_WITH_ACE, Card.ACE),
+                     (Move.PLAY_KING, Card.KING), (Move.BLOCK_PLUS_TWO_WITH_KING, Card.KING),
+                     (Move.BLOCK_JACK_WITH_QUEEN, Card.QUEEN), (Move.PLAY_JACK, Card.JACK),
+                     (Move.PLAY_TWO, Card.TWO), (Move.BLOCK_TWO_WITH_TWO, Card.TWO)]:
+    REQUIRED_CARD[_move.value] = _card.value
+
+_OK = Move.OK.value
+_CALL_BLUFF = Move.CALL_BLUFF.value
+_FORFEIT = Move.FORFEIT.value
+_NO_RESPONSE = -1
+
+class BatchGame:
+    """N independent games stored as NumPy arrays and stepped together
+
+    Follows the rules of Game.make_move, process_move, process_bluff and the
+    *_start handlers, but applies one move to every game per step. Discards are
+    not separate decisions: a player asked for a card gives the demanded card if
+    they hold it, otherwise the first card they hold in their discard order.
+    Games that end are dealt again immediately, like in Game.process_game_step.
+
+    State arrays, indexed by game first:
+        hands (N, 2, 5)      card counts per player
+        money (N, 2)
+        initial_player (N,)  player who started the current sequence
+        turn_player (N,)
+        sequence (N, 2)      move values, sequence_length (N,) of them are valid
+        draw_pile (N, 15)    card values, the top card is draw_pile[draw_length - 1]
+        discards (N, 5)      discarded card counts
+        score (N, 2)
+    """
+    num_games: int
+    rng: np.random.Generator
+    hands: np.ndarray
+    money: np.ndarray
+    initial_player: np.ndarray
+    turn_player: np.ndarray
+    sequence: np.ndarray
+    sequence_length: np.ndarray
+    draw_pile: np.ndarray
+    draw_length: np.ndarray
+    discards: np.ndarray
+    score: np.ndarray
+    exhausted: np.ndarray
+
+    def __init__(self, num_games: int, seed: int | None = None) -> None:
+        self.num_games = num_games
+        self.rng = np.random.default_rng(seed)
+        self.hands = np.zeros((num_games, 2, CARD_TYPES), dtype=np.int8)
+        self.money = np.zeros((num_games, 2), dtype=np.int16)
+        self.initial_player = np.zeros(num_games, dtype=np.int8)
+        self.turn_player = np.zeros(num_games, dtype=np.int8)
+        self.sequence = np.zeros((num_games, MAX_SEQUENCE), dtype=np.int8)
+        self.sequence_length = np.zeros(num_games, dtype=np.int8)
+        self.draw_pile = np.zeros((num_games, DECK_SIZE), dtype=np.int8)
+        self.draw_length = np.zeros(num_games, dtype=np.int8)
+        self.discards = np.zeros((num_games, CARD_TYPES), dtype=np.int8)
+        self.score = np.zeros((num_games, 2), dtype=np.int32)
+        self.exhausted = np.zeros(num_games, dtype=bool)
+        self._all = np.arange(num_games)
+        self.deal(self._all)
+
+    def deal(self, games: np.ndarray) -> None:
+        """Starts new games in the given slots, scores are kept"""
+        count = len(games)
+        piles = self.rng.permuted(np.broadcast_to(FULL_DECK, (count, DECK_SIZE)), axis=1)
+
+        self.hands[games] = 0
+        for dealt in range(4):
+            # cards are drawn from the end of the pile, alternating between the players
+            self.hands[games, dealt % 2, piles[:, DECK_SIZE - 1 - dealt]] += 1
+
+        self.draw_pile[games] = piles
+        self.draw_length[games] = DECK_SIZE - 4
+        self.money[games] = 2
+        self.initial_player[games] = self.rng.integers(0, 2, count)
+        self.turn_player[games] = self.initial_player[games]
+        self.sequence_length[games] = 0
+        self.discards[games] = 0
+
+    def last_moves(self) -> np.ndarray:
+        """Last move of every sequence, Move.OK for empty ones"""
+        last = self.sequence[self._all, np.maximum(self.sequence_length - 1, 0)]
+        return np.where(self.sequence_length > 0, last, _OK)
+
+    def money_buckets(self, money: np.ndarray) -> np.ndarray:
+        return (money >= JACK_COST).astype(np.int8) + (money >= AFFAIR_COST) + (money >= FORCED_AFFAIR)
+
+    def legal_move_mask(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Legal moves of the player to move in every game
+
+        Args:
+            out (np.ndarray | None): (N, 15) bool array to write into
+
+        Returns:
+            np.ndarray: (N, 15) bool array, column move.value is set for legal moves
+        """
+        turn_money = self.money[self._all, self.turn_player]
+        mask = LEGAL_MOVE_TABLE[self.last_moves(), self.money_buckets(turn_money)]
+        if out is None:
+            return mask
+        out[...] = mask
+        return out
+
+    def step(self, moves: np.ndarray, discard_order: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Makes one move in every game
+
+        Args:
+            moves (np.ndarray): (N,) move values for the player to move, illegal moves forfeit the game
+            discard_order (np.ndarray | None):
+                card values in the order players give them away, broadcastable to (N, 2, 5),
+                DEFAULT_DISCARD_ORDER if None
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                (N, 2) rewards, +1 for the winner and -1 for the loser of games that ended,
+                and (N,) flags of games that ended (and were dealt again)
+        """
+        moves = np.asarray(moves, dtype=np.int8)
+        if discard_order is None:
+            discard_order = DEFAULT_DISCARD_ORDER
+        self._order = np.broadcast_to(np.asarray(discard_order, dtype=np.intp), (self.num_games, 2, CARD_TYPES))
+        self.exhausted[:] = False
+
+        turn = self.turn_player.copy()
+        turn_money = self.money[self._all, turn]
+        valid = (moves >= 0) & (moves < MOVE_SLOTS)
+        legal = valid & LEGAL_MOVE_TABLE[self.last_moves(), self.money_buckets(turn_money), np.where(valid, moves, 0)]
+        moves = np.where(legal, moves, _FORFEIT)
+
+        initial_lost = np.zeros(self.num_games, dtype=bool)
+        responding_lost = np.zeros(self.num_games, dtype=bool)
+
+        forfeit = moves == _FORFEIT
+        turn_is_initial = turn == self.initial_player
+        initial_lost |= forfeit & turn_is_initial
+        responding_lost |= forfeit & ~turn_is_initial
+
+        push = ~forfeit & (moves != _OK) & (moves != _CALL_BLUFF)
+        games = self._all[push]
+        self.sequence[games, self.sequence_length[games]] = moves[games]
+        self.sequence_length[games] += 1
+        self.turn_player[games] ^= 1
+
+        self._resolve(self._all[moves == _OK], initial_lost, responding_lost)
+
+        self._process_bluff(self._all[moves == _CALL_BLUFF], turn, initial_lost, responding_lost)
+
+        resolved = (moves == _OK) | (moves == _CALL_BLUFF)
+        ended = initial_lost | responding_lost | self.exhausted
+        scored = ended & ~self.exhausted
+
+        initial = self.initial_player.astype(np.intp)
+        rewards = np.zeros((self.num_games, 2), dtype=np.float32)
+        won_initial = (scored & responding_lost).astype(np.int32)
+        won_responding = (scored & initial_lost).astype(np.int32)
+        self.score[self._all, initial] += won_initial
+        self.score[self._all, 1 - initial] += won_responding
+        rewards[self._all, initial] += won_initial - won_responding
+        rewards[self._all, 1 - initial] += won_responding - won_initial
+
+        games = self._all[resolved & ~ended]
+        self.initial_player[games] ^= 1
+        self.turn_player[games] = self.initial_player[games]
+        self.sequence_length[games] = 0
+
+        done = ended
+        self.deal(self._all[done])
+        return rewards, done
+
+    def _discard(self, games: np.ndarray, players: np.ndarray, preference: int) -> np.ndarray:
+        """Takes a card from every given player, returns flags of players with no card to give"""
+        held = self.hands[games, players] > 0
+        empty = ~held.any(axis=1)
+        order = self._order[games, players]
+        first = np.argmax(np.take_along_axis(held, order, axis=1), axis=1)
+        cards = order[np.arange(len(games)), first]
+        if preference != ANY:
+            cards = np.where(held[:, preference], preference, cards)
+
+        give = ~empty
+        self.hands[games[give], players[give], cards[give]] -= 1
+        self.discards[games[give], cards[give]] += 1
+        return empty
+
+    def _draw(self, games: np.ndarray, players: np.ndarray) -> None:
+        available = self.draw_length[games] > 0
+        self.exhausted[games[~available]] = True
+
+        games = games[available]
+        top = self.draw_length[games] - 1
+        self.hands[games, players[available], self.draw_pile[games, top]] += 1
+        self.draw_length[games] -= 1
+
+    def _give_money(self, games: np.ndarray, players: np.ndarray, amount: int) -> None:
+        self.money[games, players] += amount
+
+    def _take_money(self, games: np.ndarray, players: np.ndarray, amount: int) -> None:
+        self.money[games, players] = np.maximum(self.money[games, players] - amount, 0)
+
+    def _process_move(self, games: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Resolves the current sequence of the given games
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: forfeit flags of the initial and the responding players
+        """
+        initial_forfeit = np.zeros(len(games), dtype=bool)
+        responding_forfeit = np.zeros(len(games), dtype=bool)
+        if not len(games):
+            return initial_forfeit, responding_forfeit
+
+        start = self.sequence[games, 0]
+        response = np.where(self.sequence_length[games] == 2, self.sequence[games, 1], _NO_RESPONSE)
+        initial = self.initial_player[games].astype(np.intp)
+        responding = 1 - initial
+
+        def case(start_move: Move, response_move: Move | None) -> np.ndarray:
+            selected = start == start_move.value
+            if response_move is not None:
+                selected &= response == response_move.value
+            elif start_move in (Move.PLAY_TWO, Move.PLAY_JACK, Move.PLAY_PLUS_TWO):
+                selected &= response == _NO_RESPONSE
+            return np.flatnonzero(selected)
+
+        def discard(rows: np.ndarray, players: np.ndarray, preference: Card) -> np.ndarray:
+            return self._discard(games[rows], players[rows], preference.value)
+
+        def draw(rows: np.ndarray, players: np.ndarray) -> None:
+            self._draw(games[rows], players[rows])
+
+        for response_move, responding_card in [(Move.BLOCK_TWO_WITH_ACE, Card.ACE), (Move.BLOCK_TWO_WITH_TWO, Card.TWO)]:
+            rows = case(Move.PLAY_TWO, response_move)
+            initial_forfeit[rows] |= discard(rows, initial, Card.TWO)
+            draw(rows, initial)
+            responding_forfeit[rows] |= discard(rows, responding, responding_card)
+            draw(rows, responding)
+
+        rows = case(Move.PLAY_TWO, None)
+        initial_forfeit[rows] |= discard(rows, initial, Card.TWO)
+        draw(rows, initial)
+        self._give_money(games[rows], initial[rows], 2)
+        self._take_money(games[rows], responding[rows], 2)
+
+        rows = case(Move.PLAY_JACK, Move.BLOCK_JACK_WITH_QUEEN)
+        initial_forfeit[rows] |= discard(rows, initial, Card.JACK)
+        draw(rows, initial)
+        responding_forfeit[rows] |= discard(rows, responding, Card.QUEEN)
+        draw(rows, responding)
+
+        rows = case(Move.PLAY_JACK, None)
+        self._take_money(games[rows], initial[rows], 3)
+        initial_forfeit[rows] |= discard(rows, initial, Card.JACK)
+        draw(rows, initial)
+        responding_forfeit[rows] |= discard(rows, responding, Card.ANY)
+        responding_forfeit[rows] |= self.hands[games[rows], responding[rows]].sum(axis=1) == 0
+
+        rows = case(Move.PLAY_KING, None)
+        self._give_money(games[rows], initial[rows], 3)
+        initial_forfeit[rows] |= discard(rows, initial, Card.KING)
+        draw(rows, initial)
+
+        rows = case(Move.PLAY_ACE, None)
+        initial_forfeit[rows] |= discard(rows, initial, Card.ACE)
+        for _ in range(3):
+            draw(rows, initial)
+        initial_forfeit[rows] |= discard(rows, initial, Card.ANY)
+        initial_forfeit[rows] |= discard(rows, initial, Card.ANY)
+
+        rows = case(Move.PLAY_AFFAIR, None)
+        self._take_money(games[rows], initial[rows], 7)
+        responding_forfeit[rows] |= discard(rows, responding, Card.ANY)
+        responding_forfeit[rows] |= self.hands[games[rows], responding[rows]].sum(axis=1) == 0
+
+        rows = case(Move.PLAY_PLUS_ONE, None)
+        self._give_money(games[rows], initial[rows], 1)
+
+        rows = case(Move.PLAY_PLUS_TWO, Move.BLOCK_PLUS_TWO_WITH_KING)
+        responding_forfeit[rows] |= discard(rows, responding, Card.KING)
+        draw(rows, responding)
+
+        rows = case(Move.PLAY_PLUS_TWO, None)
+        self._give_money(games[rows], initial[rows], 2)
+
+        return initial_forfeit, responding_forfeit
+
+    def _process_bluff(self, games: np.ndarray, turn: np.ndarray, initial_lost: np.ndarray, responding_lost: np.ndarray) -> None:
+        """Resolves a bluff call in the given games, marking the losers in initial_lost and responding_lost"""
+        if not len(games):
+            return
+
+        caller = turn[games].astype(np.intp)
+        claimant = 1 - caller
+        last = self.sequence[games, self.sequence_length[games] - 1]
+        required = REQUIRED_CARD[last]
+        bluffed = (required >= 0) & (self.hands[games, claimant, np.maximum(required, 0)] == 0)
+
+        # the bluff is dropped from the sequence, whatever was played before it still happens
+        caught = games[bluffed]
+        self.sequence_length[caught] -= 1
+        self._resolve(caught[self.sequence_length[caught] > 0], initial_lost, responding_lost)
+        self._penalise(caught, claimant[bluffed], initial_lost, responding_lost)
+
+        honest = games[~bluffed]
+        self._resolve(honest, initial_lost, responding_lost)
+        self._penalise(honest, caller[~bluffed], initial_lost, responding_lost)
+
+    def _resolve(self, games: np.ndarray, initial_lost: np.ndarray, responding_lost: np.ndarray) -> None:
+        lost_initial, lost_responding = self._process_move(games)
+        initial_lost[games] |= lost_initial
+        responding_lost[games] |= lost_responding
+
+    def _penalise(self, games: np.ndarray, players: np.ndarray, initial_lost: np.ndarray, responding_lost: np.ndarray) -> None:
+        """The loser of a bluff call gives up a card, unless the game already ended"""
+        still_playing = ~(initial_lost[games] | responding_lost[games])
+        games = games[still_playing]
+        players = players[still_playing]
+
+        self._discard(games, players, ANY)
+        lost = self.hands[games, players].sum(axis=1) == 0
+        is_initial = players == self.initial_player[games]
+        initial_lost[games[lost & is_initial]] = True
+        responding_lost[games[lost & ~is_initial]] = True
+
+    def to_game_state(self, game: int, rng: random.Random | None = None) -> GameState:
+        """Copies one game into a GameState, hands and the discard pile are ordered by card value
+
+        Args:
+            game (int): index of the game
+            rng (random.Random | None): generator of the state, for the games played after it, seeded from the random module if None
+        """
+        state = GameState.blank(rng)
+        for player in range(2):
+            state.players[player].cards = [Card(value) for value in range(CARD_TYPES) for _ in range(self.hands[game, player, value])]
+            state.players[player].money = int(self.money[game, player])
+        state.initial_player = int(self.initial_player[game])
+        state.turn_player = int(self.turn_player[game])
+        state.current_sequence = [Move(int(value)) for value in self.sequence[game, :self.sequence_length[game]]]
+        state.deck.drawPile = [Card(int(value)) for value in self.draw_pile[game, :self.draw_length[game]]]
+        state.deck.discardPile = [Card(value) for value in range(CARD_TYPES) for _ in range(self.discards[game, value])]
+        state.deck.rehash()
+        state.score = [int(self.score[game, 0]), int(self.score[game, 1])]
+        return state
+
+    def load_game_state(self, game: int, state: GameState) -> None:
+        """Overwrites one game with the contents of a GameState"""
+        for player in range(2):
+            self.hands[game, player] = 0
+            for card in state.players[player].cards:
+                self.hands[game, player, card.value] += 1
+            self.money[game, player] = state.players[player].money
+        self.initial_player[game] = state.initial_player
+        self.turn_player[game] = state.turn_player
+        self.sequence_length[game] = len(state.current_sequence)
+        for position, move in enumerate(state.current_sequence):
+            self.sequence[game, position] = move.value
+        self.draw_length[game] = len(state.deck.drawPile)
+        self.draw_pile[game, :len(state.deck.drawPile)] = [card.value for card in state.deck.drawPile]
+        self.discards[game] = 0
+        for card in state.deck.discardPile:
+            self.discards[game, card.value] += 1
+        self.score[game] = state.score
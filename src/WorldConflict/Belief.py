@@ -0,0 +1,238 @@
+from .HandTables import POWERS, COUNTS, SIZES, COPIES, AliasSampler, consistent_hands, hand_index
+from .GameState import PlayerInfo
+from .Hand import CARD_TYPES
+from .Card import Card
+from .Move import Move
+from typing import Iterable
+
+# card the player making the move claims to hold
+CLAIMED_CARD = {
+    Move.PLAY_ACE: Card.ACE,
+    Move.BLOCK_TWO_WITH_ACE: Card.ACE,
+    Move.PLAY_KING: Card.KING,
+    Move.BLOCK_PLUS_TWO_WITH_KING: Card.KING,
+    Move.BLOCK_JACK_WITH_QUEEN: Card.QUEEN,
+    Move.PLAY_JACK: Card.JACK,
+    Move.PLAY_TWO: Card.TWO,
+    Move.BLOCK_TWO_WITH_TWO: Card.TWO,
+}
+
+class BeliefTracker:
+    """Posterior over the opponent's hand from one player's point of view
+
+    The cards the player has not seen are the full deck minus their hand and the discard pile.
+    Without other evidence every hand of the opponent's size drawn from them is as likely as
+    its number of deals (hypergeometric prior). Claims, discards and draws update the weights
+    incrementally, and the marginals are cached after every update, so holds and expected are O(1).
+
+    Claims are weighted by bluff_rate when the hand lacks the claimed card. A resolved claim reveals
+    the truth, since the claimed card must be given away if held. The discard pile does not say who
+    discarded a card, so the player's own discards have to be reported with gave.
+    """
+    player: int
+    bluff_rate: float
+    weights: dict[int, float]
+    unseen: list[int]
+    opponent_cards: int
+    _holds: list[float]
+    _expected: list[float]
+    _discards_seen: int
+    _score: tuple[int, int] | None
+    _given: list[Card]
+    _pending_claim: Card | None
+    _pending_move: Move | None
+
+    def __init__(self, player: int, bluff_rate: float = 0.3) -> None:
+        """
+        Args:
+            player (int): id of the player whose view is tracked
+            bluff_rate (float): likelihood of a claim when the claimed card is not held, relative to when it is
+        """
+        self.player = player
+        self.bluff_rate = bluff_rate
+        self.weights = {}
+        self.unseen = [COPIES] * CARD_TYPES
+        self.opponent_cards = 0
+        self._holds = [0.0] * CARD_TYPES
+        self._expected = [0.0] * CARD_TYPES
+        self._discards_seen = 0
+        self._score = None
+        self._given = []
+        self._pending_claim = None
+        self._pending_move = None
+
+    def holds(self, card: Card) -> float:
+        """Probability that the opponent holds at least one card of the rank"""
+        return self._holds[card._value_]
+
+    def expected(self, card: Card) -> float:
+        """Expected number of cards of the rank in the opponent's hand"""
+        return self._expected[card._value_]
+
+    def probability(self, cards: Iterable[Card]) -> float:
+        """Probability that the opponent's hand is exactly the given cards"""
+        return self.weights.get(hand_index(cards), 0.0)
+
+    def sampler(self) -> AliasSampler:
+        """Sampler of the opponent's hand index following the posterior, see HandTables.sample_deal"""
+        return AliasSampler(tuple(self.weights), tuple(self.weights.values()))
+
+    def reset(self, info: PlayerInfo) -> None:
+        """Starts over from the prior, at the beginning of a game or when the evidence became inconsistent"""
+        self._see(info)
+        self._discards_seen = len(info.discarded)
+        self._score = info.score
+        self._given.clear()
+        self._pending_claim = None
+        self._pending_move = None
+        self._prior()
+        self._claims(info)
+        self._normalize()
+
+    def gave(self, card: Card) -> None:
+        """Reports a card the player discarded since the last observation, only cards the game accepted"""
+        if card != Card.ANY:
+            self._given.append(card)
+
+    def observe(self, info: PlayerInfo) -> None:
+        """Brings the posterior up to date with a snapshot taken at one of the player's move decisions
+
+        Everything that happened since the previous snapshot is worked out from the difference:
+        the resolution of the opponent's last claim, their discards and the cards they drew.
+        Every claim of the opponent is answered by the player, so it is seen before it is carried out.
+        """
+        if self._score != info.score or len(info.discarded) < self._discards_seen:
+            self.reset(info)
+            return
+
+        discards = list(info.discarded[self._discards_seen:])
+        for card in self._given:
+            if card in discards:
+                discards.remove(card)
+        self._given.clear()
+        self._discards_seen = len(info.discarded)
+
+        claim = self._pending_claim
+        self._pending_claim = None
+        draws = info.players_card_num[self.player ^ 1] - self.opponent_cards + len(discards)
+        if claim is not None:
+            if draws and discards:
+                # the claim was carried out, its card was asked for first and given if held,
+                # then replaced by a draw (three for an ace, two of them are given back later)
+                first = discards.pop(0)
+                if first != claim:
+                    self.reveal(claim, False)
+                self.discard(first)
+                replaced = min(draws, 3 if self._pending_move == Move.PLAY_ACE else 1)
+                self.draw(replaced)
+                draws -= replaced
+            else:
+                # the bluff was called and caught, so the card was not held
+                self.reveal(claim, False)
+
+        for card in discards:
+            self.discard(card)
+        if draws > 0:
+            self.draw(draws)
+
+        self._see(info)
+        self._mask_unseen()
+        self._claims(info)
+        self._normalize()
+
+    def claim(self, card: Card) -> None:
+        """The opponent claimed to hold a card"""
+        self._scale(card, False, self.bluff_rate)
+
+    def reveal(self, card: Card, held: bool) -> None:
+        """It became known whether the opponent held a card"""
+        self._scale(card, not held, 0.0)
+
+    def discard(self, card: Card) -> None:
+        """The opponent gave a card away"""
+        power = POWERS[card._value_]
+        value = card._value_
+        weights = {}
+        for index, weight in self.weights.items():
+            if COUNTS[index][value]:
+                weights[index - power] = weight
+        self.weights = weights
+        self.opponent_cards -= 1
+        self.unseen[value] -= 1
+
+    def draw(self, count: int = 1) -> None:
+        """The opponent drew cards from the draw pile, which holds the unseen cards not in their hand"""
+        unseen = self.unseen
+        for _ in range(count):
+            weights = {}
+            for index, weight in self.weights.items():
+                counts = COUNTS[index]
+                for rank in range(CARD_TYPES):
+                    left = unseen[rank] - counts[rank]
+                    if left > 0:
+                        child = index + POWERS[rank]
+                        weights[child] = weights.get(child, 0.0) + weight * left
+            self.weights = weights
+            self.opponent_cards += 1
+
+    def _see(self, info: PlayerInfo) -> None:
+        unseen = [COPIES] * CARD_TYPES
+        for card in info.player.cards:
+            unseen[card._value_] -= 1
+        for card in info.discarded:
+            unseen[card._value_] -= 1
+        self.unseen = unseen
+        self.opponent_cards = info.players_card_num[self.player ^ 1]
+
+    def _prior(self) -> None:
+        """Hypergeometric weights of every hand of the opponent's size drawn from the unseen cards"""
+        unseen = 0
+        for rank in range(CARD_TYPES):
+            unseen += self.unseen[rank] * POWERS[rank]
+        hands, weights = consistent_hands(unseen, self.opponent_cards)
+        self.weights = dict(zip(hands, map(float, weights)))
+
+    def _claims(self, info: PlayerInfo) -> None:
+        """Weighs the opponent's claim, at a move decision the last move of the sequence is theirs"""
+        sequence = info.current_sequence
+        if sequence:
+            card = CLAIMED_CARD.get(sequence[-1])
+            if card is not None:
+                self.claim(card)
+                self._pending_claim = card
+                self._pending_move = sequence[-1]
+
+    def _scale(self, card: Card, holding: bool, factor: float) -> None:
+        """Multiplies the weights of the hands holding the card (or lacking it) by factor"""
+        value = card._value_
+        for index, weight in list(self.weights.items()):
+            if (COUNTS[index][value] > 0) == holding:
+                if factor:
+                    self.weights[index] = weight * factor
+                else:
+                    del self.weights[index]
+
+    def _mask_unseen(self) -> None:
+        unseen = self.unseen
+        size = self.opponent_cards
+        self.weights = {index: weight for index, weight in self.weights.items()
+                        if SIZES[index] == size and all(count <= left for count, left in zip(COUNTS[index], unseen))}
+
+    def _normalize(self) -> None:
+        total = sum(self.weights.values())
+        if total <= 0:
+            # the evidence contradicts the model, e.g. a bluff_rate of 0 and a bluff
+            self._prior()
+            total = sum(self.weights.values())
+
+        holds = [0.0] * CARD_TYPES
+        expected = [0.0] * CARD_TYPES
+        for index in self.weights:
+            weight = self.weights[index] = self.weights[index] / total
+            counts = COUNTS[index]
+            for rank in range(CARD_TYPES):
+                if counts[rank]:
+                    holds[rank] += weight
+                    expected[rank] += weight * counts[rank]
+        self._holds = holds
+        self._expected = expected
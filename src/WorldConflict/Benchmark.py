@@ -0,0 +1,191 @@
+from .Game import Game
+from .GameState import GameState, PlayerInfo
+from .CardDeck import CardDeck, DeckExhaustedError
+from .Simulation import Simulator
+from .RandomAgent import RandomAgent
+from .PackedState import pack_state, unpack_state
+from .Card import Card
+from .Move import Move
+from time import perf_counter
+from typing import Callable
+import platform
+import random
+
+# a benchmark gets a number of operations to run and returns the seconds the timed part took
+BenchmarkFunction = Callable[[int], float]
+
+def _fresh_states(packed: int, count: int) -> list[GameState]:
+    return [unpack_state(packed) for _ in range(count)]
+
+def _scenario(sequence: list[Move], turn_player: int, claimant_cards: list[Card]) -> int:
+    """Packed mid-game position where player 0 started the sequence"""
+    state = GameState(random.Random(0))
+    state.players[0].cards = claimant_cards
+    state.players[0].money = 4
+    state.players[1].cards = [Card.QUEEN, Card.TWO]
+    state.players[1].money = 4
+    state.initial_player = 0
+    state.turn_player = turn_player
+    state.current_sequence = sequence
+    state.deck.drawPile = [Card.ACE, Card.KING, Card.QUEEN, Card.JACK, Card.TWO, Card.ACE, Card.KING]
+    return pack_state(state)
+
+def _bench_game() -> Game:
+    return Game([RandomAgent(1), RandomAgent(2)], seed=0)
+
+def bench_process_game_step(iterations: int) -> float:
+    game = _bench_game()
+    start = perf_counter()
+    for _ in range(iterations):
+        try:
+            game.process_game_step()
+        except DeckExhaustedError:
+            game.new_game()
+    return perf_counter() - start
+
+def bench_make_move_push(iterations: int) -> float:
+    game = _bench_game()
+    states = _fresh_states(_scenario([], 0, [Card.TWO, Card.ACE]), iterations)
+    start = perf_counter()
+    for state in states:
+        game.game_state = state
+        game.make_move(Move.PLAY_TWO)
+    return perf_counter() - start
+
+def bench_make_move_resolve(iterations: int) -> float:
+    game = _bench_game()
+    states = _fresh_states(_scenario([Move.PLAY_KING], 1, [Card.KING, Card.ACE]), iterations)
+    start = perf_counter()
+    for state in states:
+        game.game_state = state
+        game.make_move(Move.OK)
+    return perf_counter() - start
+
+def bench_process_bluff(iterations: int) -> float:
+    game = _bench_game()
+    states = _fresh_states(_scenario([Move.PLAY_KING], 1, [Card.JACK, Card.ACE]), iterations)
+    start = perf_counter()
+    for state in states:
+        game.game_state = state
+        game.process_bluff()
+    return perf_counter() - start
+
+def bench_apply_undo(iterations: int) -> float:
+    game = _bench_game()
+    game.game_state = unpack_state(_scenario([Move.PLAY_TWO], 1, [Card.TWO, Card.ACE]))
+    start = perf_counter()
+    for _ in range(iterations):
+        game.apply(Move.CALL_BLUFF)
+        game.undo()
+    return perf_counter() - start
+
+def bench_player_info(iterations: int) -> float:
+    state = unpack_state(_scenario([Move.PLAY_TWO], 1, [Card.TWO, Card.ACE]))
+    start = perf_counter()
+    for _ in range(iterations):
+        PlayerInfo(state, 1)
+    return perf_counter() - start
+
+def bench_get_legal_moves(iterations: int) -> float:
+    inventory = unpack_state(_scenario([], 0, [Card.TWO, Card.ACE])).players[0]
+    last_moves = [Move.OK, Move.PLAY_TWO, Move.PLAY_JACK, Move.PLAY_PLUS_TWO] * (iterations // 4 + 1)
+    start = perf_counter()
+    for last_move in last_moves[:iterations]:
+        inventory.get_legal_moves(last_move)
+    return perf_counter() - start
+
+def bench_deck_draw(iterations: int) -> float:
+    decks = [CardDeck(random.Random(0)) for _ in range(iterations // 15 + 1)]
+    start = perf_counter()
+    remaining = iterations
+    for deck in decks:
+        for _ in range(min(15, remaining)):
+            deck.draw()
+        remaining -= 15
+    return perf_counter() - start
+
+def bench_deck_discard(iterations: int) -> float:
+    deck = CardDeck(random.Random(0))
+    cards = [Card.ACE, Card.KING, Card.QUEEN, Card.JACK, Card.TWO] * (iterations // 5 + 1)
+    start = perf_counter()
+    for card in cards[:iterations]:
+        deck.discard(card)
+    return perf_counter() - start
+
+def bench_random_games(iterations: int) -> float:
+    simulator = Simulator([RandomAgent(1), RandomAgent(2)], seed=0)
+    return simulator.run(iterations).elapsed
+
+# name: (benchmark, operations per repetition)
+BENCHMARKS: dict[str, tuple[BenchmarkFunction, int]] = {
+    "process_game_step": (bench_process_game_step, 20000),
+    "make_move_push": (bench_make_move_push, 20000),
+    "make_move_resolve": (bench_make_move_resolve, 20000),
+    "process_bluff": (bench_process_bluff, 20000),
+    "apply_undo": (bench_apply_undo, 20000),
+    "player_info": (bench_player_info, 50000),
+    "get_legal_moves": (bench_get_legal_moves, 100000),
+    "deck_draw": (bench_deck_draw, 100000),
+    "deck_discard": (bench_deck_discard, 100000),
+    "random_games": (bench_random_games, 2000),
+}
+
+def run_benchmarks(names: list[str] | None = None, repeat: int = 5, scale: float = 1.0) -> dict:
+    """Runs the benchmarks, keeping the fastest of the repetitions
+
+    Args:
+        names (list[str] | None): benchmarks to run, all of them if None
+        repeat (int): repetitions of each benchmark
+        scale (float): multiplier of the number of operations per repetition
+
+    Returns:
+        dict: JSON serialisable results
+    """
+    results = {}
+    for name in names or list(BENCHMARKS):
+        benchmark, operations = BENCHMARKS[name]
+        operations = max(1, int(operations * scale))
+        benchmark(max(1, operations // 10))
+        best = min(benchmark(operations) for _ in range(repeat))
+        results[name] = {
+            "operations": operations,
+            "ns_per_op": best / operations * 1e9,
+            "ops_per_sec": operations / best if best > 0 else float("inf"),
+        }
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float = 0.1) -> list[tuple[str, float, bool]]:
+    """Compares two runs of the suite
+
+    Args:
+        current (dict): results of run_benchmarks
+        baseline (dict): stored results to compare against
+        threshold (float): relative slowdown from which a benchmark counts as a regression
+
+    Returns:
+        list[tuple[str, float, bool]]: benchmark name, current/baseline speed ratio and whether it regressed
+    """
+    comparison = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        ratio = result["ops_per_sec"] / baseline["results"][name]["ops_per_sec"]
+        comparison.append((name, ratio, ratio < 1 - threshold))
+    return comparison
+
+def report(current: dict, comparison: list[tuple[str, float, bool]] | None = None) -> str:
+    ratios = {name: (ratio, regressed) for name, ratio, regressed in comparison or []}
+    lines = [f"{'benchmark':<20} {'ns/op':>12} {'ops/s':>14} {'vs baseline':>12}"]
+    for name, result in current["results"].items():
+        line = f"{name:<20} {result['ns_per_op']:>12.0f} {result['ops_per_sec']:>14.0f}"
+        if name in ratios:
+            ratio, regressed = ratios[name]
+            line += f" {ratio:>11.2f}x" + ("  REGRESSION" if regressed else "")
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,301 @@
+from .Game import Game
+from .GameState import GameState, PlayerInfo
+from .CardDeck import DeckExhaustedError
+from .PackedState import pack_inventory, MAX_MONEY, MAX_SEQUENCE
+from .LegalMoves import MOVE_SLOTS
+from .MCTSAgent import heuristic_discard, MAX_PLAYOUT_PLIES
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+import os
+import random
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("CFR needs numpy, an optional dependency installed with pip install numpy") from error
+
+_HAND_BITS = 15
+_OPPONENT_MONEY_SHIFT = _HAND_BITS
+_OPPONENT_CARDS_SHIFT = _OPPONENT_MONEY_SHIFT + 5
+_DISCARD_SHIFT = _OPPONENT_CARDS_SHIFT + 3
+_SEQUENCE_SHIFT = _DISCARD_SHIFT + 10
+_INITIAL_SHIFT = _SEQUENCE_SHIFT + 2 + MAX_SEQUENCE * 4
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+def info_set_key(info: PlayerInfo) -> int:
+    """Encodes what a player knows into 48 bits
+
+    Bits from the least significant one:
+        own hand: 5 card counts (2 bits each), own money (5 bits)
+        opponent's money (5 bits, capped), opponent's number of cards (3 bits)
+        discard pile: 5 card counts (2 bits each)
+        current sequence: length (2 bits), 3 moves (4 bits each)
+        whether the player started the sequence (1 bit)
+    The score and the order of the discards are left out, they do not change the rest of the game.
+    """
+    player = info.player
+    if player.money > MAX_MONEY:
+        player = player.copy()
+        player.money = MAX_MONEY
+    key = pack_inventory(player)
+
+    opponent = info.playerId ^ 1
+    key |= min(info.players_money[opponent], MAX_MONEY) << _OPPONENT_MONEY_SHIFT
+    key |= info.players_card_num[opponent] << _OPPONENT_CARDS_SHIFT
+
+    for card in info.discarded:
+        key += 1 << (_DISCARD_SHIFT + 2 * card.value)
+
+    sequence = info.current_sequence
+    key |= len(sequence) << _SEQUENCE_SHIFT
+    shift = _SEQUENCE_SHIFT + 2
+    for move in sequence:
+        key |= move.value << shift
+        shift += 4
+
+    return key | (info.initial_player == info.playerId) << _INITIAL_SHIFT
+
+class CFRTables:
+    """Regrets and average strategy sums of the information sets, in an open addressing hash table of NumPy arrays
+
+    Row i belongs to the information set with key keys[i] - 1 (0 marks an empty row), columns are move values.
+    With a directory the arrays are memory-mapped .npy files, so tables larger than the memory can be trained and reloaded.
+    """
+    keys: np.ndarray
+    regrets: np.ndarray
+    strategy_sums: np.ndarray
+    capacity: int
+    size: int
+    _shift: int
+
+    def __init__(self, capacity: int = 1 << 18, directory: str | None = None) -> None:
+        """
+        Args:
+            capacity (int): number of rows, rounded up to a power of two, ignored when loading existing tables
+            directory (str | None): where to keep memory-mapped tables, existing tables there are opened, in memory if None
+        """
+        capacity = 1 << max(0, capacity - 1).bit_length()
+        if directory is None:
+            self.keys = np.zeros(capacity, dtype=np.uint64)
+            self.regrets = np.zeros((capacity, MOVE_SLOTS), dtype=np.float32)
+            self.strategy_sums = np.zeros((capacity, MOVE_SLOTS), dtype=np.float32)
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self.keys = self._open(directory, "keys", (capacity,), np.uint64)
+            capacity = len(self.keys)
+            self.regrets = self._open(directory, "regrets", (capacity, MOVE_SLOTS), np.float32)
+            self.strategy_sums = self._open(directory, "strategy_sums", (capacity, MOVE_SLOTS), np.float32)
+
+        self.capacity = capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self.size = int(np.count_nonzero(self.keys))
+
+    @staticmethod
+    def _open(directory: str, name: str, shape: tuple[int, ...], dtype: type) -> np.ndarray:
+        path = os.path.join(directory, f"{name}.npy")
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r+")
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+    def find(self, key: int) -> int:
+        """Row of the information set, -1 if it was never stored"""
+        stored = key + 1
+        mask = self.capacity - 1
+        row = (((stored * _HASH_MULTIPLIER) & _MASK64) >> self._shift) & mask
+        keys = self.keys
+        while True:
+            found = int(keys[row])
+            if found == stored:
+                return row
+            if found == 0:
+                return -1
+            row = (row + 1) & mask
+
+    def row(self, key: int) -> int:
+        """Row of the information set, a new zeroed row is claimed for an unseen key"""
+        stored = key + 1
+        mask = self.capacity - 1
+        row = (((stored * _HASH_MULTIPLIER) & _MASK64) >> self._shift) & mask
+        keys = self.keys
+        while True:
+            found = int(keys[row])
+            if found == stored:
+                return row
+            if found == 0:
+                if 2 * (self.size + 1) > self.capacity:
+                    raise RuntimeError(f"CFR tables are full ({self.size} information sets), a larger capacity is needed")
+                keys[row] = stored
+                self.size += 1
+                return row
+            row = (row + 1) & mask
+
+    def average_strategy(self, row: int, legal_mask: np.ndarray) -> np.ndarray:
+        """Average strategy over the legal moves, uniform for a row without any weight"""
+        strategy = np.where(legal_mask, self.strategy_sums[row], 0.0)
+        total = strategy.sum()
+        if total <= 0:
+            return legal_mask / legal_mask.sum()
+        return strategy / total
+
+    def flush(self) -> None:
+        for table in (self.keys, self.regrets, self.strategy_sums):
+            if isinstance(table, np.memmap):
+                table.flush()
+
+def regret_matching(regrets: np.ndarray, legal_mask: np.ndarray) -> np.ndarray:
+    """Strategy proportional to the positive regrets, uniform over the legal moves if none is positive"""
+    positive = np.where(legal_mask, np.maximum(regrets, 0.0), 0.0)
+    total = positive.sum()
+    if total <= 0:
+        return legal_mask / legal_mask.sum()
+    return positive / total
+
+def _legal_mask(state: GameState) -> np.ndarray:
+    sequence = state.current_sequence
+    mask = np.zeros(MOVE_SLOTS, dtype=np.float64)
+    for move in state.players[state.turn_player].get_legal_moves(sequence[-1] if sequence else Move.OK):
+        mask[move.value] = 1.0
+    return mask
+
+class _DiscardAgent(IAgent):
+    """Discards are not part of the solved strategy, both seats use heuristic_discard"""
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        return heuristic_discard(state.player.cards, card_preference)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        raise RuntimeError("The trainer chooses the moves itself")
+
+class CFRTrainer:
+    """Outcome sampling Monte Carlo CFR over the rules of Game
+
+    Every iteration deals a new game and samples one path through it for each player in turn,
+    exploring the updated player's moves with probability exploration.
+    The path is walked with Game.apply and taken back with Game.undo.
+    With plus set, regrets are floored at zero after every update (regret matching+).
+    """
+    tables: CFRTables
+    exploration: float
+    plus: bool
+    rng: random.Random
+    game: Game
+    iterations: int
+
+    def __init__(self, tables: CFRTables | None = None, exploration: float = 0.6, plus: bool = True,
+                 seed: int | None = None) -> None:
+        """
+        Args:
+            tables (CFRTables | None): tables to train, new in memory tables if None
+            exploration (float): probability of a uniformly random move of the updated player
+            plus (bool): floor the regrets at zero
+            seed (int | None): seed of the deals and sampling, drawn from the random module if None
+        """
+        self.tables = tables if tables is not None else CFRTables()
+        self.exploration = exploration
+        self.plus = plus
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        agent = _DiscardAgent()
+        self.game = Game([agent, agent], seed=self.rng.getrandbits(64))
+        self.iterations = 0
+
+    def run(self, iterations: int) -> None:
+        for _ in range(iterations):
+            for player in range(2):
+                self.game.new_game()
+                state = self.game.game_state
+                self._walk(state, player, (state.score[0], state.score[1]), 1.0, 1.0, 1.0, 0)
+            self.iterations += 1
+        self.tables.flush()
+
+    def _utility(self, state: GameState, player: int, score_before: tuple[int, int]) -> float:
+        gained = state.score[player] - score_before[player] - (state.score[player ^ 1] - score_before[player ^ 1])
+        return float((gained > 0) - (gained < 0))
+
+    def _walk(self, state: GameState, update_player: int, score_before: tuple[int, int],
+              my_reach: float, opponent_reach: float, sample_reach: float, depth: int) -> float:
+        """Samples the rest of the game, returns the update player's utility estimate of the current position"""
+        if depth >= MAX_PLAYOUT_PLIES:
+            return 0.0
+
+        tables = self.tables
+        turn_player = state.turn_player
+        row = tables.row(info_set_key(PlayerInfo(state, turn_player)))
+        legal_mask = _legal_mask(state)
+        policy = regret_matching(tables.regrets[row], legal_mask)
+
+        if turn_player == update_player:
+            sample_policy = self.exploration * legal_mask / legal_mask.sum() + (1 - self.exploration) * policy
+        else:
+            sample_policy = policy
+
+        move_value = self.rng.choices(range(MOVE_SLOTS), weights=sample_policy)[0]
+
+        try:
+            ended = self.game.apply(Move(move_value))
+        except DeckExhaustedError:
+            self.game.undo()
+            child_value = 0.0
+        else:
+            if ended:
+                child_value = self._utility(state, update_player, score_before)
+            elif turn_player == update_player:
+                child_value = self._walk(state, update_player, score_before, my_reach * policy[move_value], opponent_reach,
+                                         sample_reach * sample_policy[move_value], depth + 1)
+            else:
+                child_value = self._walk(state, update_player, score_before, my_reach, opponent_reach * policy[move_value],
+                                         sample_reach * sample_policy[move_value], depth + 1)
+            self.game.undo()
+
+        child_values = np.zeros(MOVE_SLOTS)
+        child_values[move_value] = child_value / sample_policy[move_value]
+        value_estimate = float(policy @ child_values)
+
+        if turn_player == update_player:
+            regrets = tables.regrets[row]
+            regrets += (child_values - value_estimate) * legal_mask * (opponent_reach / sample_reach)
+            if self.plus:
+                np.maximum(regrets, 0.0, out=regrets)
+        else:
+            tables.strategy_sums[row] += policy * (opponent_reach / sample_reach)
+
+        return value_estimate
+
+class CFRAgent(IAgent):
+    """Plays the average strategy of trained CFR tables, unseen information sets are played uniformly"""
+    tables: CFRTables
+    rng: random.Random
+
+    def __init__(self, tables: CFRTables | str | None = None, seed: int | None = None) -> None:
+        """
+        Args:
+            tables (CFRTables | str | None): trained tables or the directory they were saved to, untrained tables if None
+            seed (int | None): seed of the move sampling, drawn from the random module if None
+        """
+        super().__init__()
+        if tables is None:
+            tables = CFRTables(capacity=1)
+        elif isinstance(tables, str):
+            tables = CFRTables(directory=tables)
+        self.tables = tables
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        return heuristic_discard(state.player.cards, card_preference)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+        legal_moves = state.player.get_legal_moves(last_move)
+        if len(legal_moves) == 1:
+            return legal_moves[0]
+
+        row = self.tables.find(info_set_key(state))
+        if row < 0:
+            return self.rng.choice(legal_moves)
+
+        legal_mask = np.zeros(MOVE_SLOTS)
+        for move in legal_moves:
+            legal_mask[move.value] = 1.0
+        strategy = self.tables.average_strategy(row, legal_mask)
+        return Move(self.rng.choices(range(MOVE_SLOTS), weights=strategy)[0])
@@ -1,20 +1,65 @@
 from .Card import Card
-from random import shuffle
+from .UndoLog import UndoLog, UNDO_DRAW, UNDO_DISCARD
+from .Zobrist import DRAW_KEYS, DISCARD_KEYS, MASK
+import random
+
+FULL_DECK = (Card.ACE, Card.KING, Card.QUEEN, Card.JACK, Card.TWO) * 3
+
+class DeckExhaustedError(RuntimeError):
+    """Raised when a card has to be drawn from an empty draw pile"""
+    pass
 
 class CardDeck:
+    """Draw pile and discard pile
+
+    zobrist hashes the order of the draw pile and the counts of the discard pile. draw, discard,
+    undraw and undiscard keep it up to date, after changing the piles directly call rehash.
+    """
     drawPile: list[Card]
     discardPile: list[Card]
+    rng: random.Random
+    draw_zobrist: int
+    discard_zobrist: int
+    journal: UndoLog | None = None
 
-    def __init__(self):
-        self.drawPile = [Card.ACE, Card.KING, Card.QUEEN, Card.JACK, Card.TWO] * 3
+    def __init__(self, rng: random.Random | None = None):
+        """Creates a shuffled deck
+
+        Args:
+            rng (random.Random | None): generator used for shuffling, seeded from the random module if None
+        """
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+        self.drawPile = list(FULL_DECK)
         self.discardPile = []
+        self.shuffle()
+
+    def reset(self) -> None:
+        """Puts all cards back into the draw pile and shuffles it, the order only depends on the state of rng"""
+        self.drawPile[:] = FULL_DECK
+        self.discardPile.clear()
+        self.shuffle()
+
+    @property
+    def zobrist(self) -> int:
+        return self.draw_zobrist ^ self.discard_zobrist
+
+    def rehash(self) -> int:
+        """Computes zobrist from scratch"""
+        draw_zobrist = 0
+        for position, card in enumerate(self.drawPile):
+            draw_zobrist ^= DRAW_KEYS[position % len(DRAW_KEYS)][card._value_]
+        self.draw_zobrist = draw_zobrist
+        self.discard_zobrist = sum(DISCARD_KEYS[card._value_] for card in self.discardPile) & MASK
+        return self.zobrist
 
     def draw(self) -> Card:
         if not self.drawPile:
-            print("No cards left to draw or reshuffle.")
-            raise RuntimeError
+            raise DeckExhaustedError("No cards left to draw or reshuffle.")
         
         drawnCard = self.drawPile.pop()
+        self.draw_zobrist ^= DRAW_KEYS[len(self.drawPile) % len(DRAW_KEYS)][drawnCard._value_]
+        if self.journal is not None:
+            self.journal.entries.append((UNDO_DRAW, self, drawnCard))
         # TODO consider if we should reshuffle after each game
         # if len(self.drawPile) == 1:
         #     self.drawPile.extend(self.discardPile)
@@ -23,8 +68,14 @@ class CardDeck:
 
         return drawnCard
 
+    def undraw(self, card: Card) -> None:
+        """Puts a drawn card back on top of the draw pile"""
+        self.draw_zobrist ^= DRAW_KEYS[len(self.drawPile) % len(DRAW_KEYS)][card._value_]
+        self.drawPile.append(card)
+
     def shuffle(self) -> None:
-        shuffle(self.drawPile)
+        self.rng.shuffle(self.drawPile)
+        self.rehash()
 
     def discard(self, discarded_card: Card) -> bool:
         """Adds card to discard pile
@@ -39,4 +90,13 @@ class CardDeck:
             return True
         
         self.discardPile.append(discarded_card)
+        self.discard_zobrist = (self.discard_zobrist + DISCARD_KEYS[discarded_card._value_]) & MASK
+        if self.journal is not None:
+            self.journal.entries.append((UNDO_DISCARD, self))
         return False
+
+    def undiscard(self) -> Card:
+        """Takes the last discarded card back"""
+        card = self.discardPile.pop()
+        self.discard_zobrist = (self.discard_zobrist - DISCARD_KEYS[card._value_]) & MASK
+        return card
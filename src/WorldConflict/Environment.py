@@ -0,0 +1,122 @@
+from .ResumableGame import ResumableGame, Decision, DISCARD_DECISION
+from .ObservationEncoder import encode, OBSERVATION_SIZE
+from .GameState import PlayerInfo
+from .LegalMoves import MOVE_SLOTS
+from .Hand import CARD_TYPES
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("Environment needs numpy, an optional dependency installed with pip install numpy") from error
+
+# actions below MOVE_SLOTS are move values, DISCARD_ACTION_OFFSET + card value gives a card away
+DISCARD_ACTION_OFFSET = MOVE_SLOTS
+ACTION_SIZE = MOVE_SLOTS + CARD_TYPES
+
+# after the ObservationEncoder features: 1 for a discard decision, one hot preferred card (Card.ANY included)
+DECISION_OFFSET = OBSERVATION_SIZE
+PREFERENCE_OFFSET = DECISION_OFFSET + 1
+ENVIRONMENT_OBSERVATION_SIZE = PREFERENCE_OFFSET + CARD_TYPES + 1
+
+_MOVE_VALUES = frozenset(move.value for move in Move)
+
+def encode_decision(info: PlayerInfo, card_preference: Card | None, observation: np.ndarray, legal_mask: np.ndarray) -> None:
+    """Writes the observation and legal actions of a decision into the given rows
+
+    Args:
+        info (PlayerInfo): what the deciding player knows
+        card_preference (Card | None): the card asked for by a discard decision, None for a move decision
+        observation (np.ndarray): (ENVIRONMENT_OBSERVATION_SIZE,) float32 row, overwritten
+        legal_mask (np.ndarray): (ACTION_SIZE,) bool row, overwritten
+    """
+    encode(info, observation[:OBSERVATION_SIZE], legal_mask[:MOVE_SLOTS])
+    observation[OBSERVATION_SIZE:] = 0.0
+    legal_mask[MOVE_SLOTS:] = False
+    if card_preference is None:
+        return
+
+    observation[DECISION_OFFSET] = 1.0
+    observation[PREFERENCE_OFFSET + card_preference.value] = 1.0
+    legal_mask[:MOVE_SLOTS] = False
+    hand = info.player.cards
+    if card_preference in hand:
+        legal_mask[DISCARD_ACTION_OFFSET + card_preference.value] = True
+    else:
+        for value in range(CARD_TYPES):
+            legal_mask[DISCARD_ACTION_OFFSET + value] = hand.counts[value] > 0
+
+class Environment:
+    """Single agent environment, the caller plays seat 0 against an IAgent in seat 1
+
+    Moves and discards are both actions, see ACTION_SIZE. The observation and legal action mask
+    are buffers owned by the environment, overwritten by every reset and step.
+    Rewards are 1 for a won game, -1 for a lost one and 0 otherwise, given when the game ends.
+    """
+    game: ResumableGame
+    observation: np.ndarray
+    legal_mask: np.ndarray
+
+    def __init__(self, opponent: IAgent, seed: int | None = None) -> None:
+        """
+        Args:
+            opponent (IAgent): agent playing against the caller
+            seed (int | None): seed of the stream of game seeds, see Game
+        """
+        self.game = ResumableGame([None, opponent], seed)
+        self.observation = np.zeros(ENVIRONMENT_OBSERVATION_SIZE, dtype=np.float32)
+        self.legal_mask = np.zeros(ACTION_SIZE, dtype=bool)
+
+    @property
+    def decision(self) -> Decision | None:
+        return self.game.pending
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Starts a new game, the opponent moves first if it starts
+
+        Args:
+            seed (int | None): seed of the game, the next seed of the stream if None
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: observation and legal action mask
+        """
+        while self.game.new_game(seed):
+            # the opponent ended the game before the first decision, e.g. by an illegal move
+            seed = None
+        self._encode()
+        return self.observation, self.legal_mask
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, np.ndarray]:
+        """Plays one decision of the agent and the opponent's decisions up to the agent's next one
+
+        Args:
+            action (int): move value or DISCARD_ACTION_OFFSET + card value, illegal actions forfeit the game
+
+        Returns:
+            tuple[np.ndarray, float, bool, np.ndarray]: observation, reward, whether the game ended, legal action mask
+        """
+        pending = self.game.pending
+        if pending is None:
+            raise RuntimeError("The game ended, reset the environment first")
+
+        if pending.kind == DISCARD_DECISION:
+            decision = Card(action - DISCARD_ACTION_OFFSET) if DISCARD_ACTION_OFFSET <= action < ACTION_SIZE else Card.ANY
+        else:
+            decision = Move(action) if action in _MOVE_VALUES else Move.FORFEIT
+
+        if not self.game.answer(decision):
+            self._encode()
+            return self.observation, 0.0, False, self.legal_mask
+
+        encode(PlayerInfo(self.game.game.game_state, 0), self.observation[:OBSERVATION_SIZE], self.legal_mask[:MOVE_SLOTS])
+        self.observation[OBSERVATION_SIZE:] = 0.0
+        self.legal_mask.fill(False)
+        winner = self.game.winner
+        reward = 0.0 if winner is None else (1.0 if winner == 0 else -1.0)
+        return self.observation, reward, True, self.legal_mask
+
+    def _encode(self) -> None:
+        pending = self.game.pending
+        card_preference = pending.card_preference if pending.kind == DISCARD_DECISION else None
+        encode_decision(pending.info, card_preference, self.observation, self.legal_mask)
@@ -0,0 +1,208 @@
+from .AgentRegistry import AgentFactory
+from .Tournament import MatchTask, MatchResult, play_match
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from collections.abc import Iterator
+from itertools import islice
+from statistics import NormalDist
+from math import sqrt, log, log10
+from os import cpu_count
+import random
+
+ACCEPTED = "H1"         # the first agent is stronger by at least elo1
+REJECTED = "H0"         # the first agent is stronger by at most elo0
+INCONCLUSIVE = "inconclusive"
+
+def elo_to_score(elo: float) -> float:
+    """Expected score per game of an agent that much stronger than its opponent"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+def score_to_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * log10(1 / score - 1)
+
+class SPRT:
+    """Sequential probability ratio test of the first agent's score, 1 per win and 0.5 per draw
+
+    Tests H0: Elo difference = elo0 against H1: Elo difference = elo1 with the normal approximation
+    of the log likelihood ratio used by chess engine testing, so draws only shrink the variance.
+    The test is a running sum of wins, draws and losses, it can be checked after every game.
+    """
+    elo0: float
+    elo1: float
+    lower: float
+    upper: float
+    wins: int
+    draws: int
+    losses: int
+
+    def __init__(self, elo0: float = 0.0, elo1: float = 20.0, alpha: float = 0.05, beta: float = 0.05) -> None:
+        """
+        Args:
+            elo0 (float): Elo difference of H0
+            elo1 (float): Elo difference of H1, greater than elo0
+            alpha (float): probability of accepting H1 when H0 is true
+            beta (float): probability of accepting H0 when H1 is true
+        """
+        if elo1 <= elo0:
+            raise ValueError(f"elo1 ({elo1}) must be greater than elo0 ({elo0})")
+
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = log(beta / (1 - alpha))
+        self.upper = log((1 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def add(self, wins: int, draws: int, losses: int) -> None:
+        self.wins += wins
+        self.draws += draws
+        self.losses += losses
+
+    def score(self) -> float:
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def variance(self) -> float:
+        """Variance of the score of one game, with half a win and half a loss added so it is never 0"""
+        games = self.games + 1
+        mean = (self.wins + 0.5 + 0.5 * self.draws) / games
+        return (self.wins + 0.5 + 0.25 * self.draws) / games - mean * mean
+
+    def llr(self) -> float:
+        """Log likelihood ratio of H1 against H0"""
+        variance = self.variance()
+        score0 = elo_to_score(self.elo0)
+        score1 = elo_to_score(self.elo1)
+        return self.games * (score1 - score0) * (2 * self.score() - score0 - score1) / (2 * variance)
+
+    def status(self) -> str | None:
+        """ACCEPTED or REJECTED once a bound is crossed, None while the test goes on"""
+        llr = self.llr()
+        if llr >= self.upper:
+            return ACCEPTED
+        if llr <= self.lower:
+            return REJECTED
+        return None
+
+    def confidence_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Normal approximation interval of the score per game"""
+        if not self.games:
+            return 0.0, 1.0
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        spread = z * sqrt(self.variance() / self.games)
+        score = self.score()
+        return max(score - spread, 0.0), min(score + spread, 1.0)
+
+    def elo_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        low, high = self.confidence_interval(confidence)
+        return score_to_elo(low), score_to_elo(high)
+
+class Evaluation:
+    """Plays games between two agents until an SPRT decides which hypothesis holds
+
+    Games are played in small chunks with alternating seats, every worker plays one chunk at a time
+    and the test is checked as soon as any chunk finishes. Once it is decided the chunks still waiting
+    are cancelled, so only the chunks already running are played past the decision.
+    """
+    first: str
+    second: str
+    first_factory: AgentFactory
+    second_factory: AgentFactory
+    test: SPRT
+    max_games: int
+    chunk_size: int
+    workers: int
+    seed: int
+    result: str | None
+    plies: int
+
+    def __init__(self, first: str, first_factory: AgentFactory, second: str, second_factory: AgentFactory,
+                 test: SPRT | None = None, max_games: int = 100000, chunk_size: int = 20,
+                 workers: int | None = None, seed: int | None = None) -> None:
+        """
+        Args:
+            first (str): name of the tested agent
+            first_factory (AgentFactory): picklable factory of the tested agent
+            second (str): name of the reference agent
+            second_factory (AgentFactory): picklable factory of the reference agent
+            test (SPRT | None): test to run, SPRT() if None
+            max_games (int): games after which the evaluation stops undecided
+            chunk_size (int): games per worker task, the test is checked after every task
+            workers (int | None): number of worker processes, all cores if None, 1 runs in this process
+            seed (int | None): base seed from which every chunk gets its own seed
+        """
+        self.first = first
+        self.second = second
+        self.first_factory = first_factory
+        self.second_factory = second_factory
+        self.test = test or SPRT()
+        self.max_games = max_games
+        self.chunk_size = chunk_size
+        self.workers = workers or cpu_count() or 1
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.result = None
+        self.plies = 0
+
+    def run(self) -> str:
+        """Plays until the test is decided or max_games were played
+
+        Returns:
+            str: ACCEPTED, REJECTED or INCONCLUSIVE
+        """
+        if self.workers > 1:
+            self._run_pool()
+        else:
+            for task in self._tasks():
+                self._merge(play_match(task))
+                self.result = self.test.status()
+                if self.result is not None:
+                    return self.result
+
+        if self.result is None:
+            self.result = INCONCLUSIVE
+        return self.result
+
+    def _tasks(self) -> Iterator[MatchTask]:
+        planned = 0
+        chunks = 0
+        while planned < self.max_games:
+            games = min(self.chunk_size, self.max_games - planned)
+            planned += games
+            yield MatchTask(self.first, self.first_factory, self.second, self.second_factory,
+                            games, chunks % 2 == 1, self.seed + chunks)
+            chunks += 1
+
+    def _run_pool(self) -> None:
+        tasks = self._tasks()
+        with ProcessPoolExecutor(self.workers) as executor:
+            pending = {executor.submit(play_match, task) for task in islice(tasks, self.workers)}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._merge(future.result())
+                        self.result = self.test.status()
+                        if self.result is not None:
+                            return
+                    # a new chunk for every finished one, so every worker stays busy
+                    pending |= {executor.submit(play_match, task) for task in islice(tasks, len(done))}
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _merge(self, chunk: MatchResult) -> None:
+        self.test.add(chunk.first_wins, chunk.draws, chunk.second_wins)
+        self.plies += chunk.plies
+
+    def report(self) -> str:
+        test = self.test
+        low, high = test.confidence_interval()
+        elo_low, elo_high = test.elo_interval()
+        return f"""EVALUATION {self.first} vs {self.second}
+        Games {test.games}: {test.wins} wins, {test.draws} draws, {test.losses} losses
+        Score {test.score():.2%} (95% CI {low:.2%} to {high:.2%}), Elo {score_to_elo(test.score()):+.1f} (95% CI {elo_low:+.1f} to {elo_high:+.1f})
+        SPRT elo0 {test.elo0:g} elo1 {test.elo1:g}: LLR {test.llr():.2f} in [{test.lower:.2f}, {test.upper:.2f}], result {self.result}"""
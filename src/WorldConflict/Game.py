@@ -4,8 +4,11 @@ from .GameState import GameState, PlayerInfo
 from .Card import Card
 from .CardDeck import CardDeck
 from .Inventory import Inventory
-from copy import deepcopy
-from typing import Sequence
+from .Profiler import Profiler, ProfiledAgent
+from .ReplayLog import GameRecorder, RecordingAgent
+from .UndoLog import UndoLog, UNDO_MONEY, UNDO_GIVE_CARD, UNDO_TAKE_CARD, UNDO_TURN
+from typing import Any, Sequence
+import random
 
 PLAYER_LOST = True
 PLAYER_OK = False
@@ -13,8 +16,12 @@ PLAYER_OK = False
 GAME_ENDED = True
 GAME_CONTINUES = False
 
+# methods of Game wrapped by enable_profiling, handlers are timed under their own name
+PROFILED_METHODS = ("two_start", "jack_start", "king_start", "ace_start", "affair_start", "plus_one_start", "plus_two_start",
+                    "process_move", "process_bluff", "make_move", "new_game")
+
 def has_lost(inventory: Inventory) -> bool:
-        return inventory.cards == []
+    return inventory.cards.size == 0
     
 def has_bluffed(move: Move, inventory: Inventory) -> bool:
     """checks whether the player has required card
@@ -47,9 +54,13 @@ def give_money(income: int, inventory: Inventory) -> None:
         income (int): amount of income
     """
     inventory.money += income
+    if inventory.journal is not None:
+        inventory.journal.entries.append((UNDO_MONEY, inventory, income))
 
 def give_card(card: Card, inventory: Inventory) -> None:
     inventory.cards.append(card)
+    if inventory.journal is not None:
+        inventory.journal.entries.append((UNDO_GIVE_CARD, inventory, card))
 
 def take_money(cost: int, inventory: Inventory) -> int:
     """Called by the game, when a player has to pay
@@ -63,6 +74,8 @@ def take_money(cost: int, inventory: Inventory) -> int:
 
     cost = min(cost, inventory.money)
     inventory.money -= cost
+    if inventory.journal is not None:
+        inventory.journal.entries.append((UNDO_MONEY, inventory, -cost))
     return cost
 
 def take_card(card_preference: Card, inventory: Inventory, player: IAgent, state: PlayerInfo) -> Card:
@@ -78,11 +91,14 @@ def take_card(card_preference: Card, inventory: Inventory, player: IAgent, state
         Card: The card player decides to discard
     """
     card = player.generate_give_card(state, card_preference)
-    if card not in inventory.cards or (card_preference != Card.ANY and card != card_preference and card_preference in inventory.cards):
+    cards = inventory.cards
+    if card not in cards or (card_preference != Card.ANY and card != card_preference and card_preference in cards):
         # will be interpreted as forfeit
         return Card.ANY
     
-    inventory.cards.remove(card)
+    cards.remove(card)
+    if inventory.journal is not None:
+        inventory.journal.entries.append((UNDO_TAKE_CARD, inventory, card))
     return card
 
 def take_move(state: GameState, inventory: Inventory, player: IAgent) -> Move:
@@ -96,8 +112,8 @@ def take_move(state: GameState, inventory: Inventory, player: IAgent) -> Move:
     """
     playerState = PlayerInfo(state, state.turn_player)
     move = player.generate_move(playerState)
-    if (len(state.current_sequence) == 0 and move not in inventory.get_legal_moves(Move.OK)) or \
-        (len(state.current_sequence) != 0 and move not in inventory.get_legal_moves(state.current_sequence[-1])):
+    last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+    if not (inventory.get_legal_move_mask(last_move) >> move.value) & 1:
         return Move.FORFEIT
     
     return move
@@ -105,13 +121,111 @@ def take_move(state: GameState, inventory: Inventory, player: IAgent) -> Move:
 class Game:
     agents: Sequence[IAgent]
     game_state: GameState
-
-    def __init__(self, agents: Sequence[IAgent]):
+    rng: random.Random
+    game_seed: int
+    profiler: Profiler | None = None
+    undo_log: UndoLog
+    recorder: GameRecorder | None = None
+
+    def __init__(self, agents: Sequence[IAgent], seed: int | None = None):
+        """
+        Args:
+            agents (Sequence[IAgent]): the two players
+            seed (int | None): seed of the stream of per game seeds, drawn from the random module if None
+        """
         self.agents = agents
-        self.game_state = GameState()
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        self.game_state = GameState(random.Random())
+        self.undo_log = UndoLog()
         self.new_game()
+
+    def enable_profiling(self, profiler: Profiler) -> None:
+        """Records the latency of the game phases and of the agents' decisions into the profiler
+
+        The timed methods are replaced on the instance only, so a game without profiling runs the plain methods.
+
+        Args:
+            profiler (Profiler): collector of the histograms, can be shared between games
+        """
+        self.disable_profiling()
+        self.profiler = profiler
+        self._unprofiled: dict[str, Any] = {name: self.__dict__[name] for name in PROFILED_METHODS if name in self.__dict__}
+        self._unprofiled_agents = self.agents
+        for name in PROFILED_METHODS:
+            setattr(self, name, profiler.timed(name, getattr(self, name)))
+        self.agents = [ProfiledAgent(agent, profiler, f"agent{seat}") for seat, agent in enumerate(self.agents)]
+
+    def disable_profiling(self) -> None:
+        if self.profiler is None:
+            return
+
+        for name in PROFILED_METHODS:
+            if name in self._unprofiled:
+                setattr(self, name, self._unprofiled[name])
+            else:
+                delattr(self, name)
+        self.agents = self._unprofiled_agents
+        self.profiler = None
     
-    def new_game(self):
+    def enable_recording(self, recorder: GameRecorder) -> None:
+        """Records every game into the recorder, starting with the current one if no move was made in it yet
+
+        Like profiling, recording replaces methods and agents on the instance only.
+        When both are enabled, they have to be disabled in the reverse order.
+
+        Args:
+            recorder (GameRecorder): collector of the game records
+        """
+        self.disable_recording()
+        self.recorder = recorder
+        self._unrecorded: dict[str, Any] = {name: self.__dict__[name] for name in ("make_move", "new_game") if name in self.__dict__}
+        self._unrecorded_agents = self.agents
+        make_move = self.make_move
+        new_game = self.new_game
+
+        def recorded_make_move(move: Move) -> bool:
+            recorder.move(move)
+            game_ended = make_move(move)
+            if game_ended:
+                recorder.finish(self.game_state)
+            return game_ended
+
+        def recorded_new_game(seed: int | None = None):
+            new_game(seed)
+            recorder.begin(self.game_seed, self.game_state)
+
+        self.make_move = recorded_make_move
+        self.new_game = recorded_new_game
+        self.agents = [RecordingAgent(agent, recorder) for agent in self.agents]
+
+        state = self.game_state
+        if not state.current_sequence and not state.deck.discardPile and len(state.deck.drawPile) == 11 \
+                and state.players[0].money == state.players[1].money == 2:
+            recorder.begin(self.game_seed, state)
+
+    def disable_recording(self) -> None:
+        """Stops recording, see GameRecorder.stop"""
+        if self.recorder is None:
+            return
+
+        self.recorder.stop()
+        for name in ("make_move", "new_game"):
+            if name in self._unrecorded:
+                setattr(self, name, self._unrecorded[name])
+            else:
+                delattr(self, name)
+        self.agents = self._unrecorded_agents
+        self.recorder = None
+
+    def new_game(self, seed: int | None = None):
+        """Deals a new game, the deal and the starting player only depend on the game seed
+
+        Args:
+            seed (int | None): seed of the game, used to replay a game, the next seed of the game's stream if None
+        """
+        self.undo_log.clear()
+        self.game_seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.game_state.rng.seed(self.game_seed)
         self.game_state.reset()
 
         for _ in range(2):
@@ -130,26 +244,23 @@ class Game:
         
         response = None if len(sequence) == 1 else sequence[1]
 
-        initial_player_info = PlayerInfo(self.game_state, initial_player_id)
-        responding_player_info = PlayerInfo(self.game_state, responding_player_id)
-
         match response:
             case Move.BLOCK_TWO_WITH_ACE:
                 # nothing, demand two and ace
-                initial_forfeit = deck.discard(take_card(Card.TWO, initial_inventory, initial_agent, initial_player_info))
+                initial_forfeit = deck.discard(take_card(Card.TWO, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
                 give_card(deck.draw(), initial_inventory)
 
-                responding_forfeit = deck.discard(take_card(Card.ACE, responding_inventory, responding_agent, responding_player_info))
+                responding_forfeit = deck.discard(take_card(Card.ACE, responding_inventory, responding_agent, PlayerInfo(self.game_state, responding_player_id)))
                 give_card(deck.draw(), responding_inventory)
             case Move.BLOCK_TWO_WITH_TWO:
                 # nothing, demand two and two
-                initial_forfeit = deck.discard(take_card(Card.TWO, initial_inventory, initial_agent, initial_player_info))
+                initial_forfeit = deck.discard(take_card(Card.TWO, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
                 give_card(deck.draw(), initial_inventory)
 
-                responding_forfeit = deck.discard(take_card(Card.TWO, responding_inventory, responding_agent, responding_player_info))
+                responding_forfeit = deck.discard(take_card(Card.TWO, responding_inventory, responding_agent, PlayerInfo(self.game_state, responding_player_id)))
                 give_card(deck.draw(), responding_inventory)
             case None:
-                initial_forfeit = deck.discard(take_card(Card.TWO, initial_inventory, initial_agent, initial_player_info))
+                initial_forfeit = deck.discard(take_card(Card.TWO, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
                 give_card(deck.draw(), initial_inventory)
 
                 give_money(2, initial_inventory)
@@ -170,26 +281,23 @@ class Game:
         
         response = None if len(sequence) == 1 else sequence[1]
 
-        initial_player_info = PlayerInfo(self.game_state, initial_player_id)
-        responding_player_info = PlayerInfo(self.game_state, responding_player_id)
-
         match response:
             case Move.BLOCK_JACK_WITH_QUEEN:
                 # nothing, demand jack and queen
-                initial_forfeit = deck.discard(take_card(Card.JACK, initial_inventory, initial_agent, initial_player_info))
+                initial_forfeit = deck.discard(take_card(Card.JACK, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
                 give_card(deck.draw(), initial_inventory)
 
-                responding_forfeit = deck.discard(take_card(Card.QUEEN, responding_inventory, responding_agent, responding_player_info))
+                responding_forfeit = deck.discard(take_card(Card.QUEEN, responding_inventory, responding_agent, PlayerInfo(self.game_state, responding_player_id)))
                 give_card(deck.draw(), responding_inventory)
 
             case None:
                 # pay, demand jack, demand card permanently
                 take_money(3, initial_inventory)
 
-                initial_forfeit = deck.discard(take_card(Card.JACK, initial_inventory, initial_agent, initial_player_info))
+                initial_forfeit = deck.discard(take_card(Card.JACK, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
                 give_card(deck.draw(), initial_inventory)
 
-                responding_forfeit = deck.discard(take_card(Card.ANY, responding_inventory, responding_agent, responding_player_info))
+                responding_forfeit = deck.discard(take_card(Card.ANY, responding_inventory, responding_agent, PlayerInfo(self.game_state, responding_player_id)))
                 if has_lost(responding_inventory):
                     responding_forfeit = True
         
@@ -215,15 +323,13 @@ class Game:
         initial_forfeit = False
         responding_forfeit = False
 
-        initial_player_info = PlayerInfo(self.game_state, initial_player_id)
-
         # demand ace, give 3 cards, demand 2 cards back
-        initial_forfeit = deck.discard(take_card(Card.ACE, initial_inventory, initial_agent, initial_player_info))
+        initial_forfeit = deck.discard(take_card(Card.ACE, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
         for _ in range(3):
             give_card(deck.draw(), initial_inventory)
         
-        initial_forfeit |= deck.discard(take_card(Card.ANY, initial_inventory, initial_agent, initial_player_info))
-        initial_forfeit |= deck.discard(take_card(Card.ANY, initial_inventory, initial_agent, initial_player_info))
+        initial_forfeit |= deck.discard(take_card(Card.ANY, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
+        initial_forfeit |= deck.discard(take_card(Card.ANY, initial_inventory, initial_agent, PlayerInfo(self.game_state, initial_player_id)))
 
         return initial_forfeit, responding_forfeit
     
@@ -260,12 +366,10 @@ class Game:
         
         response = None if len(sequence) == 1 else sequence[1]
 
-        responding_player_info = PlayerInfo(self.game_state, responding_player_id)
-
         match response:
             case Move.BLOCK_PLUS_TWO_WITH_KING:
                 # nothing, demand king
-                responding_forfeit = deck.discard(take_card(Card.KING, responding_inventory, responding_agent, responding_player_info))
+                responding_forfeit = deck.discard(take_card(Card.KING, responding_inventory, responding_agent, PlayerInfo(self.game_state, responding_player_id)))
                 give_card(deck.draw(), responding_inventory)
 
             case None:
@@ -317,12 +421,10 @@ class Game:
         turn_player_id = self.game_state.turn_player
         turn_inventory = self.game_state.players[turn_player_id]
         turn_agent = self.agents[turn_player_id]
-        turn_player_info = PlayerInfo(self.game_state, turn_player_id)
 
         previous_player_id = turn_player_id ^ 1
         previous_inventory = self.game_state.players[previous_player_id]
         previous_agent = self.agents[previous_player_id]
-        previous_player_info = PlayerInfo(self.game_state, previous_player_id)
 
         if has_bluffed(self.game_state.current_sequence[-1], previous_inventory):
             # bluff got caught
@@ -333,7 +435,7 @@ class Game:
                 if initial_lost or responding_lost:
                     return initial_lost, responding_lost
 
-            self.game_state.deck.discard(take_card(Card.ANY, previous_inventory, previous_agent, previous_player_info))
+            self.game_state.deck.discard(take_card(Card.ANY, previous_inventory, previous_agent, PlayerInfo(self.game_state, previous_player_id)))
             
             if has_lost(previous_inventory):
                 if previous_player_id == self.game_state.initial_player:
@@ -348,7 +450,7 @@ class Game:
             if initial_lost or responding_lost:
                 return initial_lost, responding_lost
             
-            self.game_state.deck.discard(take_card(Card.ANY, turn_inventory, turn_agent, turn_player_info))
+            self.game_state.deck.discard(take_card(Card.ANY, turn_inventory, turn_agent, PlayerInfo(self.game_state, turn_player_id)))
 
             if has_lost(turn_inventory):
                 if turn_player_id == self.game_state.initial_player:
@@ -401,11 +503,40 @@ class Game:
 
         return GAME_CONTINUES
     
-    def process_game_step(self):
-        move = take_move(deepcopy(self.game_state), self.game_state.players[self.game_state.turn_player], self.agents[self.game_state.turn_player])
+    def process_game_step(self) -> bool:
+        move = take_move(self.game_state, self.game_state.players[self.game_state.turn_player], self.agents[self.game_state.turn_player])
         game_ended = self.make_move(move)
 
         if game_ended:
             self.new_game()
 
+        return game_ended
+
+    def apply(self, move: Move) -> bool:
+        """Same as make_move, but journaled so that undo can take the move back
+
+        The game is not redealt when it ends, the final position stays until it is undone.
+        A move interrupted by an exception (e.g. DeckExhaustedError) is undone as a whole as well.
+
+        Args:
+            move (Move): move of the turn player
+
+        Returns:
+            bool: GAME_ENDED if the move ended the game
+        """
+        state = self.game_state
+        log = self.undo_log
+        log.begin()
+        log.entries.append((UNDO_TURN, state, state.current_sequence, len(state.current_sequence),
+                            state.initial_player, state.turn_player, state.score[0], state.score[1]))
+
+        players = state.players
+        players[0].journal = players[1].journal = state.deck.journal = log
+        try:
+            return self.make_move(move)
+        finally:
+            players[0].journal = players[1].journal = state.deck.journal = None
 
+    def undo(self) -> None:
+        """Takes back the last move done with apply"""
+        self.undo_log.undo()
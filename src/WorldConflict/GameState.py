@@ -1,8 +1,9 @@
 from .Inventory import Inventory
 from .CardDeck import CardDeck
 from .Move import Move
+from .Card import Card
+from .Zobrist import HAND_SIZE_KEYS, MONEY_KEYS, MONEY_SLOTS, SEQUENCE_KEYS, TURN_KEYS, INITIAL_KEYS, rotate
 import random
-from copy import deepcopy
 
 class GameState:
     players: list[Inventory]
@@ -11,35 +12,100 @@ class GameState:
     deck: CardDeck
     current_sequence: list[Move]
     score: list[int]
+    rng: random.Random
 
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        """
+        Args:
+            rng (random.Random | None): generator deciding the starting player and the deck order, seeded from the random module if None
+        """
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
         self.score = [0, 0]
+        self.players = [Inventory(), Inventory()]
+        self.deck = CardDeck(self.rng)
+        self.current_sequence = []
         self.reset()
 
+    @classmethod
+    def blank(cls, rng: random.Random | None = None) -> "GameState":
+        """State for decoders that overwrite the hands, money, piles and sequence, no starting player is drawn
+
+        Args:
+            rng (random.Random | None): generator of the state and its deck for later games, seeded from the random module if None
+        """
+        state = cls.__new__(cls)
+        state.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+        state.score = [0, 0]
+        state.players = [Inventory(), Inventory()]
+        state.deck = CardDeck(state.rng)
+        state.current_sequence = []
+        state.initial_player = state.turn_player = 0
+        return state
+
     def reset(self) -> None:
-        self.players = [Inventory(), Inventory()]
-        self.initial_player = random.randint(0, 1)
+        """Starts a new game on the same inventories and deck, only the score is kept"""
+        for player in self.players:
+            player.reset()
+        self.initial_player = self.rng.randint(0, 1)
         self.turn_player = self.initial_player
-        self.deck = CardDeck()
+        self.deck.rng = self.rng
+        self.deck.reset()
         self.current_sequence = []
 
+    def zobrist(self) -> int:
+        """64 bit hash of the position, the score left out
+
+        The hands and the deck keep their own hashes up to date as cards move, the money, the players
+        and the at most three moves of the sequence are single table lookups, so this is O(1).
+        """
+        first, second = self.players
+        zobrist = first.cards.zobrist ^ rotate(second.cards.zobrist, 32) ^ self.deck.zobrist \
+            ^ MONEY_KEYS[0][first.money % MONEY_SLOTS] ^ MONEY_KEYS[1][second.money % MONEY_SLOTS] \
+            ^ TURN_KEYS[self.turn_player] ^ INITIAL_KEYS[self.initial_player]
+        for position, move in enumerate(self.current_sequence):
+            zobrist ^= SEQUENCE_KEYS[position][move._value_]
+        return zobrist
+
+    def information_zobrist(self, player: int) -> int:
+        """64 bit hash of the position as the player sees it, the same for every deal of the cards hidden from them
+
+        The opponent's hand only counts by its size and the draw pile is left out, its size follows from
+        the other piles.
+        """
+        opponent = self.players[player ^ 1]
+        hidden = opponent.cards.zobrist if player else rotate(opponent.cards.zobrist, 32)
+        return self.zobrist() ^ hidden ^ self.deck.draw_zobrist ^ HAND_SIZE_KEYS[len(opponent.cards) % len(HAND_SIZE_KEYS)]
+
+    def rehash(self) -> int:
+        """Recomputes the deck's hash after its piles were changed directly, returns zobrist()"""
+        self.deck.rehash()
+        return self.zobrist()
+
 class PlayerInfo:
+    """Snapshot of the game as seen by one player
+
+    Everything except the player's own inventory is stored in immutable tuples,
+    and the inventory is a private copy, so agents cannot change the real game state.
+    """
     player: Inventory
     playerId: int
-    players_card_num: list[int]
-    players_money: list[int]
+    players_card_num: tuple[int, int]
+    players_money: tuple[int, int]
     initial_player: int
-    current_sequence: list[Move]
-    score: list[int]
+    current_sequence: tuple[Move, ...]
+    score: tuple[int, int]
+    discarded: tuple[Card, ...]
 
     def __init__(self, gameState: GameState, playerId: int) -> None:
-        self.player = deepcopy(gameState.players[playerId])
-        self.playerId = deepcopy(playerId)
-        self.initial_player = deepcopy(gameState.initial_player)
-        self.current_sequence = deepcopy(gameState.current_sequence)
-        self.score = deepcopy(gameState.score)
-        self.players_card_num = [len(inv.cards) for inv in gameState.players]
-        self.players_money = [inv.money for inv in gameState.players]
+        players = gameState.players
+        self.player = players[playerId].copy()
+        self.playerId = playerId
+        self.initial_player = gameState.initial_player
+        self.current_sequence = tuple(gameState.current_sequence)
+        self.score = (gameState.score[0], gameState.score[1])
+        self.players_card_num = (players[0].cards.size, players[1].cards.size)
+        self.players_money = (players[0].money, players[1].money)
+        self.discarded = tuple(gameState.deck.discardPile)
 
     def __str__(self) -> str:
         return f"""GAME STATE
@@ -47,4 +113,5 @@ class PlayerInfo:
         Your hand {self.player}
         Sequence {self.current_sequence} started by {self.initial_player + 1}
         Players card numbers {self.players_card_num}, players money {self.players_money}
+        Discarded cards {self.discarded}
         Current score {self.score}"""
@@ -0,0 +1,131 @@
+from .Card import Card
+from .Zobrist import COUNT_KEYS
+from typing import Iterable, Iterator
+
+CARD_TYPES = 5
+
+_CARDS = tuple(Card(value) for value in range(CARD_TYPES))
+_KEY_BITS = 4               # bits per rank of key, enough for any count COUNT_KEYS allows
+
+# the cards of a hand in rank order by key, filled in as hands come up
+_LISTED: dict[int, tuple[Card, ...]] = {0: ()}
+
+class Hand:
+    """Cards of a player as a count per rank
+
+    Membership, adding and removing a card are O(1). Towards agents it behaves like the list
+    of cards it replaced (iteration, len, indexing, in, +, append, remove, extend), listing the
+    cards by rank. It compares equal to a list or tuple of the same cards in rank order,
+    same_cards ignores the order. Hands are mutable and not hashable, key identifies the cards held.
+
+    counts has an extra always empty slot for Card.ANY, so that looking a card up needs no range check.
+    zobrist is the Zobrist hash of the counts, kept up to date by every change.
+    packed is the counts packed into one int, kept up to date like zobrist, it looks up the cards
+    as a shared tuple in rank order, so iterating and indexing do not walk the counts.
+    """
+    __slots__ = ("counts", "size", "zobrist", "packed")
+    counts: list[int]
+    size: int
+    zobrist: int
+    packed: int
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        self.counts = [0] * (CARD_TYPES + 1)
+        self.size = 0
+        self.zobrist = 0
+        self.packed = 0
+        for card in cards:
+            self.append(card)
+
+    def copy(self) -> "Hand":
+        hand = Hand.__new__(Hand)
+        hand.counts = self.counts.copy()
+        hand.size = self.size
+        hand.zobrist = self.zobrist
+        hand.packed = self.packed
+        return hand
+
+    def count(self, card: Card) -> int:
+        return self.counts[card._value_]
+
+    def append(self, card: Card) -> None:
+        value = card._value_
+        if value >= CARD_TYPES:
+            raise ValueError(f"{card} cannot be held")
+        count = self.counts[value] = self.counts[value] + 1
+        self.zobrist ^= COUNT_KEYS[value][count]
+        self.size += 1
+        self.packed += 1 << (value * _KEY_BITS)
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.append(card)
+
+    def remove(self, card: Card) -> None:
+        value = card._value_
+        count = self.counts[value]
+        if count == 0:
+            raise ValueError(f"{card} is not in the hand")
+        self.zobrist ^= COUNT_KEYS[value][count]
+        self.counts[value] = count - 1
+        self.size -= 1
+        self.packed -= 1 << (value * _KEY_BITS)
+
+    def clear(self) -> None:
+        self.counts[:] = [0] * (CARD_TYPES + 1)
+        self.size = 0
+        self.zobrist = 0
+        self.packed = 0
+
+    def key(self) -> int:
+        """The counts packed into one int, 4 bits per rank"""
+        return self.packed
+
+    def __contains__(self, card: Card) -> bool:
+        return self.counts[card._value_] > 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def listed(self) -> tuple[Card, ...]:
+        """The cards in rank order"""
+        listed = _LISTED.get(self.packed)
+        if listed is None:
+            listed = _LISTED[self.packed] = tuple(card for card, count in zip(_CARDS, self.counts) for _ in range(count))
+        return listed
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self.listed())
+
+    def __getitem__(self, index: int | slice) -> Card | list[Card]:
+        if isinstance(index, slice):
+            return list(self.listed()[index])
+        try:
+            return self.listed()[index]
+        except IndexError:
+            raise IndexError("Hand index out of range") from None
+
+    def __add__(self, other: Iterable[Card]) -> list[Card]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable[Card]) -> list[Card]:
+        return list(other) + list(self)
+
+    def same_cards(self, cards: Iterable[Card]) -> bool:
+        """Whether the hand holds exactly the given cards, in whatever order"""
+        counts = [0] * (CARD_TYPES + 1)
+        for card in cards:
+            counts[card._value_] += 1
+        return counts == self.counts
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Hand):
+            return self.counts == other.counts
+        if isinstance(other, (list, tuple)):
+            return list(self.listed()) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -0,0 +1,131 @@
+from .GameState import PlayerInfo
+from .CardDeck import FULL_DECK
+from .Hand import CARD_TYPES
+from .Card import Card
+from functools import lru_cache
+from math import comb
+from typing import Iterable, Sequence
+import random
+
+COPIES = FULL_DECK.count(Card.ACE)
+
+# a multiset of cards is indexed by its counts in base COPIES + 1, index + POWERS[rank] adds a card of that rank
+POWERS = tuple((COPIES + 1) ** rank for rank in range(CARD_TYPES))
+HAND_SLOTS = (COPIES + 1) ** CARD_TYPES
+COUNTS = tuple(tuple(index // power % (COPIES + 1) for power in POWERS) for index in range(HAND_SLOTS))
+SIZES = tuple(sum(counts) for counts in COUNTS)
+
+# indices of the hands of every size in increasing order, RANKS[index] is the position of a hand among them
+HANDS_BY_SIZE = tuple(tuple(index for index in range(HAND_SLOTS) if SIZES[index] == size) for size in range(len(FULL_DECK) + 1))
+RANKS = tuple(HANDS_BY_SIZE[SIZES[index]].index(index) for index in range(HAND_SLOTS))
+
+_CARDS = tuple(Card(value) for value in range(CARD_TYPES))
+_HAND_CARDS = tuple(tuple(card for card, count in zip(_CARDS, counts) for _ in range(count)) for counts in COUNTS)
+
+def hand_index(cards: Iterable[Card]) -> int:
+    index = 0
+    for card in cards:
+        index += POWERS[card._value_]
+    return index
+
+def hand_cards(index: int) -> tuple[Card, ...]:
+    """Cards of an indexed multiset in rank order"""
+    return _HAND_CARDS[index]
+
+def rank(index: int) -> int:
+    """Position of a hand among the hands of its size, from 0 to len(HANDS_BY_SIZE[size]) - 1"""
+    return RANKS[index]
+
+def unrank(size: int, position: int) -> int:
+    """Index of the hand at the given position among the hands of its size"""
+    return HANDS_BY_SIZE[size][position]
+
+def unseen_index(info: PlayerInfo) -> int:
+    """Index of the cards the player has not seen, the full deck minus their hand and the discard pile"""
+    index = HAND_SLOTS - 1
+    for card in info.player.cards:
+        index -= POWERS[card._value_]
+    for card in info.discarded:
+        index -= POWERS[card._value_]
+    return index
+
+@lru_cache(maxsize=None)
+def consistent_hands(unseen: int, size: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Hands of the given size that can be dealt from the unseen cards and their number of deals
+
+    Args:
+        unseen (int): index of the unseen cards
+        size (int): number of cards in the hand
+
+    Returns:
+        tuple[tuple[int, ...], tuple[int, ...]]: hand indices and weights, the weights add up to comb(unseen size, size)
+    """
+    left = COUNTS[unseen]
+    hands = []
+    weights = []
+    for index in HANDS_BY_SIZE[size]:
+        weight = 1
+        for held, available in zip(COUNTS[index], left):
+            weight *= comb(available, held)
+        if weight:
+            hands.append(index)
+            weights.append(weight)
+    return tuple(hands), tuple(weights)
+
+class AliasSampler:
+    """Samples outcomes in proportion to their weights in O(1), with Vose's alias method"""
+    __slots__ = ("outcomes", "probabilities", "aliases")
+    outcomes: tuple[int, ...]
+    probabilities: list[float]
+    aliases: list[int]
+
+    def __init__(self, outcomes: Sequence[int], weights: Sequence[float]) -> None:
+        count = len(outcomes)
+        if not count:
+            raise ValueError("Nothing to sample from")
+
+        total = sum(weights)
+        scaled = [weight * count / total for weight in weights]
+        self.outcomes = tuple(outcomes)
+        self.probabilities = [1.0] * count
+        self.aliases = list(range(count))
+
+        small = [slot for slot, value in enumerate(scaled) if value < 1.0]
+        large = [slot for slot, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probabilities[low] = scaled[low]
+            self.aliases[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    def sample(self, rng: random.Random) -> int:
+        slot = int(rng.random() * len(self.outcomes))
+        if rng.random() >= self.probabilities[slot]:
+            slot = self.aliases[slot]
+        return self.outcomes[slot]
+
+@lru_cache(maxsize=4096)
+def hand_sampler(unseen: int, size: int) -> AliasSampler:
+    """Sampler of the opponent's hand when every deal of the unseen cards is as likely"""
+    return AliasSampler(*consistent_hands(unseen, size))
+
+def sample_deal(info: PlayerInfo, rng: random.Random, sampler: AliasSampler | None = None) -> tuple[int, list[Card]]:
+    """Deals the cards hidden from a player consistently with what they have seen
+
+    Args:
+        info (PlayerInfo): what the player knows
+        rng (random.Random): source of randomness
+        sampler (AliasSampler | None): sampler of the opponent's hand index, e.g. from beliefs, uniform deals if None
+
+    Returns:
+        tuple[int, list[Card]]: index of the opponent's hand and the shuffled draw pile
+    """
+    unseen = unseen_index(info)
+    if sampler is None:
+        sampler = hand_sampler(unseen, info.players_card_num[info.playerId ^ 1])
+    hand = sampler.sample(rng)
+    draw_pile = list(hand_cards(unseen - hand))
+    rng.shuffle(draw_pile)
+    return hand, draw_pile
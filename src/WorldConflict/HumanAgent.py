@@ -32,11 +32,11 @@ class HumanAgent(IAgent):
     def generate_move(self, state: PlayerInfo) -> Move:
         self.player_info = state
 
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+
         print(f"Player {self.player_info.playerId + 1}")    
         print(f"""You are requested to choose a move out of
-{state.player.get_legal_moves(Move.OK) \
-if len(state.current_sequence) == 0 \
-else state.player.get_legal_moves(state.current_sequence[-1])}""")
+{state.player.get_legal_moves(last_move)}""")
         print(state)
         raw_move = input()
         match raw_move:
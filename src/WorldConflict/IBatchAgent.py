@@ -0,0 +1,43 @@
+from abc import abstractmethod
+from .GameState import PlayerInfo
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+
+class IBatchAgent(IAgent):
+    """Agent deciding for many games at once, e.g. with one model evaluation per batch
+
+    MultiGameDriver collects the pending decisions of all its games and hands them over together.
+    Used as a plain IAgent, every decision is a batch of one.
+    """
+
+    @abstractmethod
+    def generate_moves_batch(self, states: list[PlayerInfo]) -> list[Move]:
+        """Generates a move for every game
+
+        Args:
+            states (list[PlayerInfo]): the games as seen by the deciding players
+
+        Returns:
+            list[Move]: one move per state, in the same order
+        """
+        pass
+
+    @abstractmethod
+    def generate_give_cards_batch(self, states: list[PlayerInfo], card_preferences: list[Card]) -> list[Card]:
+        """Chooses which card to give in every game
+
+        Args:
+            states (list[PlayerInfo]): the games as seen by the giving players
+            card_preferences (list[Card]): card asked for in each game, see IAgent.generate_give_card
+
+        Returns:
+            list[Card]: one card per state, in the same order
+        """
+        pass
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        return self.generate_give_cards_batch([state], [card_preference])[0]
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        return self.generate_moves_batch([state])[0]
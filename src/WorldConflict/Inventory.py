@@ -1,57 +1,57 @@
 from .Move import Move
+from typing import Iterable
 from .Card import Card
+from .Hand import Hand
+from .LegalMoves import LEGAL_MOVES, LEGAL_MOVE_MASKS, money_bucket
+from .UndoLog import UndoLog
+
+class _HandAttribute:
+    """Turns the cards assigned to an inventory into a Hand
+
+    It has no __get__, so reading the cards is a plain instance attribute lookup, only assignments go through it.
+    """
+    def __set__(self, inventory: "Inventory", cards: Iterable[Card]) -> None:
+        inventory.__dict__["cards"] = cards if isinstance(cards, Hand) else Hand(cards)
 
 class Inventory:
     money: int
-    cards: list[Card]
+    cards: Hand = _HandAttribute()
+    journal: UndoLog | None = None
 
     def __init__(self) -> None:
         self.money = 2
-        self.cards = []
+        self.cards = Hand()
+
+    def reset(self) -> None:
+        """Back to the starting money with an empty hand"""
+        self.money = 2
+        self.cards.clear()
 
-    def get_legal_moves(self, last_move: Move) -> list[Move]:
-        """Gives list of possible moves based on the last move (any card could be bluffed, cards are not included in checking)
+    def copy(self) -> "Inventory":
+        """Cheap independent copy, changes to it do not affect this inventory"""
+        inventory = Inventory.__new__(Inventory)
+        inventory.money = self.money
+        inventory.__dict__["cards"] = self.cards.copy()
+        return inventory
+
+    def hand_key(self) -> int:
+        """Hashable value identifying the cards held, see Hand.key"""
+        return self.cards.key()
+
+    def get_legal_moves(self, last_move: Move) -> tuple[Move, ...]:
+        """Gives the possible moves based on the last move (any card could be bluffed, cards are not included in checking)
 
         Args:
             last_move (Move): last move done in sequence (if the sequence is empty Move.OK should be passed)
 
         Returns:
-            list[Move]: list of all legal moves in the players position
+            tuple[Move, ...]: all legal moves in the players position, shared precomputed tuple
         """
-        match last_move:
-            case Move.OK | Move.CALL_BLUFF:
-                possibleMoves: list[Move] = []
-
-                if self.money >= 10:
-                    return [Move.PLAY_AFFAIR]
-                
-                possibleMoves.extend([Move.PLAY_ACE, Move.PLAY_KING, Move.PLAY_TWO, Move.PLAY_PLUS_ONE, Move.PLAY_PLUS_TWO])
-
-                if self.money >= 3:
-                    possibleMoves.append(Move.PLAY_JACK)
-
-                if self.money >= 7:
-                    possibleMoves.append(Move.PLAY_AFFAIR)
-
-                return possibleMoves
-
-            case Move.PLAY_ACE | Move.PLAY_KING | Move.BLOCK_JACK_WITH_QUEEN | Move.BLOCK_TWO_WITH_ACE | Move.BLOCK_TWO_WITH_TWO | Move.BLOCK_PLUS_TWO_WITH_KING:
-                return [Move.OK, Move.CALL_BLUFF]
-            
-            case Move.PLAY_JACK:
-                return [Move.OK, Move.CALL_BLUFF, Move.BLOCK_JACK_WITH_QUEEN]
-            
-            case Move.PLAY_TWO:
-                return [Move.OK, Move.CALL_BLUFF, Move.BLOCK_TWO_WITH_ACE, Move.BLOCK_TWO_WITH_TWO]
-            
-            case Move.PLAY_PLUS_ONE | Move.PLAY_AFFAIR:
-                return [Move.OK]
-            
-            case Move.PLAY_PLUS_TWO:
-                return [Move.OK, Move.BLOCK_PLUS_TWO_WITH_KING]
-            
-            case Move.FORFEIT:
-                return []
-            
+        return LEGAL_MOVES[last_move.value][money_bucket(self.money)]
+
+    def get_legal_move_mask(self, last_move: Move) -> int:
+        """Same as get_legal_moves, as a bitmask with bit move.value set for every legal move"""
+        return LEGAL_MOVE_MASKS[last_move.value][money_bucket(self.money)]
+
     def __str__(self) -> str:
         return f"{str(self.cards)}, {self.money} coins" 
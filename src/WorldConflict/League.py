@@ -0,0 +1,217 @@
+from .AgentRegistry import AgentFactory
+from .Tournament import MatchTask, MatchResult, play_match
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from math import sqrt, exp
+from os import cpu_count
+import json
+import os
+import random
+
+DEFAULT_MU = 25.0
+DEFAULT_SIGMA = DEFAULT_MU / 3
+BETA = DEFAULT_MU / 6                 # performance spread of a single game
+TAU = DEFAULT_MU / 300                # sigma added before every game, so ratings can follow agents that change
+DRAW_PROBABILITY = 0.05
+
+_NORMAL = NormalDist()
+
+class Rating:
+    """TrueSkill rating, mu is the estimated skill and sigma its uncertainty"""
+    __slots__ = ("mu", "sigma", "games")
+    mu: float
+    sigma: float
+    games: int
+
+    def __init__(self, mu: float = DEFAULT_MU, sigma: float = DEFAULT_SIGMA, games: int = 0) -> None:
+        self.mu = mu
+        self.sigma = sigma
+        self.games = games
+
+    @property
+    def conservative(self) -> float:
+        """Skill the agent has with high confidence, used to rank agents"""
+        return self.mu - 3 * self.sigma
+
+    def to_dict(self) -> dict:
+        return {"mu": self.mu, "sigma": self.sigma, "games": self.games}
+
+def _draw_margin(draw_probability: float) -> float:
+    return _NORMAL.inv_cdf((draw_probability + 1) / 2) * sqrt(2) * BETA
+
+def _win_factors(t: float, margin: float) -> tuple[float, float]:
+    x = t - margin
+    denominator = _NORMAL.cdf(x)
+    if denominator < 1e-160:
+        # v tends to -x for a very unexpected win
+        return -x, 1.0
+    v = _NORMAL.pdf(x) / denominator
+    return v, v * (v + x)
+
+def _draw_factors(t: float, margin: float) -> tuple[float, float]:
+    denominator = _NORMAL.cdf(margin - t) - _NORMAL.cdf(-margin - t)
+    if denominator < 1e-160:
+        return (margin - t if t > 0 else -margin - t), 1.0
+    low = _NORMAL.pdf(-margin - t)
+    high = _NORMAL.pdf(margin - t)
+    v = (low - high) / denominator
+    return v, v * v + ((margin - t) * high + (margin + t) * low) / denominator
+
+def update(first: Rating, second: Rating, outcome: float, draw_probability: float = DRAW_PROBABILITY) -> None:
+    """Updates two ratings in place with the result of one game
+
+    Args:
+        first (Rating): rating of one player
+        second (Rating): rating of the other player
+        outcome (float): 1 if first won, 0 if second won, 0.5 for a draw
+        draw_probability (float): how often games between equal players are drawn
+    """
+    if outcome == 0:
+        first, second = second, first
+
+    first_variance = first.sigma ** 2 + TAU ** 2
+    second_variance = second.sigma ** 2 + TAU ** 2
+    c = sqrt(2 * BETA ** 2 + first_variance + second_variance)
+    t = (first.mu - second.mu) / c
+    margin = _draw_margin(draw_probability) / c
+    v, w = _draw_factors(t, margin) if outcome == 0.5 else _win_factors(t, margin)
+
+    first.mu += first_variance / c * v
+    second.mu -= second_variance / c * v
+    first.sigma = sqrt(first_variance * max(1 - first_variance / c ** 2 * w, 1e-6))
+    second.sigma = sqrt(second_variance * max(1 - second_variance / c ** 2 * w, 1e-6))
+    first.games += 1
+    second.games += 1
+
+def match_quality(first: Rating, second: Rating) -> float:
+    """Between 0 and 1, high when the outcome of a game between the two is hard to predict"""
+    c2 = 2 * BETA ** 2 + first.sigma ** 2 + second.sigma ** 2
+    return sqrt(2 * BETA ** 2 / c2) * exp(-(first.mu - second.mu) ** 2 / (2 * c2))
+
+class League:
+    """Population of agents with ratings kept up to date one match at a time
+
+    Instead of a round robin, every round pairs the agents whose ratings are the least certain
+    with the opponents they are the most evenly matched with, so each round costs a fixed number
+    of matches however large the population grows. Every game result updates the two ratings
+    incrementally, no history is kept. The ratings can be saved to and resumed from a JSON file.
+    """
+    roster: dict[str, AgentFactory]
+    ratings: dict[str, Rating]
+    games_per_match: int
+    workers: int
+    seed: int
+    matches: int
+
+    def __init__(self, roster: dict[str, AgentFactory], games_per_match: int = 100, workers: int | None = None,
+                 seed: int | None = None) -> None:
+        """
+        Args:
+            roster (dict[str, AgentFactory]): agent names and picklable factories creating them
+            games_per_match (int): games played by every scheduled pair
+            workers (int | None): number of worker processes, all cores if None, 1 runs in this process
+            seed (int | None): base seed from which every match gets its own seed
+        """
+        self.roster = roster
+        self.ratings = {name: Rating() for name in roster}
+        self.games_per_match = games_per_match
+        self.workers = workers or cpu_count() or 1
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.matches = 0
+
+    def add(self, name: str, factory: AgentFactory) -> None:
+        """Adds an agent to the population with the default rating, or replaces its factory"""
+        self.roster[name] = factory
+        self.ratings.setdefault(name, Rating())
+
+    def pairings(self, count: int) -> list[tuple[str, str]]:
+        """Picks up to count matches between distinct agents
+
+        The agents are taken by decreasing sigma, each is paired with the remaining agent
+        giving the best match quality.
+        """
+        free = sorted(self.roster, key=lambda name: self.ratings[name].sigma, reverse=True)
+        pairings = []
+        while len(pairings) < count and len(free) >= 2:
+            first = free.pop(0)
+            rating = self.ratings[first]
+            second = max(free, key=lambda name: match_quality(rating, self.ratings[name]))
+            free.remove(second)
+            pairings.append((first, second))
+        return pairings
+
+    def tasks(self, pairings: list[tuple[str, str]]) -> list[MatchTask]:
+        """One task per match, seats alternate within a match and the seat of its first game from match to match"""
+        tasks = []
+        for first, second in pairings:
+            tasks.append(MatchTask(first, self.roster[first], second, self.roster[second], self.games_per_match,
+                                   self.matches % 2 == 1, self.seed + self.matches))
+            self.matches += 1
+        return tasks
+
+    def run_round(self, matches: int) -> list[MatchResult]:
+        """Plays one round of matches and updates the ratings
+
+        Args:
+            matches (int): most matches to play, fewer if there are not enough agents
+
+        Returns:
+            list[MatchResult]: results of the matches played
+        """
+        tasks = self.tasks(self.pairings(matches))
+        if self.workers == 1 or len(tasks) == 1:
+            results = list(map(play_match, tasks))
+        else:
+            with ProcessPoolExecutor(min(self.workers, len(tasks))) as executor:
+                results = list(executor.map(play_match, tasks))
+
+        for result in results:
+            self.record(result)
+        return results
+
+    def record(self, result: MatchResult) -> None:
+        """Updates the ratings with every game of a match
+
+        Only the totals come back from the workers, so wins, losses and draws are interleaved
+        to keep the updates from depending on an arbitrary order.
+        """
+        first = self.ratings[result.first]
+        second = self.ratings[result.second]
+        totals = [result.first_wins, result.second_wins, result.draws]
+        remaining = totals.copy()
+        for _ in range(result.games):
+            # the outcome with the largest share of its games left goes next
+            outcome = max(range(3), key=lambda index: remaining[index] / totals[index] if totals[index] else -1.0)
+            remaining[outcome] -= 1
+            update(first, second, (1.0, 0.0, 0.5)[outcome])
+
+    def standings(self) -> list[tuple[str, Rating]]:
+        return sorted(self.ratings.items(), key=lambda item: item[1].conservative, reverse=True)
+
+    def report(self) -> str:
+        lines = ["RATINGS", f"{'#':>3} {'agent':<24} {'games':>8} {'mu':>7} {'sigma':>7} {'rating':>7}"]
+        for place, (name, rating) in enumerate(self.standings(), 1):
+            lines.append(f"{place:>3} {name:<24} {rating.games:>8} {rating.mu:>7.2f} {rating.sigma:>7.2f} "
+                         f"{rating.conservative:>7.2f}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {"seed": self.seed, "matches": self.matches,
+                "ratings": {name: rating.to_dict() for name, rating in self.ratings.items()}}
+
+    def save(self, path: str) -> None:
+        """Writes the league state, replacing the file only once it is fully written"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+        os.replace(temporary, path)
+
+    def load(self, path: str) -> None:
+        """Resumes from a saved state, agents missing from the roster keep their rating in the file"""
+        with open(path) as file:
+            data = json.load(file)
+
+        self.seed = data["seed"]
+        self.matches = data["matches"]
+        for name, rating in data["ratings"].items():
+            self.ratings[name] = Rating(rating["mu"], rating["sigma"], rating["games"])
@@ -0,0 +1,83 @@
+from .Move import Move
+
+# money needed to play a jack, to play an affair, and from which an affair is forced
+JACK_COST = 3
+AFFAIR_COST = 7
+FORCED_AFFAIR = 10
+
+MONEY_BUCKETS = 4
+
+def money_bucket(money: int) -> int:
+    """Index of the money range the legal moves depend on: <3, 3-6, 7-9, >=10"""
+    if money >= FORCED_AFFAIR:
+        return 3
+    if money >= AFFAIR_COST:
+        return 2
+    if money >= JACK_COST:
+        return 1
+    return 0
+
+def move_mask(moves: tuple[Move, ...]) -> int:
+    """Bitmask with bit move.value set for every given move"""
+    mask = 0
+    for move in moves:
+        mask |= 1 << move.value
+    return mask
+
+def _build_legal_moves(last_move: Move, bucket: int) -> tuple[Move, ...]:
+    match last_move:
+        case Move.OK | Move.CALL_BLUFF:
+            if bucket == 3:
+                return (Move.PLAY_AFFAIR,)
+
+            moves = (Move.PLAY_ACE, Move.PLAY_KING, Move.PLAY_TWO, Move.PLAY_PLUS_ONE, Move.PLAY_PLUS_TWO)
+            if bucket >= 1:
+                moves += (Move.PLAY_JACK,)
+            if bucket >= 2:
+                moves += (Move.PLAY_AFFAIR,)
+            return moves
+
+        case Move.PLAY_ACE | Move.PLAY_KING | Move.BLOCK_JACK_WITH_QUEEN | Move.BLOCK_TWO_WITH_ACE | Move.BLOCK_TWO_WITH_TWO | Move.BLOCK_PLUS_TWO_WITH_KING:
+            return (Move.OK, Move.CALL_BLUFF)
+
+        case Move.PLAY_JACK:
+            return (Move.OK, Move.CALL_BLUFF, Move.BLOCK_JACK_WITH_QUEEN)
+
+        case Move.PLAY_TWO:
+            return (Move.OK, Move.CALL_BLUFF, Move.BLOCK_TWO_WITH_ACE, Move.BLOCK_TWO_WITH_TWO)
+
+        case Move.PLAY_PLUS_ONE | Move.PLAY_AFFAIR:
+            return (Move.OK,)
+
+        case Move.PLAY_PLUS_TWO:
+            return (Move.OK, Move.BLOCK_PLUS_TWO_WITH_KING)
+
+        case _:
+            return ()
+
+_MOVES_BY_VALUE = {move.value: move for move in Move}
+MOVE_SLOTS = max(_MOVES_BY_VALUE) + 1
+
+# LEGAL_MOVES[last_move.value][money_bucket(money)], unused move values map to no legal moves
+LEGAL_MOVES: tuple[tuple[tuple[Move, ...], ...], ...] = tuple(
+    tuple(_build_legal_moves(_MOVES_BY_VALUE[value], bucket) if value in _MOVES_BY_VALUE else ()
+          for bucket in range(MONEY_BUCKETS))
+    for value in range(MOVE_SLOTS))
+
+LEGAL_MOVE_MASKS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(move_mask(moves) for moves in row) for row in LEGAL_MOVES)
+
+def legal_moves(last_move: Move, money: int) -> tuple[Move, ...]:
+    """Legal moves after last_move (Move.OK for an empty sequence) for a player with the given money"""
+    return LEGAL_MOVES[last_move.value][money_bucket(money)]
+
+def legal_move_mask(last_move: Move, money: int) -> int:
+    """Same as legal_moves, as a bitmask with bit move.value set for each legal move"""
+    return LEGAL_MOVE_MASKS[last_move.value][money_bucket(money)]
+
+def is_legal(move: Move, last_move: Move, money: int) -> bool:
+    return (LEGAL_MOVE_MASKS[last_move.value][money_bucket(money)] >> move.value) & 1 == 1
+
+def moves_from_mask(mask: int) -> tuple[Move, ...]:
+    """Moves whose bits are set in the mask, ordered by value"""
+    return tuple(move for value, move in sorted(_MOVES_BY_VALUE.items()) if (mask >> value) & 1)
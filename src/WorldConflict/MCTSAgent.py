@@ -0,0 +1,278 @@
+from .Game import Game
+from .GameState import GameState, PlayerInfo
+from .CardDeck import DeckExhaustedError
+from .HandTables import AliasSampler, hand_sampler, hand_cards, unseen_index
+from .Belief import BeliefTracker
+from .Zobrist import TranspositionTable, MOVER_KEYS
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from math import log, sqrt
+from time import perf_counter
+from typing import Iterable
+import random
+
+# cards given away first when the preferred card is not held, the ace is kept the longest
+DISCARD_ORDER = (Card.TWO, Card.QUEEN, Card.JACK, Card.KING, Card.ACE)
+
+# playouts longer than this are scored as a draw
+MAX_PLAYOUT_PLIES = 200
+
+def heuristic_discard(cards: Iterable[Card], card_preference: Card) -> Card:
+    """Gives the preferred card if held, otherwise the least useful card of the hand"""
+    if card_preference in cards:
+        return card_preference
+
+    for card in DISCARD_ORDER:
+        if card in cards:
+            return card
+
+    return Card.ANY
+
+class _PlayoutAgent(IAgent):
+    """Plays both seats of the search game, only the discards are asked from agents during a search"""
+    rng: random.Random
+
+    def __init__(self, rng: random.Random) -> None:
+        super().__init__()
+        self.rng = rng
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        return heuristic_discard(state.player.cards, card_preference)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+        return self.rng.choice(state.player.get_legal_moves(last_move))
+
+class MCTSNode:
+    """Node of the information set tree, reached by the sequence of moves from the root"""
+    __slots__ = ("children", "visits", "reward", "availability")
+    children: dict[Move, "MCTSNode"]
+    visits: int
+    reward: float
+    availability: int
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.availability = 0
+
+class MCTSAgent(IAgent):
+    """Single observer information set Monte Carlo tree search
+
+    Every iteration deals the cards hidden from the agent (opponent's hand and draw pile) at random,
+    then descends the shared tree with UCB among the moves legal in that deal and finishes with a random playout.
+    The search reuses one game state, moves are taken back with Game.undo instead of copying the state.
+    Discards are not searched, both the agent and the playouts use heuristic_discard.
+    With beliefs, the opponent's hand is dealt following a BeliefTracker instead of uniformly.
+    With a transposition table, nodes are keyed by the agent's view of the position (GameState.information_zobrist),
+    so the move orders that lead to the same information set share one node and its statistics.
+    """
+    iterations: int | None
+    time_limit: float | None
+    exploration: float
+    rng: random.Random
+    game: Game
+    root: MCTSNode
+    tracker: BeliefTracker | None
+    table: TranspositionTable | None
+    _player: int
+    _unseen: int
+    _sampler: AliasSampler | None
+
+    def __init__(self, iterations: int | None = 1000, time_limit: float | None = None, exploration: float = 0.7,
+                 seed: int | None = None, beliefs: bool = False, table_bits: int | None = 12) -> None:
+        """
+        Args:
+            iterations (int | None): playouts per move, unlimited if None
+            time_limit (float | None): seconds of search per move, unlimited if None, the search stops at the first exhausted budget
+            exploration (float): UCB exploration constant
+            seed (int | None): seed of the deals and playouts, drawn from the random module if None
+            beliefs (bool): whether to track the opponent's claims and deal their hand accordingly
+            table_bits (int | None): the transposition table sharing the nodes has 2 ** table_bits slots, no sharing if None
+        """
+        super().__init__()
+        if iterations is None and time_limit is None:
+            raise ValueError("The search needs an iteration or a time budget")
+
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        playout_agent = _PlayoutAgent(self.rng)
+        self.game = Game([playout_agent, playout_agent], seed=self.rng.getrandbits(64))
+        self.root = MCTSNode()
+        # the seat is only known at the first move, the tracker follows it
+        self.tracker = BeliefTracker(0) if beliefs else None
+        self.table = TranspositionTable(table_bits) if table_bits is not None else None
+        self._player = 0
+        self._unseen = 0
+        self._sampler = None
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        card = heuristic_discard(state.player.cards, card_preference)
+        if self.tracker is not None:
+            self.tracker.gave(card)
+        return card
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        if self.tracker is not None:
+            self.tracker.player = state.playerId
+            self.tracker.observe(state)
+
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+        legal_moves = state.player.get_legal_moves(last_move)
+        if len(legal_moves) == 1:
+            return legal_moves[0]
+
+        self._load(state)
+        search_state = self.game.game_state
+        if self.table is not None:
+            self.table.clear()
+        # the root's reward is never used, the opponent is taken as the player who moved into it
+        self.root = self._node(search_state, 0, state.playerId ^ 1)
+
+        deadline = None if self.time_limit is None else perf_counter() + self.time_limit
+        iteration = 0
+        while self.iterations is None or iteration < self.iterations:
+            if deadline is not None and iteration % 16 == 0 and perf_counter() >= deadline:
+                break
+            self._determinize(search_state, state.playerId ^ 1)
+            self._iterate(search_state)
+            iteration += 1
+
+        # with no finished iteration there are no children, any legal move is as good
+        best = max(legal_moves, key=lambda move: self.root.children[move].visits if move in self.root.children else -1)
+        return best
+
+    def _load(self, info: PlayerInfo) -> None:
+        """Writes the observation into the search state and prepares the deals of the hidden cards"""
+        state = self.game.game_state
+        player = info.playerId
+        opponent = player ^ 1
+        self._player = player
+
+        state.players[player].cards = info.player.cards.copy()
+        state.players[player].money = info.player.money
+        state.players[opponent].money = info.players_money[opponent]
+        state.initial_player = info.initial_player
+        state.turn_player = player
+        state.current_sequence = list(info.current_sequence)
+        state.score[:] = info.score
+        state.deck.discardPile[:] = info.discarded
+        self.game.undo_log.clear()
+
+        self._unseen = unseen_index(info)
+        if self.tracker is not None:
+            self._sampler = self.tracker.sampler()
+        else:
+            self._sampler = hand_sampler(self._unseen, info.players_card_num[opponent])
+        self._determinize(state, opponent)
+
+    def _determinize(self, state: GameState, opponent: int) -> None:
+        """Deals the hidden cards anew, the search state has to be back at the root"""
+        hand_index = self._sampler.sample(self.rng)
+        hand = state.players[opponent].cards
+        hand.clear()
+        hand.extend(hand_cards(hand_index))
+        draw_pile = state.deck.drawPile
+        draw_pile[:] = hand_cards(self._unseen - hand_index)
+        self.rng.shuffle(draw_pile)
+        state.deck.rehash()
+
+    def _node(self, state: GameState, ply: int, mover: int) -> MCTSNode:
+        """Node of the agent's information set in the search state, shared through the table
+
+        A node holds the rewards of the player who moved into it, so nodes are only shared by paths
+        where the same player made the last move.
+        """
+        if self.table is None:
+            return MCTSNode()
+        key = state.information_zobrist(self._player) ^ MOVER_KEYS[mover]
+        node = self.table.probe(key)
+        if node is None:
+            node = MCTSNode()
+            # nodes near the root gather the most visits, so they keep their slots over deeper ones
+            self.table.store(key, max(127 - ply, 0), node)
+        return node
+
+    def _iterate(self, state: GameState) -> None:
+        game = self.game
+        rng = self.rng
+        exploration = self.exploration
+        score_before = (state.score[0], state.score[1])
+
+        node = self.root
+        # (node, player who moved into it)
+        path: list[tuple[MCTSNode, int]] = []
+        applied = 0
+        ended = False
+        try:
+            # selection and expansion
+            while True:
+                sequence = state.current_sequence
+                player = state.turn_player
+                legal_moves = state.players[player].get_legal_moves(sequence[-1] if sequence else Move.OK)
+
+                untried = []
+                for move in legal_moves:
+                    child = node.children.get(move)
+                    if child is None:
+                        untried.append(move)
+                    else:
+                        child.availability += 1
+
+                if untried:
+                    move = rng.choice(untried)
+                    child = None
+                else:
+                    best_value = -1.0
+                    for candidate in legal_moves:
+                        candidate_node = node.children[candidate]
+                        value = candidate_node.reward / candidate_node.visits + \
+                            exploration * sqrt(log(candidate_node.availability) / candidate_node.visits)
+                        if value > best_value:
+                            best_value = value
+                            move = candidate
+                    child = node.children[move]
+                    path.append((child, player))
+
+                applied += 1
+                ended = game.apply(move)
+                if child is None:
+                    # the node is looked up once the move is made, another order of moves may have reached it
+                    child = node.children[move] = self._node(state, len(path) + 1, player)
+                    child.availability += 1
+                    path.append((child, player))
+                node = child
+                if ended or untried:
+                    break
+
+            # playout
+            plies = 0
+            while not ended and plies < MAX_PLAYOUT_PLIES:
+                sequence = state.current_sequence
+                legal_moves = state.players[state.turn_player].get_legal_moves(sequence[-1] if sequence else Move.OK)
+                applied += 1
+                ended = game.apply(rng.choice(legal_moves))
+                plies += 1
+        except DeckExhaustedError:
+            ended = False
+
+        gained = (state.score[0] - score_before[0], state.score[1] - score_before[1])
+        if ended and gained[0] != gained[1]:
+            rewards = (1.0, 0.0) if gained[0] > gained[1] else (0.0, 1.0)
+        else:
+            rewards = (0.5, 0.5)
+
+        for _ in range(applied):
+            game.undo()
+
+        for visited, player in path:
+            visited.visits += 1
+            visited.reward += rewards[player]
+
+    def __str__(self) -> str:
+        children = sorted(self.root.children.items(), key=lambda item: item[1].visits, reverse=True)
+        return "\n".join(f"{move.name}: {node.visits} visits, {node.reward / node.visits:.3f} mean reward" for move, node in children)
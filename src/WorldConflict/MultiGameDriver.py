@@ -0,0 +1,103 @@
+from .ResumableGame import ResumableGame, DISCARD_DECISION
+from .Simulation import SimulationStats, DRAW
+from .IBatchAgent import IBatchAgent
+from .IAgent import IAgent
+from time import perf_counter
+from typing import Sequence
+import random
+
+class MultiGameDriver:
+    """Plays many games at once so that batch agents decide for all of them together
+
+    The seats of batch agents are driven by the caller of a ResumableGame, other agents are asked
+    directly by their games. Every step gathers the pending decisions of all games, gives each batch
+    agent its moves and its discards as one batch each and answers the games, which then play on
+    until their next decision. A game that ends is recorded and dealt again right away, so the
+    batches stay full until the last games.
+    """
+    agents: tuple[IAgent, IAgent]
+    games: list[ResumableGame]
+    batch_sizes: list[int]
+    _batch_agents: list[IBatchAgent]
+
+    def __init__(self, agents: Sequence[IAgent], parallel_games: int, seed: int | None = None) -> None:
+        """
+        Args:
+            agents (Sequence[IAgent]): agent of each seat, shared by all games, both seats can be the same batch agent
+            parallel_games (int): number of games played at the same time, the largest possible batch per seat
+            seed (int | None): seed from which every game gets its stream of game seeds, see Game
+        """
+        self.agents = (agents[0], agents[1])
+        base = seed if seed is not None else random.getrandbits(32)
+        seats = [None if isinstance(agent, IBatchAgent) else agent for agent in self.agents]
+        self.games = [ResumableGame(seats, base + index) for index in range(parallel_games)]
+        self.batch_sizes = []
+        self._batch_agents = []
+        for agent in self.agents:
+            if isinstance(agent, IBatchAgent) and agent not in self._batch_agents:
+                self._batch_agents.append(agent)
+
+    def run(self, num_games: int, stats: SimulationStats | None = None) -> SimulationStats:
+        """Plays num_games complete games
+
+        Args:
+            num_games (int): number of games to play
+            stats (SimulationStats | None): statistics to add the results to, new ones are created if None
+
+        Returns:
+            SimulationStats: the statistics with the results added
+        """
+        stats = stats if stats is not None else SimulationStats()
+        start = perf_counter()
+        started = 0
+        active = []
+        for game in self.games:
+            started = self._deal(game, stats, started, num_games, active)
+
+        while active:
+            for agent in self._batch_agents:
+                # games answered for the other seat's agent may have ended or wait on this one now
+                waiting = [game for game in active if game.pending is not None and self.agents[game.pending.player] is agent]
+                moves = [game for game in waiting if game.pending.kind != DISCARD_DECISION]
+                discards = [game for game in waiting if game.pending.kind == DISCARD_DECISION]
+                if moves:
+                    self.batch_sizes.append(len(moves))
+                    answers = agent.generate_moves_batch([game.pending.info for game in moves])
+                    self._answer(moves, answers)
+                if discards:
+                    self.batch_sizes.append(len(discards))
+                    answers = agent.generate_give_cards_batch([game.pending.info for game in discards],
+                                                              [game.pending.card_preference for game in discards])
+                    self._answer(discards, answers)
+
+            # every pending decision was answered, the games without a new one ended
+            still_active = []
+            for game in active:
+                if game.pending is not None:
+                    still_active.append(game)
+                else:
+                    self._record(game, stats)
+                    started = self._deal(game, stats, started, num_games, still_active)
+            active = still_active
+
+        stats.elapsed += perf_counter() - start
+        return stats
+
+    def _answer(self, games: list[ResumableGame], answers: list) -> None:
+        for game, answer in zip(games, answers):
+            game.answer(answer)
+
+    def _deal(self, game: ResumableGame, stats: SimulationStats, started: int, num_games: int,
+              active: list[ResumableGame]) -> int:
+        """Deals games until one waits for a decision or num_games were started, returns the games started"""
+        while started < num_games:
+            started += 1
+            if not game.new_game():
+                active.append(game)
+                break
+            # ended before the first decision of a batch agent
+            self._record(game, stats)
+        return started
+
+    def _record(self, game: ResumableGame, stats: SimulationStats) -> None:
+        stats.record(DRAW if game.winner is None else game.winner, game.plies, game.exhausted)
@@ -0,0 +1,100 @@
+from .GameState import PlayerInfo
+from .LegalMoves import LEGAL_MOVES, MOVE_SLOTS, money_bucket
+from .PackedState import MAX_SEQUENCE, DECK_SIZE
+from .Hand import CARD_TYPES
+from .Move import Move
+from typing import Sequence
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("ObservationEncoder needs numpy, an optional dependency installed with pip install numpy") from error
+
+# feature layout of one observation, all values are stored unscaled as float32
+HAND_OFFSET = 0                                        # own card counts per rank
+DISCARD_OFFSET = HAND_OFFSET + CARD_TYPES              # discarded card counts per rank
+MONEY_OFFSET = DISCARD_OFFSET + CARD_TYPES             # own money, opponent's money
+CARD_NUM_OFFSET = MONEY_OFFSET + 2                     # own number of cards, opponent's number of cards
+DRAW_PILE_OFFSET = CARD_NUM_OFFSET + 2                 # cards left in the draw pile
+INITIAL_OFFSET = DRAW_PILE_OFFSET + 1                  # 1 if the player started the sequence
+SCORE_OFFSET = INITIAL_OFFSET + 1                      # own score, opponent's score
+SEQUENCE_LENGTH_OFFSET = SCORE_OFFSET + 2              # number of moves in the sequence
+SEQUENCE_OFFSET = SEQUENCE_LENGTH_OFFSET + 1           # one hot move value per sequence position
+OBSERVATION_SIZE = SEQUENCE_OFFSET + MAX_SEQUENCE * MOVE_SLOTS
+
+def encode(info: PlayerInfo, observation: np.ndarray, legal_mask: np.ndarray) -> None:
+    """Writes the features of one observation and its legal moves into the given rows
+
+    Args:
+        info (PlayerInfo): what the player knows
+        observation (np.ndarray): (OBSERVATION_SIZE,) float32 row, overwritten
+        legal_mask (np.ndarray): (MOVE_SLOTS,) bool row, set at the values of the legal moves
+    """
+    observation.fill(0.0)
+    legal_mask.fill(False)
+
+    player = info.player
+    counts = player.cards.counts
+    for value in range(CARD_TYPES):
+        observation[HAND_OFFSET + value] = counts[value]
+    for card in info.discarded:
+        observation[DISCARD_OFFSET + card._value_] += 1
+
+    own = info.playerId
+    opponent = own ^ 1
+    observation[MONEY_OFFSET] = player.money
+    observation[MONEY_OFFSET + 1] = info.players_money[opponent]
+    card_num = info.players_card_num
+    observation[CARD_NUM_OFFSET] = card_num[own]
+    observation[CARD_NUM_OFFSET + 1] = card_num[opponent]
+    observation[DRAW_PILE_OFFSET] = DECK_SIZE - card_num[0] - card_num[1] - len(info.discarded)
+    observation[INITIAL_OFFSET] = info.initial_player == own
+    observation[SCORE_OFFSET] = info.score[own]
+    observation[SCORE_OFFSET + 1] = info.score[opponent]
+
+    sequence = info.current_sequence
+    observation[SEQUENCE_LENGTH_OFFSET] = len(sequence)
+    offset = SEQUENCE_OFFSET
+    for move in sequence:
+        observation[offset + move._value_] = 1.0
+        offset += MOVE_SLOTS
+
+    for move in LEGAL_MOVES[sequence[-1]._value_ if sequence else Move.OK._value_][money_bucket(player.money)]:
+        legal_mask[move._value_] = True
+
+class ObservationEncoder:
+    """Encodes batches of PlayerInfo into reused fixed width arrays
+
+    The buffers are allocated once, encoding a batch only overwrites them and returns views,
+    so they are valid until the next call. Callers can pass their own buffers instead.
+    """
+    observations: np.ndarray
+    legal_masks: np.ndarray
+
+    def __init__(self, batch_size: int) -> None:
+        self.observations = np.zeros((batch_size, OBSERVATION_SIZE), dtype=np.float32)
+        self.legal_masks = np.zeros((batch_size, MOVE_SLOTS), dtype=bool)
+
+    def encode(self, info: PlayerInfo) -> tuple[np.ndarray, np.ndarray]:
+        """Encodes one observation into the first row of the buffers, returns views of that row"""
+        encode(info, self.observations[0], self.legal_masks[0])
+        return self.observations[0], self.legal_masks[0]
+
+    def encode_batch(self, infos: Sequence[PlayerInfo], observations: np.ndarray | None = None,
+                     legal_masks: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            infos (Sequence[PlayerInfo]): observations to encode, at most as many as the buffers have rows
+            observations (np.ndarray | None): (N, OBSERVATION_SIZE) float32 buffer to use instead of the encoder's
+            legal_masks (np.ndarray | None): (N, MOVE_SLOTS) bool buffer to use instead of the encoder's
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: the rows written to, (len(infos), OBSERVATION_SIZE) and (len(infos), MOVE_SLOTS)
+        """
+        observations = self.observations if observations is None else observations
+        legal_masks = self.legal_masks if legal_masks is None else legal_masks
+        if len(infos) > len(observations) or len(infos) > len(legal_masks):
+            raise ValueError(f"Batch of {len(infos)} does not fit buffers of {min(len(observations), len(legal_masks))} rows")
+
+        for row, info in enumerate(infos):
+            encode(info, observations[row], legal_masks[row])
+        return observations[:len(infos)], legal_masks[:len(infos)]
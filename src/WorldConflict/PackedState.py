@@ -0,0 +1,183 @@
+from .GameState import GameState
+from .Inventory import Inventory
+from .Card import Card
+from .Move import Move
+import random
+
+CARD_TYPES = 5
+DECK_SIZE = 15
+MAX_CARD_COUNT = 3
+MAX_MONEY = 31
+MAX_SEQUENCE = 3
+MAX_SCORE = 0xFFFF
+
+_COUNT_BITS = 2
+_MONEY_BITS = 5
+_PLAYER_BITS = CARD_TYPES * _COUNT_BITS + _MONEY_BITS
+_MOVE_BITS = 4
+_CARD_BITS = 3
+_PILE_LENGTH_BITS = 4
+_SCORE_BITS = 16
+
+_INITIAL_SHIFT = 2 * _PLAYER_BITS
+_TURN_SHIFT = _INITIAL_SHIFT + 1
+_SEQUENCE_SHIFT = _TURN_SHIFT + 1
+_SEQUENCE_BITS = 2 + MAX_SEQUENCE * _MOVE_BITS
+_DRAW_SHIFT = _SEQUENCE_SHIFT + _SEQUENCE_BITS
+_PILE_BITS = _PILE_LENGTH_BITS + DECK_SIZE * _CARD_BITS
+_DISCARD_SHIFT = _DRAW_SHIFT + _PILE_BITS
+_SCORE_SHIFT = _DISCARD_SHIFT + _PILE_BITS
+
+POSITION_MASK = (1 << _SCORE_SHIFT) - 1
+
+_CARDS = tuple(Card(value) for value in range(CARD_TYPES))
+_MOVES = {move.value: move for move in Move}
+
+def _pack_pile(pile: list[Card]) -> int:
+    if len(pile) > DECK_SIZE:
+        raise ValueError("Pile is larger than the deck")
+
+    packed = len(pile)
+    shift = _PILE_LENGTH_BITS
+    for card in pile:
+        packed |= card.value << shift
+        shift += _CARD_BITS
+    return packed
+
+def _unpack_pile(packed: int) -> list[Card]:
+    length = packed & ((1 << _PILE_LENGTH_BITS) - 1)
+    packed >>= _PILE_LENGTH_BITS
+    pile = []
+    for _ in range(length):
+        pile.append(_CARDS[packed & 0b111])
+        packed >>= _CARD_BITS
+    return pile
+
+def pack_inventory(inventory: Inventory) -> int:
+    """Packs a hand and money into _PLAYER_BITS bits"""
+    if not 0 <= inventory.money <= MAX_MONEY:
+        raise ValueError(f"Money {inventory.money} does not fit the packed encoding")
+
+    packed = 0
+    for value, count in enumerate(inventory.cards.counts):
+        if count > MAX_CARD_COUNT:
+            raise ValueError(f"Hand {inventory.cards} does not fit the packed encoding")
+        packed |= count << (value * _COUNT_BITS)
+
+    return packed | (inventory.money << (CARD_TYPES * _COUNT_BITS))
+
+def unpack_inventory(packed: int, inventory: Inventory | None = None) -> Inventory:
+    if inventory is None:
+        inventory = Inventory()
+
+    cards = []
+    for card in _CARDS:
+        cards.extend([card] * ((packed >> (card.value * _COUNT_BITS)) & 0b11))
+    inventory.cards = cards
+    inventory.money = (packed >> (CARD_TYPES * _COUNT_BITS)) & MAX_MONEY
+    return inventory
+
+def pack_state(state: GameState) -> int:
+    """Encodes the whole game state into one int
+
+    The int is immutable, so cloning is free, and hashing and equality are the
+    native int operations. Bits from the least significant one:
+        per player (2x):  5 card counts (2 bits each), money (5 bits)
+        initial player (1 bit), turn player (1 bit)
+        current sequence: length (2 bits), 3 moves (4 bits each)
+        draw pile:        length (4 bits), 15 cards (3 bits each, bottom first)
+        discard pile:     length (4 bits), 15 cards (3 bits each, oldest first)
+        score:            2 x 16 bits
+    Hands are stored as counts, so unpacking returns them ordered by card value.
+    Everything else round trips exactly.
+
+    Args:
+        state (GameState): state to encode
+
+    Returns:
+        int: the packed state
+    """
+    sequence = state.current_sequence
+    if len(sequence) > MAX_SEQUENCE:
+        raise ValueError("Sequence is too long for the packed encoding")
+    if max(state.score) > MAX_SCORE:
+        raise ValueError("Score is too large for the packed encoding")
+
+    packed_sequence = len(sequence)
+    shift = 2
+    for move in sequence:
+        packed_sequence |= move.value << shift
+        shift += _MOVE_BITS
+
+    return (pack_inventory(state.players[0])
+            | pack_inventory(state.players[1]) << _PLAYER_BITS
+            | state.initial_player << _INITIAL_SHIFT
+            | state.turn_player << _TURN_SHIFT
+            | packed_sequence << _SEQUENCE_SHIFT
+            | _pack_pile(state.deck.drawPile) << _DRAW_SHIFT
+            | _pack_pile(state.deck.discardPile) << _DISCARD_SHIFT
+            | state.score[0] << _SCORE_SHIFT
+            | state.score[1] << (_SCORE_SHIFT + _SCORE_BITS))
+
+def unpack_state(packed: int, state: GameState | None = None, rng: random.Random | None = None) -> GameState:
+    """Decodes a packed state
+
+    Args:
+        packed (int): value returned by pack_state
+        state (GameState | None): state to overwrite in place, a new one is created if None
+        rng (random.Random | None): generator of a new state, for the games played after it, seeded from the random module if None
+
+    Returns:
+        GameState: the decoded state
+    """
+    if state is None:
+        state = GameState.blank(rng)
+
+    unpack_inventory(packed & ((1 << _PLAYER_BITS) - 1), state.players[0])
+    unpack_inventory((packed >> _PLAYER_BITS) & ((1 << _PLAYER_BITS) - 1), state.players[1])
+    state.initial_player = (packed >> _INITIAL_SHIFT) & 1
+    state.turn_player = (packed >> _TURN_SHIFT) & 1
+    state.current_sequence = list(sequence(packed))
+    state.deck.drawPile = _unpack_pile(packed >> _DRAW_SHIFT)
+    state.deck.discardPile = _unpack_pile(packed >> _DISCARD_SHIFT)
+    state.deck.rehash()
+    state.score = list(score(packed))
+    return state
+
+def position_key(packed: int) -> int:
+    """The packed state without the score, equal for identical positions in different games"""
+    return packed & POSITION_MASK
+
+def card_count(packed: int, player: int, card: Card) -> int:
+    return (packed >> (player * _PLAYER_BITS + card.value * _COUNT_BITS)) & 0b11
+
+def hand_size(packed: int, player: int) -> int:
+    hand = packed >> (player * _PLAYER_BITS)
+    return sum((hand >> (value * _COUNT_BITS)) & 0b11 for value in range(CARD_TYPES))
+
+def money(packed: int, player: int) -> int:
+    return (packed >> (player * _PLAYER_BITS + CARD_TYPES * _COUNT_BITS)) & MAX_MONEY
+
+def initial_player(packed: int) -> int:
+    return (packed >> _INITIAL_SHIFT) & 1
+
+def turn_player(packed: int) -> int:
+    return (packed >> _TURN_SHIFT) & 1
+
+def sequence(packed: int) -> tuple[Move, ...]:
+    packed_sequence = packed >> _SEQUENCE_SHIFT
+    length = packed_sequence & 0b11
+    return tuple(_MOVES[(packed_sequence >> (2 + i * _MOVE_BITS)) & 0b1111] for i in range(length))
+
+def draw_pile_size(packed: int) -> int:
+    return (packed >> _DRAW_SHIFT) & ((1 << _PILE_LENGTH_BITS) - 1)
+
+def deck_counts(packed: int) -> tuple[int, ...]:
+    """Number of cards of each type left in the draw pile"""
+    counts = [0] * CARD_TYPES
+    for card in _unpack_pile(packed >> _DRAW_SHIFT):
+        counts[card.value] += 1
+    return tuple(counts)
+
+def score(packed: int) -> tuple[int, int]:
+    return (packed >> _SCORE_SHIFT) & MAX_SCORE, (packed >> (_SCORE_SHIFT + _SCORE_BITS)) & MAX_SCORE
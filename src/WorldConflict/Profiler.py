@@ -0,0 +1,130 @@
+from .GameState import PlayerInfo
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from time import perf_counter_ns
+from typing import Callable, TypeVar
+import json
+
+T = TypeVar("T")
+
+HISTOGRAM_BUCKETS = 64
+
+class Histogram:
+    """Latency histogram with power of two nanosecond buckets, bucket i counts durations below 2**i ns"""
+    count: int
+    total_ns: int
+    min_ns: int
+    max_ns: int
+    buckets: list[int]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, duration_ns: int) -> None:
+        if self.count == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.count += 1
+        self.total_ns += duration_ns
+        self.buckets[min(duration_ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile_ns(self, fraction: float) -> int:
+        """Upper bound of the bucket holding the given fraction of the durations"""
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= threshold:
+                return min(2 ** bucket, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "mean_ns": self.mean_ns(),
+            "buckets": {f"<{2 ** bucket}": count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+class Profiler:
+    """Collects call counts and latency histograms of named phases"""
+    histograms: dict[str, Histogram]
+
+    def __init__(self) -> None:
+        self.histograms = {}
+
+    def record(self, name: str, duration_ns: int) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(duration_ns)
+
+    def timed(self, name: str, function: Callable[..., T]) -> Callable[..., T]:
+        """Wraps a function so that every call is recorded under name"""
+        record = self.record
+
+        def wrapper(*args, **kwargs) -> T:
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, perf_counter_ns() - start)
+
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def reset(self) -> None:
+        self.histograms = {}
+
+    def to_dict(self) -> dict:
+        return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as output_file:
+            json.dump(self.to_dict(), output_file, indent=4)
+
+    def report(self) -> str:
+        """Table of all phases, times include nested phases (e.g. a handler includes the agent's discard)"""
+        lines = [f"{'phase':<28} {'calls':>10} {'total ms':>10} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}"]
+        for name, histogram in sorted(self.histograms.items(), key=lambda item: item[1].total_ns, reverse=True):
+            lines.append(f"{name:<28} {histogram.count:>10} {histogram.total_ns / 1e6:>10.1f} {histogram.mean_ns() / 1e3:>9.2f} "
+                         f"{histogram.percentile_ns(0.5) / 1e3:>9.2f} {histogram.percentile_ns(0.99) / 1e3:>9.2f} "
+                         f"{histogram.max_ns / 1e3:>9.2f}")
+        return "\n".join(lines)
+
+class ProfiledAgent(IAgent):
+    """Forwards to another agent, recording how long its decisions take"""
+    agent: IAgent
+    profiler: Profiler
+    name: str
+
+    def __init__(self, agent: IAgent, profiler: Profiler, name: str) -> None:
+        super().__init__()
+        self.agent = agent
+        self.profiler = profiler
+        self.name = name
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        start = perf_counter_ns()
+        try:
+            return self.agent.generate_give_card(state, card_preference)
+        finally:
+            self.profiler.record(f"{self.name}.generate_give_card", perf_counter_ns() - start)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        start = perf_counter_ns()
+        try:
+            return self.agent.generate_move(state)
+        finally:
+            self.profiler.record(f"{self.name}.generate_move", perf_counter_ns() - start)
@@ -0,0 +1,31 @@
+from .GameState import PlayerInfo
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+import random
+
+class RandomAgent(IAgent):
+    """Agent choosing uniformly among the legal moves, used as a baseline opponent and for simulations"""
+    rng: random.Random
+
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        Args:
+            seed (int | None): seed of the agent's choices, drawn from the random module if None
+        """
+        super().__init__()
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        cards = state.player.cards.listed()
+        if card_preference in cards:
+            return card_preference
+
+        if not cards:
+            return Card.ANY
+
+        return self.rng.choice(cards)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+        return self.rng.choice(state.player.get_legal_moves(last_move))
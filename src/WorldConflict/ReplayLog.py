@@ -0,0 +1,235 @@
+from .GameState import GameState, PlayerInfo
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from queue import Queue
+from threading import Thread
+from typing import Iterator
+import os
+import struct
+
+FILE_MAGIC = b"WCRL"
+FORMAT_VERSION = 1
+FILE_HEADER = struct.Struct("<4sB")
+# number of records, bytes of records following the chunk header
+CHUNK_HEADER = struct.Struct("<II")
+# bytes following the length field, game seed, initial player, deal, result
+RECORD_HEADER = struct.Struct("<HQB4sB")
+
+# event bytes: a move is its value (< 16), a discarded card is DISCARD_EVENT | card value
+DISCARD_EVENT = 0x10
+
+# results of a record
+RESULT_DRAW = 2
+RESULT_UNFINISHED = 3
+
+def encode_record(seed: int, initial_player: int, deal: bytes, result: int, events: bytes | bytearray) -> bytes:
+    """Binary record of one game
+
+    Args:
+        seed (int): game seed passed to Game.new_game
+        initial_player (int): player starting the game
+        deal (bytes): the four dealt card values as player 0, player 1, player 0, player 1, each hand in rank order
+        result (int): the winner, RESULT_DRAW or RESULT_UNFINISHED (e.g. the deck ran out)
+        events (bytes | bytearray): one byte per move made and per card given away, in game order
+
+    Returns:
+        bytes: the record
+    """
+    return RECORD_HEADER.pack(RECORD_HEADER.size - 2 + len(events), seed, initial_player, deal, result) + events
+
+def decode_record(record: bytes | memoryview) -> tuple[int, int, tuple[Card, ...], int, list[Move | Card]]:
+    """Inverse of encode_record, returns the seed, initial player, deal, result and the decoded events"""
+    _, seed, initial_player, deal, result = RECORD_HEADER.unpack_from(record)
+    events: list[Move | Card] = [Card(event & ~DISCARD_EVENT) if event & DISCARD_EVENT else Move(event)
+                                 for event in bytes(record[RECORD_HEADER.size:])]
+    return seed, initial_player, tuple(Card(card) for card in deal), result, events
+
+class ReplayWriter:
+    """Buffered writer of game records into rotating files
+
+    Records are collected in memory and handed in chunks to a background thread,
+    which does all file writes, so the game loop only waits when the queue of pending chunks is full.
+    Every file starts with FILE_HEADER followed by chunks of CHUNK_HEADER and records,
+    a new file is started once a file grows over max_file_bytes.
+    """
+    directory: str
+    prefix: str
+    chunk_bytes: int
+    max_file_bytes: int
+    files: list[str]
+    records: int
+    _buffer: bytearray
+    _buffer_records: int
+    _queue: Queue
+    _thread: Thread
+    _error: BaseException | None
+
+    def __init__(self, directory: str, prefix: str = "replays", chunk_bytes: int = 1 << 20,
+                 max_file_bytes: int = 256 << 20, max_pending_chunks: int = 8) -> None:
+        """
+        Args:
+            directory (str): where the files are created
+            prefix (str): file names are prefix-00000.wcr, prefix-00001.wcr, ...
+            chunk_bytes (int): size from which the buffered records are handed to the writing thread
+            max_file_bytes (int): size from which the next chunk goes to a new file
+            max_pending_chunks (int): chunks waiting to be written before writing a record blocks
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.chunk_bytes = chunk_bytes
+        self.max_file_bytes = max_file_bytes
+        self.files = []
+        self.records = 0
+        self._buffer = bytearray()
+        self._buffer_records = 0
+        self._queue = Queue(max_pending_chunks)
+        self._error = None
+        self._thread = Thread(target=self._write_chunks, name="ReplayWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, record: bytes) -> None:
+        self._buffer += record
+        self._buffer_records += 1
+        self.records += 1
+        if len(self._buffer) >= self.chunk_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hands the buffered records to the writing thread"""
+        if self._error is not None:
+            raise RuntimeError("Writing the replays failed") from self._error
+
+        if self._buffer_records:
+            self._queue.put((self._buffer_records, bytes(self._buffer)))
+            self._buffer.clear()
+            self._buffer_records = 0
+
+    def close(self) -> None:
+        """Writes everything buffered and waits for the writing thread to finish"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Writing the replays failed") from self._error
+
+    def __enter__(self) -> "ReplayWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_chunks(self) -> None:
+        output_file = None
+        try:
+            while (chunk := self._queue.get()) is not None:
+                count, data = chunk
+                if output_file is None or output_file.tell() >= self.max_file_bytes:
+                    if output_file is not None:
+                        output_file.close()
+                    path = os.path.join(self.directory, f"{self.prefix}-{len(self.files):05d}.wcr")
+                    output_file = open(path, "wb")
+                    output_file.write(FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION))
+                    self.files.append(path)
+                output_file.write(CHUNK_HEADER.pack(count, len(data)))
+                output_file.write(data)
+        except BaseException as error:
+            self._error = error
+            # keep consuming so that writers never block on a dead thread
+            while self._queue.get() is not None:
+                pass
+        finally:
+            if output_file is not None:
+                output_file.close()
+
+def iter_records(path: str) -> Iterator[bytes]:
+    """Reads the records of one replay file in order"""
+    with open(path, "rb") as input_file:
+        magic, version = FILE_HEADER.unpack(input_file.read(FILE_HEADER.size))
+        if magic != FILE_MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a replay file of version {FORMAT_VERSION}")
+
+        while header := input_file.read(CHUNK_HEADER.size):
+            count, length = CHUNK_HEADER.unpack(header)
+            data = memoryview(input_file.read(length))
+            offset = 0
+            for _ in range(count):
+                end = offset + 2 + struct.unpack_from("<H", data, offset)[0]
+                yield bytes(data[offset:end])
+                offset = end
+
+class GameRecorder:
+    """Collects the events of the game being played, see Game.enable_recording"""
+    writer: ReplayWriter
+    recording: bool
+    _header: tuple[int, int, bytes]
+    _score: tuple[int, int]
+    _events: bytearray
+
+    def __init__(self, writer: ReplayWriter) -> None:
+        self.writer = writer
+        self.recording = False
+        self._events = bytearray()
+
+    def begin(self, seed: int, state: GameState) -> None:
+        """Starts the record of a freshly dealt game, an unfinished previous record is written as such"""
+        if self.recording:
+            self.end(RESULT_UNFINISHED)
+
+        hands = state.players[0].cards, state.players[1].cards
+        deal = bytes((hands[0][0].value, hands[1][0].value, hands[0][1].value, hands[1][1].value))
+        self._header = (seed, state.initial_player, deal)
+        self._score = (state.score[0], state.score[1])
+        self._events.clear()
+        self.recording = True
+
+    def move(self, move: Move) -> None:
+        if self.recording:
+            self._events.append(move.value)
+
+    def discard(self, card: Card) -> None:
+        if self.recording:
+            self._events.append(DISCARD_EVENT | card.value)
+
+    def finish(self, state: GameState) -> None:
+        """Ends the record of a game that ended by the rules"""
+        gained = (state.score[0] - self._score[0], state.score[1] - self._score[1])
+        if gained[0] > gained[1]:
+            self.end(0)
+        elif gained[1] > gained[0]:
+            self.end(1)
+        else:
+            self.end(RESULT_DRAW)
+
+    def stop(self) -> None:
+        """Ends recording, a game with events is written as unfinished, a game not started yet is dropped"""
+        if self.recording and self._events:
+            self.end(RESULT_UNFINISHED)
+        self.recording = False
+
+    def end(self, result: int) -> None:
+        if not self.recording:
+            return
+
+        seed, initial_player, deal = self._header
+        self.writer.write(encode_record(seed, initial_player, deal, result, self._events))
+        self.recording = False
+
+class RecordingAgent(IAgent):
+    """Forwards to another agent, recording the cards it gives away"""
+    agent: IAgent
+    recorder: GameRecorder
+
+    def __init__(self, agent: IAgent, recorder: GameRecorder) -> None:
+        super().__init__()
+        self.agent = agent
+        self.recorder = recorder
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        card = self.agent.generate_give_card(state, card_preference)
+        self.recorder.discard(card)
+        return card
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        return self.agent.generate_move(state)
@@ -0,0 +1,222 @@
+from .ReplayLog import FILE_HEADER, FILE_MAGIC, FORMAT_VERSION, CHUNK_HEADER, RECORD_HEADER, DISCARD_EVENT, RESULT_UNFINISHED
+from .Game import Game, take_move
+from .GameState import PlayerInfo
+from .CardDeck import DeckExhaustedError
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from array import array
+from bisect import bisect_right
+from typing import Iterator, Sequence
+import mmap
+import os
+import random
+import struct
+
+_LENGTH = struct.Struct("<H")
+INDEX_SUFFIX = ".idx"
+
+class ReplayRecord:
+    """One recorded game, the events stay encoded until they are asked for"""
+    __slots__ = ("seed", "initial_player", "deal", "result", "events")
+    seed: int
+    initial_player: int
+    deal: tuple[Card, ...]
+    result: int
+    events: bytes
+
+    def __init__(self, record: bytes | memoryview) -> None:
+        _, self.seed, self.initial_player, deal, self.result = RECORD_HEADER.unpack_from(record)
+        self.deal = tuple(Card(card) for card in deal)
+        self.events = bytes(record[RECORD_HEADER.size:])
+
+    def decoded_events(self) -> list[Move | Card]:
+        return [Card(event & ~DISCARD_EVENT) if event & DISCARD_EVENT else Move(event) for event in self.events]
+
+    def moves(self) -> list[Move]:
+        return [Move(event) for event in self.events if not event & DISCARD_EVENT]
+
+    def plies(self) -> int:
+        return sum(1 for event in self.events if not event & DISCARD_EVENT)
+
+class _ReplayScript:
+    """Events of a record shared by both replaying agents, the engine asks for them in recorded order"""
+    events: bytes
+    position: int
+
+    def __init__(self, events: bytes) -> None:
+        self.events = events
+        self.position = 0
+
+    def next(self) -> int:
+        if self.position >= len(self.events):
+            raise RuntimeError("The replay asked for more decisions than were recorded")
+        event = self.events[self.position]
+        self.position += 1
+        return event
+
+class ReplayAgent(IAgent):
+    """Repeats the decisions of a record"""
+    script: _ReplayScript
+
+    def __init__(self, script: _ReplayScript) -> None:
+        super().__init__()
+        self.script = script
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        event = self.script.next()
+        if not event & DISCARD_EVENT:
+            raise RuntimeError(f"Recorded move {Move(event)} where a card was given away")
+        return Card(event & ~DISCARD_EVENT)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        event = self.script.next()
+        if event & DISCARD_EVENT:
+            raise RuntimeError(f"Recorded card {Card(event & ~DISCARD_EVENT)} where a move was made")
+        return Move(event)
+
+def replay(record: ReplayRecord, ply: int | None = None) -> Game:
+    """Rebuilds the game of a record by playing its decisions through the engine
+
+    Args:
+        record (ReplayRecord): the recorded game
+        ply (int | None): number of moves to replay, the whole game if None
+
+    Returns:
+        Game: game whose state is the position after ply moves (including the discards those moves caused)
+    """
+    script = _ReplayScript(record.events)
+    agent = ReplayAgent(script)
+    game = Game([agent, agent])
+    game.new_game(record.seed)
+    state = game.game_state
+
+    plies = record.plies() if ply is None else ply
+    for _ in range(plies):
+        try:
+            game.make_move(take_move(state, state.players[state.turn_player], agent))
+        except DeckExhaustedError:
+            if record.result != RESULT_UNFINISHED:
+                raise
+            break
+    return game
+
+class ReplayReader:
+    """Random access to the records of replay files written by ReplayWriter
+
+    The files are memory-mapped and never read as a whole. So are the indices, which hold the offset
+    of every record of a file and are stored next to it (file + INDEX_SUFFIX), rebuilt only when the
+    file is newer than its index. starts holds the number of records before every file, so finding
+    a record is a binary search over the files and one offset read, without loading any index.
+    """
+    paths: list[str]
+    starts: array
+    _maps: list[mmap.mmap]
+    _index_maps: list[mmap.mmap]
+    _offsets: list[memoryview]
+
+    def __init__(self, paths: str | Sequence[str], write_index: bool = True) -> None:
+        """
+        Args:
+            paths (str | Sequence[str]): replay files, or a directory whose .wcr files are read in name order
+            write_index (bool): save the indices of files that had none, without saving they are held in memory
+        """
+        if isinstance(paths, str):
+            if os.path.isdir(paths):
+                paths = [os.path.join(paths, name) for name in sorted(os.listdir(paths)) if name.endswith(".wcr")]
+            else:
+                paths = [paths]
+
+        self.paths = list(paths)
+        self.starts = array("q", [0])
+        self._maps = []
+        self._index_maps = []
+        self._offsets = []
+        for path in self.paths:
+            with open(path, "rb") as input_file:
+                replay_map = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(replay_map)
+            offsets = self._load_index(path, replay_map, write_index)
+            self._offsets.append(offsets)
+            self.starts.append(self.starts[-1] + len(offsets))
+
+    def _load_index(self, path: str, replay_map: mmap.mmap, write_index: bool) -> memoryview:
+        index_path = path + INDEX_SUFFIX
+        if not (os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(path)):
+            offsets = self._build_index(path, replay_map)
+            if not write_index:
+                return memoryview(offsets)
+            with open(index_path, "wb") as index_file:
+                offsets.tofile(index_file)
+
+        if os.path.getsize(index_path) == 0:
+            # empty files cannot be mapped
+            return memoryview(array("q"))
+        with open(index_path, "rb") as index_file:
+            index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_maps.append(index_map)
+        return memoryview(index_map).cast("q")
+
+    @staticmethod
+    def _build_index(path: str, replay_map: mmap.mmap) -> array:
+        magic, version = FILE_HEADER.unpack_from(replay_map)
+        if magic != FILE_MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a replay file of version {FORMAT_VERSION}")
+
+        offsets = array("q")
+        position = FILE_HEADER.size
+        while position < len(replay_map):
+            count, length = CHUNK_HEADER.unpack_from(replay_map, position)
+            offset = position + CHUNK_HEADER.size
+            for _ in range(count):
+                offsets.append(offset)
+                offset += _LENGTH.size + _LENGTH.unpack_from(replay_map, offset)[0]
+            position += CHUNK_HEADER.size + length
+        return offsets
+
+    def __len__(self) -> int:
+        return self.starts[-1]
+
+    def raw(self, index: int) -> bytes:
+        """Encoded record, only its own bytes are read from the mapped file"""
+        file_id = bisect_right(self.starts, index) - 1
+        replay_map = self._maps[file_id]
+        offset = self._offsets[file_id][index - self.starts[file_id]]
+        return replay_map[offset:offset + _LENGTH.size + _LENGTH.unpack_from(replay_map, offset)[0]]
+
+    def __getitem__(self, index: int) -> ReplayRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Record {index} out of range")
+        return ReplayRecord(self.raw(index))
+
+    def __iter__(self) -> Iterator[ReplayRecord]:
+        """Streams all records in order, a file at a time"""
+        for index in range(len(self)):
+            yield self[index]
+
+    def sample(self, count: int, rng: random.Random | None = None) -> list[ReplayRecord]:
+        """Records drawn uniformly with replacement"""
+        rng = rng if rng is not None else random.Random()
+        total = len(self)
+        return [self[rng.randrange(total)] for _ in range(count)]
+
+    def state_at(self, index: int, ply: int | None = None) -> Game:
+        """Game of record index replayed up to ply, see replay"""
+        return replay(self[index], ply)
+
+    def close(self) -> None:
+        for offsets in self._offsets:
+            offsets.release()
+        for replay_map in self._maps + self._index_maps:
+            replay_map.close()
+        self._offsets = []
+        self._maps = []
+        self._index_maps = []
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,178 @@
+from .Game import Game, take_move
+from .GameState import PlayerInfo
+from .CardDeck import DeckExhaustedError
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from typing import Sequence
+
+MOVE_DECISION = 0
+DISCARD_DECISION = 1
+
+class _DecisionPending(Exception):
+    """Interrupts a move when a caller driven seat has to give a card away"""
+    pass
+
+class Decision:
+    """Decision the caller has to answer before the game can go on"""
+    __slots__ = ("kind", "player", "info", "card_preference")
+    kind: int
+    player: int
+    info: PlayerInfo
+    card_preference: Card
+
+    def __init__(self, kind: int, player: int, info: PlayerInfo, card_preference: Card = Card.ANY) -> None:
+        self.kind = kind
+        self.player = player
+        self.info = info
+        self.card_preference = card_preference
+
+class _Seat(IAgent):
+    """Agent of a seat, answers discards from the answers already given to the current move first"""
+    game: "ResumableGame"
+    player: int
+    agent: IAgent | None
+
+    def __init__(self, game: "ResumableGame", player: int, agent: IAgent | None) -> None:
+        super().__init__()
+        self.game = game
+        self.player = player
+        self.agent = agent
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        game = self.game
+        if game._cursor < len(game._answers):
+            card = game._answers[game._cursor]
+            game._cursor += 1
+            return card
+
+        # the engine can hand over a snapshot from the start of the move, e.g. for the discards after an ace's draws,
+        # and the move is undone before a pending decision is answered, so the snapshot is taken from the live state
+        state = PlayerInfo(game.game.game_state, self.player)
+        if self.agent is None:
+            game.pending = Decision(DISCARD_DECISION, self.player, state, card_preference)
+            raise _DecisionPending()
+
+        card = self.agent.generate_give_card(state, card_preference)
+        game._answers.append(card)
+        game._cursor += 1
+        return card
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        return self.agent.generate_move(state)
+
+class ResumableGame:
+    """Game in which some seats are played by the caller, one decision at a time
+
+    The engine asks for discards in the middle of a move, so when a caller driven seat has to discard,
+    the move is interrupted, taken back with Game.undo and the decision is returned.
+    Once it is answered, the move is played again from the start. The discards already given during
+    the move, by either seat, are answered from memory, so agents are never asked twice.
+    """
+    game: Game
+    pending: Decision | None
+    winner: int | None
+    exhausted: bool
+    plies: int
+    _seats: list[_Seat]
+    _move: Move | None
+    _answers: list[Card]
+    _cursor: int
+    _score: tuple[int, int]
+
+    def __init__(self, agents: Sequence[IAgent | None], seed: int | None = None) -> None:
+        """
+        Args:
+            agents (Sequence[IAgent | None]): agent of each seat, None for the seats whose decisions the caller makes
+            seed (int | None): seed of the stream of game seeds, see Game
+        """
+        self._seats = [_Seat(self, player, agent) for player, agent in enumerate(agents)]
+        self.game = Game(self._seats, seed)
+        self.pending = None
+        self.winner = None
+        self.exhausted = False
+        self.plies = 0
+        self._move = None
+        self._answers = []
+        self._cursor = 0
+
+    def new_game(self, seed: int | None = None) -> bool:
+        """Deals a new game and plays it until the first decision of a caller driven seat
+
+        Args:
+            seed (int | None): seed of the game, see Game.new_game
+
+        Returns:
+            bool: whether the game already ended
+        """
+        self.game.new_game(seed)
+        state = self.game.game_state
+        self._score = (state.score[0], state.score[1])
+        self.pending = None
+        self.winner = None
+        self.exhausted = False
+        self.plies = 0
+        self._move = None
+        self._answers.clear()
+        return self._advance()
+
+    def answer(self, decision: Move | Card) -> bool:
+        """Answers the pending decision and plays on until the next decision of a caller driven seat
+
+        An illegal move forfeits the game, as does giving away a card that may not be given, like with agents.
+
+        Args:
+            decision (Move | Card): a move for a MOVE_DECISION, a card for a DISCARD_DECISION
+
+        Returns:
+            bool: whether the game ended
+        """
+        pending = self.pending
+        if pending is None:
+            raise RuntimeError("No decision is pending")
+
+        if pending.kind == MOVE_DECISION:
+            if not isinstance(decision, Move):
+                raise ValueError(f"Expected a move, got {decision}")
+            state = self.game.game_state
+            last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+            if not (state.players[pending.player].get_legal_move_mask(last_move) >> decision.value) & 1:
+                decision = Move.FORFEIT
+            self._move = decision
+        else:
+            if not isinstance(decision, Card):
+                raise ValueError(f"Expected a card, got {decision}")
+            self._answers.append(decision)
+
+        self.pending = None
+        return self._advance()
+
+    def _advance(self) -> bool:
+        game = self.game
+        state = game.game_state
+        while True:
+            if self._move is None:
+                player = state.turn_player
+                if self._seats[player].agent is None:
+                    self.pending = Decision(MOVE_DECISION, player, PlayerInfo(state, player))
+                    return False
+                self._move = take_move(state, state.players[player], self._seats[player])
+
+            self._cursor = 0
+            try:
+                ended = game.apply(self._move)
+            except _DecisionPending:
+                game.undo()
+                return False
+            except DeckExhaustedError:
+                self.exhausted = True
+                ended = True
+
+            game.undo_log.clear()
+            self.plies += 1
+            self._move = None
+            self._answers.clear()
+            if ended:
+                gained = (state.score[0] - self._score[0], state.score[1] - self._score[1])
+                self.winner = None if gained[0] == gained[1] else int(gained[1] > gained[0])
+                return True
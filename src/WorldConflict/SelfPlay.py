@@ -0,0 +1,256 @@
+from .AgentRegistry import AgentFactory, create_agent
+from .Environment import encode_decision, ENVIRONMENT_OBSERVATION_SIZE, ACTION_SIZE, DISCARD_ACTION_OFFSET
+from .GameState import PlayerInfo
+from .Simulation import Simulator, DRAW
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from multiprocessing import get_context
+from os import cpu_count
+from time import perf_counter
+from typing import Iterator, Sequence
+import os
+import random
+import traceback
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("SelfPlay needs numpy, an optional dependency installed with pip install numpy") from error
+
+# name: (dtype, shape of one row)
+FIELDS: dict[str, tuple[type, tuple[int, ...]]] = {
+    "observations": (np.float32, (ENVIRONMENT_OBSERVATION_SIZE,)),
+    "legal_masks": (np.bool_, (ACTION_SIZE,)),
+    "actions": (np.int16, ()),
+    "players": (np.int8, ()),
+    "game_ids": (np.int64, ()),
+    # 1 if the deciding player won the game, -1 if they lost, 0 for a draw
+    "outcomes": (np.float32, ()),
+}
+
+Batch = dict[str, np.ndarray]
+
+def _allocate(rows: int) -> Batch:
+    return {name: np.zeros((rows,) + shape, dtype=dtype) for name, (dtype, shape) in FIELDS.items()}
+
+class TrajectoryBuffer:
+    """Rows of decisions in preallocated arrays, the observation is encoded straight into its row"""
+    arrays: Batch
+    rows: int
+
+    def __init__(self, capacity: int) -> None:
+        self.arrays = _allocate(capacity)
+        self.rows = 0
+
+    def add(self, info: PlayerInfo, card_preference: Card | None, action: int) -> None:
+        if self.rows == len(self.arrays["actions"]):
+            self.arrays = {name: np.concatenate([array, np.zeros_like(array)]) for name, array in self.arrays.items()}
+
+        row = self.rows
+        arrays = self.arrays
+        encode_decision(info, card_preference, arrays["observations"][row], arrays["legal_masks"][row])
+        arrays["actions"][row] = action
+        arrays["players"][row] = info.playerId
+        self.rows += 1
+
+    def finish_game(self, first_row: int, game_id: int, winner: int) -> None:
+        """Labels the rows of a game with its id and the outcome for each decision's player"""
+        rows = slice(first_row, self.rows)
+        self.arrays["game_ids"][rows] = game_id
+        if winner == DRAW:
+            self.arrays["outcomes"][rows] = 0.0
+        else:
+            self.arrays["outcomes"][rows] = np.where(self.arrays["players"][rows] == winner, 1.0, -1.0)
+
+    def take(self) -> Batch:
+        """Copies out the filled rows and empties the buffer"""
+        batch = {name: array[:self.rows].copy() for name, array in self.arrays.items()}
+        self.rows = 0
+        return batch
+
+class TrajectoryAgent(IAgent):
+    """Forwards to another agent, adding each of its decisions to a buffer"""
+    agent: IAgent
+    buffer: TrajectoryBuffer
+
+    def __init__(self, agent: IAgent, buffer: TrajectoryBuffer) -> None:
+        super().__init__()
+        self.agent = agent
+        self.buffer = buffer
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        card = self.agent.generate_give_card(state, card_preference)
+        if isinstance(card, Card) and card != Card.ANY:
+            self.buffer.add(state, card_preference, DISCARD_ACTION_OFFSET + card.value)
+        return card
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        move = self.agent.generate_move(state)
+        self.buffer.add(state, None, move.value)
+        return move
+
+def generate_batches(factories: Sequence[AgentFactory], games: int, first_game_id: int, seed: int,
+                     batch_rows: int) -> Iterator[Batch]:
+    """Plays self-play games, yielding their decisions in batches of about batch_rows rows
+
+    Args:
+        factories (Sequence[AgentFactory]): factories of the two seats
+        games (int): number of games to play
+        first_game_id (int): id of the first game, the following ones are numbered on
+        seed (int): seed of the games and of the agents taking a seed argument
+        batch_rows (int): rows from which a batch is yielded after a game ends
+    """
+    rng = random.Random(seed)
+    buffer = TrajectoryBuffer(batch_rows + 256)
+    agents = [TrajectoryAgent(create_agent(factory, rng.getrandbits(64)), buffer) for factory in factories]
+    simulator = Simulator(agents, rng.getrandbits(64))
+
+    for game_id in range(first_game_id, first_game_id + games):
+        first_row = buffer.rows
+        winner, _, _ = simulator.play_game()
+        buffer.finish_game(first_row, game_id, winner)
+
+        if buffer.rows >= batch_rows:
+            yield buffer.take()
+
+    if buffer.rows:
+        yield buffer.take()
+
+def _worker(queue, factories: Sequence[AgentFactory], games: int, first_game_id: int, seed: int, batch_rows: int) -> None:
+    """Worker process, puts batches on the bounded queue (blocking while it is full) and None when done"""
+    try:
+        for batch in generate_batches(factories, games, first_game_id, seed, batch_rows):
+            queue.put(batch)
+        queue.put(None)
+    except BaseException:
+        queue.put(traceback.format_exc())
+
+class ShardWriter:
+    """Collects rows into shards of exactly shard_size rows, saved as shard-00000.npz, shard-00001.npz, ..."""
+    directory: str
+    shard_size: int
+    shards: list[str]
+    rows: int
+    _shard: Batch
+    _filled: int
+
+    def __init__(self, directory: str, shard_size: int) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.shards = []
+        self.rows = 0
+        self._shard = _allocate(shard_size)
+        self._filled = 0
+
+    def add(self, batch: Batch) -> None:
+        rows = len(batch["actions"])
+        start = 0
+        while start < rows:
+            count = min(rows - start, self.shard_size - self._filled)
+            for name, array in self._shard.items():
+                array[self._filled:self._filled + count] = batch[name][start:start + count]
+            self._filled += count
+            start += count
+            if self._filled == self.shard_size:
+                self.flush()
+        self.rows += rows
+
+    def flush(self) -> None:
+        """Saves the rows collected so far, only the last shard of a run can be smaller than shard_size"""
+        if not self._filled:
+            return
+
+        path = os.path.join(self.directory, f"shard-{len(self.shards):05d}.npz")
+        np.savez(path, **{name: array[:self._filled] for name, array in self._shard.items()})
+        self.shards.append(path)
+        self._filled = 0
+
+class SelfPlayStats:
+    games: int
+    rows: int
+    shards: list[str]
+    elapsed: float
+
+    def __init__(self, games: int, rows: int, shards: list[str], elapsed: float) -> None:
+        self.games = games
+        self.rows = rows
+        self.shards = shards
+        self.elapsed = elapsed
+
+    def report(self) -> str:
+        return f"{self.games} games, {self.rows} decisions in {len(self.shards)} shards, " \
+               f"{self.elapsed:.1f}s ({self.games / self.elapsed if self.elapsed else 0:.0f} games/s)"
+
+class SelfPlay:
+    """Generates training data from self-play games in worker processes
+
+    Workers encode every decision as it is made and send batches through a bounded queue,
+    so a slow disk makes them wait instead of piling up batches in memory.
+    This process takes the batches off the queue and writes the shards.
+    """
+    factories: Sequence[AgentFactory]
+    directory: str
+    shard_size: int
+    workers: int
+    queue_size: int
+    batch_rows: int
+    seed: int
+
+    def __init__(self, factories: Sequence[AgentFactory], directory: str, shard_size: int = 1 << 16,
+                 workers: int | None = None, queue_size: int = 16, batch_rows: int = 4096, seed: int | None = None) -> None:
+        """
+        Args:
+            factories (Sequence[AgentFactory]): picklable factories of the two seats
+            directory (str): where the shards are written
+            shard_size (int): decisions per shard
+            workers (int | None): number of worker processes, all cores if None, 1 runs in this process
+            queue_size (int): batches that can wait to be written before workers block
+            batch_rows (int): decisions a worker collects before sending them
+            seed (int | None): base seed from which every worker gets its own seed
+        """
+        self.factories = factories
+        self.directory = directory
+        self.shard_size = shard_size
+        self.workers = workers or cpu_count() or 1
+        self.queue_size = queue_size
+        self.batch_rows = batch_rows
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+
+    def run(self, games: int) -> SelfPlayStats:
+        start = perf_counter()
+        writer = ShardWriter(self.directory, self.shard_size)
+        shares = [games // self.workers + (worker < games % self.workers) for worker in range(self.workers)]
+        first_ids = [sum(shares[:worker]) for worker in range(self.workers)]
+
+        if self.workers == 1:
+            for batch in generate_batches(self.factories, games, 0, self.seed, self.batch_rows):
+                writer.add(batch)
+        else:
+            context = get_context()
+            queue = context.Queue(self.queue_size)
+            processes = [context.Process(target=_worker, daemon=True,
+                                         args=(queue, self.factories, shares[worker], first_ids[worker],
+                                               self.seed + worker, self.batch_rows))
+                         for worker in range(self.workers)]
+            for process in processes:
+                process.start()
+
+            running = len(processes)
+            try:
+                while running:
+                    batch = queue.get()
+                    if batch is None:
+                        running -= 1
+                    elif isinstance(batch, str):
+                        raise RuntimeError(f"Self-play worker failed:\n{batch}")
+                    else:
+                        writer.add(batch)
+            finally:
+                for process in processes:
+                    if running:
+                        process.terminate()
+                    process.join()
+
+        writer.flush()
+        return SelfPlayStats(games, writer.rows, writer.shards, perf_counter() - start)
@@ -0,0 +1,163 @@
+from .Game import Game, take_move
+from .IAgent import IAgent
+from .CardDeck import DeckExhaustedError
+from collections import Counter
+from math import sqrt
+from time import perf_counter
+from typing import Sequence
+
+DRAW = -1
+
+class SimulationStats:
+    """Aggregated results of simulated games, kept as running sums so millions of games fit in constant memory"""
+    games: int
+    wins: list[int]
+    draws: int
+    exhausted: int
+    total_plies: int
+    total_plies_squared: int
+    length_histogram: Counter[int]
+    elapsed: float
+
+    def __init__(self) -> None:
+        self.games = 0
+        self.wins = [0, 0]
+        self.draws = 0
+        self.exhausted = 0
+        self.total_plies = 0
+        self.total_plies_squared = 0
+        self.length_histogram = Counter()
+        self.elapsed = 0.0
+
+    def record(self, winner: int, plies: int, exhausted: bool = False) -> None:
+        """Adds a single finished game
+
+        Args:
+            winner (int): id of the winning player, or DRAW
+            plies (int): number of moves made during the game
+            exhausted (bool): whether the game was stopped because the deck ran out
+        """
+        self.games += 1
+        if winner == DRAW:
+            self.draws += 1
+        else:
+            self.wins[winner] += 1
+
+        if exhausted:
+            self.exhausted += 1
+
+        self.total_plies += plies
+        self.total_plies_squared += plies * plies
+        self.length_histogram[plies] += 1
+
+    def merge(self, other: "SimulationStats") -> None:
+        self.games += other.games
+        self.wins = [self.wins[0] + other.wins[0], self.wins[1] + other.wins[1]]
+        self.draws += other.draws
+        self.exhausted += other.exhausted
+        self.total_plies += other.total_plies
+        self.total_plies_squared += other.total_plies_squared
+        self.length_histogram.update(other.length_histogram)
+        self.elapsed += other.elapsed
+
+    def win_rate(self, player: int) -> float:
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def mean_length(self) -> float:
+        return self.total_plies / self.games if self.games else 0.0
+
+    def length_stdev(self) -> float:
+        if self.games < 2:
+            return 0.0
+        mean = self.mean_length()
+        variance = (self.total_plies_squared - self.games * mean * mean) / (self.games - 1)
+        return sqrt(max(variance, 0.0))
+
+    def length_percentile(self, fraction: float) -> int:
+        """Game length below which the given fraction of games finished"""
+        threshold = fraction * self.games
+        seen = 0
+        for plies in sorted(self.length_histogram):
+            seen += self.length_histogram[plies]
+            if seen >= threshold:
+                return plies
+        return 0
+
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self, names: Sequence[str] = ("player 1", "player 2")) -> str:
+        if not self.games:
+            return "No games played"
+
+        lengths = sorted(self.length_histogram)
+        return f"""SIMULATION RESULTS
+        Games {self.games} in {self.elapsed:.2f}s ({self.games_per_second():.0f} games/s)
+        {names[0]} won {self.wins[0]} ({self.win_rate(0):.2%}), {names[1]} won {self.wins[1]} ({self.win_rate(1):.2%})
+        Draws {self.draws} ({self.exhausted} with an exhausted deck)
+        Game length mean {self.mean_length():.2f}, stdev {self.length_stdev():.2f}, min {lengths[0]}, median {self.length_percentile(0.5)}, p99 {self.length_percentile(0.99)}, max {lengths[-1]}"""
+
+class Simulator:
+    """Headless driver playing complete games between two agents as fast as possible
+
+    Unlike Game.process_game_step, whole games are played in a tight loop and the
+    outcome of each game is collected before the next one is dealt.
+    """
+    game: Game
+
+    def __init__(self, agents: Sequence[IAgent], seed: int | None = None) -> None:
+        self.game = Game(agents, seed)
+
+    def play_game(self) -> tuple[int, int, bool]:
+        """Plays the current game to the end and deals a new one
+
+        Returns:
+            tuple[int, int, bool]: the winner (or DRAW), number of moves made and whether the deck ran out
+        """
+        game = self.game
+        state = game.game_state
+        agents = game.agents
+        score_before = list(state.score)
+
+        plies = 0
+        exhausted = False
+        try:
+            while True:
+                plies += 1
+                turn_player = state.turn_player
+                if game.make_move(take_move(state, state.players[turn_player], agents[turn_player])):
+                    break
+        except DeckExhaustedError:
+            exhausted = True
+
+        gained = [state.score[0] - score_before[0], state.score[1] - score_before[1]]
+        if gained[0] > gained[1]:
+            winner = 0
+        elif gained[1] > gained[0]:
+            winner = 1
+        else:
+            winner = DRAW
+
+        game.new_game()
+        return winner, plies, exhausted
+
+    def run(self, num_games: int, stats: SimulationStats | None = None) -> SimulationStats:
+        """Plays num_games complete games
+
+        Args:
+            num_games (int): number of games to play
+            stats (SimulationStats | None): statistics to add the results to, new ones are created if None
+
+        Returns:
+            SimulationStats: the updated statistics
+        """
+        if stats is None:
+            stats = SimulationStats()
+
+        start = perf_counter()
+        for _ in range(num_games):
+            winner, plies, exhausted = self.play_game()
+            stats.record(winner, plies, exhausted)
+        stats.elapsed += perf_counter() - start
+
+        return stats
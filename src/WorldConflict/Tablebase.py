@@ -0,0 +1,445 @@
+from .Game import Game
+from .GameState import GameState, PlayerInfo
+from .CardDeck import DeckExhaustedError
+from .HandTables import COPIES, COUNTS, HAND_SLOTS, HANDS_BY_SIZE, SIZES, hand_cards, hand_index, unseen_index
+from .LegalMoves import LEGAL_MOVES, MONEY_BUCKETS
+from .MCTSAgent import MCTSAgent
+from .Hand import CARD_TYPES, Hand
+from .IAgent import IAgent
+from .Card import Card
+from .Move import Move
+from itertools import permutations
+import os
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("Tablebase needs numpy, an optional dependency installed with pip install numpy") from error
+
+# values of a position for the player to move
+UNKNOWN = 0         # not solved, out of the table or depending on positions out of it
+LOSS = 1
+DRAW = 2            # the draw pile runs out, see Simulator
+WIN = 3
+
+SCORES = (None, 0.0, 0.5, 1.0)
+_FLIPPED = (UNKNOWN, WIN, DRAW, LOSS)
+
+# a player reaching 10 coins has to play an affair, so nobody gets past 9 + 3 from a king
+MAX_TABLE_MONEY = 12
+
+_CARDS = tuple(Card(value) for value in range(CARD_TYPES))
+
+def _sequences() -> tuple[tuple[Move, ...], ...]:
+    """Sequences a move can be asked for after, the moves that neither resolve nor end a sequence"""
+    resolving = (Move.OK, Move.CALL_BLUFF)
+    starts = []
+    for bucket in range(MONEY_BUCKETS):
+        for move in LEGAL_MOVES[Move.OK.value][bucket]:
+            if move not in starts:
+                starts.append(move)
+    sequences = [()] + [(start,) for start in starts]
+    for start in starts:
+        sequences.extend((start, block) for block in LEGAL_MOVES[start.value][0] if block not in resolving)
+    return tuple(sequences)
+
+SEQUENCES = _sequences()
+SEQUENCE_POSITIONS = {sequence: position for position, sequence in enumerate(SEQUENCES)}
+
+def draw_offsets(max_draw: int) -> tuple[int, ...]:
+    """DRAW_OFFSETS[length] is the index of the first draw pile of that length, piles are numbers in base CARD_TYPES"""
+    offsets = [0]
+    for length in range(max_draw + 1):
+        offsets.append(offsets[-1] + CARD_TYPES ** length)
+    return tuple(offsets)
+
+class _Branch(Exception):
+    """Raised by a scripted agent asked for a discard the script does not cover yet"""
+    player: int
+    options: tuple[Card, ...]
+
+    def __init__(self, player: int, options: tuple[Card, ...]) -> None:
+        super().__init__()
+        self.player = player
+        self.options = options
+
+class _ScriptedAgent(IAgent):
+    """Gives the discards of a script, the choices are read from the real inventory of the game
+
+    Forced discards are answered right away, the others follow the script or branch.
+    """
+    game: Game
+    seat: int
+    script: list
+
+    def __init__(self, seat: int, script: list) -> None:
+        super().__init__()
+        self.seat = seat
+        self.script = script
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        cards = self.game.game_state.players[self.seat].cards
+        if card_preference != Card.ANY and card_preference in cards:
+            return card_preference
+
+        options = tuple(card for card in _CARDS if card in cards)
+        if len(options) <= 1:
+            return options[0] if options else Card.ANY
+
+        choices, position = self.script
+        if position < len(choices):
+            self.script[1] = position + 1
+            return choices[position]
+        raise _Branch(self.seat, options)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        raise RuntimeError("The tablebase makes the moves itself")
+
+class Tablebase:
+    """Solved endgame positions in a memory-mapped array, looked up in O(1)
+
+    The table covers every position in which both players hold at most max_cards cards,
+    at most max_draw cards are left to draw and both players have at most max_money coins,
+    with both hands and the order of the draw pile known (perfect information).
+    The position is the hands, the draw pile, the money, the sequence and who started it.
+    The discard pile and the score do not change the rest of the game and are left out.
+
+    Positions only lead to positions with a shorter draw pile, fewer cards in the hands, more money
+    or a longer sequence, so solving them in the reverse of that order (retrograde) sees every
+    successor before its predecessors. The moves are played by the Game engine with apply and undo,
+    every discard with a choice branches and goes to the player making it.
+    A successor out of the table leaves its predecessors UNKNOWN unless they are won anyway,
+    with max_money at MAX_TABLE_MONEY only unreachable positions (e.g. a king played with 12 coins) are.
+    """
+    values: np.ndarray
+    max_cards: int
+    max_draw: int
+    max_money: int
+    hands: tuple[int, ...]
+    _hand_positions: list[int]
+    _draw_offsets: tuple[int, ...]
+    _flat: np.ndarray
+    _strides: tuple[int, ...]
+    _state: GameState
+    _game: Game
+    _script: list
+
+    def __init__(self, path: str | None = None, max_cards: int = 1, max_draw: int = 2, max_money: int = MAX_TABLE_MONEY) -> None:
+        """
+        Args:
+            path (str | None): .npy file of the table, opened if it exists (with the scope it was made with), in memory if None
+            max_cards (int): largest hand in the table, 1 or 2
+            max_draw (int): largest draw pile in the table
+            max_money (int): most coins of a player in the table, positions with more can only be solved up to MAX_TABLE_MONEY
+        """
+        if path is not None and os.path.exists(path):
+            self.values = np.load(path, mmap_mode="r+")
+            max_cards = 1 if self.values.shape[0] == len(HANDS_BY_SIZE[1]) else 2
+            max_draw = 0
+            while draw_offsets(max_draw)[-1] < self.values.shape[2]:
+                max_draw += 1
+            max_money = self.values.shape[3] - 1
+        else:
+            if not 1 <= max_cards <= 2:
+                raise ValueError(f"Hands of 1 or 2 cards can be solved, not {max_cards}")
+
+            hands = sum(len(HANDS_BY_SIZE[size]) for size in range(1, max_cards + 1))
+            shape = (hands, hands, draw_offsets(max_draw)[-1], max_money + 1, max_money + 1, len(SEQUENCES), 2)
+            if path is None:
+                self.values = np.zeros(shape, dtype=np.uint8)
+            else:
+                self.values = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+
+        self.max_cards = max_cards
+        self.max_draw = max_draw
+        self.max_money = max_money
+        self.hands = tuple(index for size in range(1, max_cards + 1) for index in HANDS_BY_SIZE[size])
+        self._hand_positions = [-1] * HAND_SLOTS
+        for position, index in enumerate(self.hands):
+            self._hand_positions[index] = position
+        self._draw_offsets = draw_offsets(max_draw)
+        self._flat = self.values.reshape(-1)
+        self._strides = tuple(stride // self.values.itemsize for stride in self.values.strides)
+
+        self._state = GameState()
+        self._script = [(), 0]
+        agents = [_ScriptedAgent(seat, self._script) for seat in range(2)]
+        self._game = Game(agents)
+        self._game.game_state = self._state
+        for agent in agents:
+            agent.game = self._game
+
+    def flush(self) -> None:
+        if isinstance(self.values, np.memmap):
+            self.values.flush()
+
+    def index(self, state: GameState) -> int:
+        """Position of the state in the flattened table, -1 if it is not covered"""
+        first, second = state.players
+        hand0 = self._hand_positions[hand_index(first.cards)]
+        hand1 = self._hand_positions[hand_index(second.cards)]
+        pile = state.deck.drawPile
+        sequence = SEQUENCE_POSITIONS.get(tuple(state.current_sequence))
+        if hand0 < 0 or hand1 < 0 or len(pile) > self.max_draw or sequence is None \
+                or not 0 <= first.money <= self.max_money or not 0 <= second.money <= self.max_money:
+            return -1
+
+        draw = self._draw_offsets[len(pile)]
+        power = 1
+        for card in pile:
+            draw += card._value_ * power
+            power *= CARD_TYPES
+
+        strides = self._strides
+        return hand0 * strides[0] + hand1 * strides[1] + draw * strides[2] + first.money * strides[3] \
+            + second.money * strides[4] + sequence * strides[5] + state.initial_player * strides[6]
+
+    def value(self, state: GameState) -> int:
+        """UNKNOWN, LOSS, DRAW or WIN for the player to move"""
+        index = self.index(state)
+        return int(self._flat[index]) if index >= 0 else UNKNOWN
+
+    def move_value(self, state: GameState, move: Move) -> int:
+        """Value of a legal move for the player making it, the state is left as it was"""
+        game = self._game
+        if state is not self._state:
+            game.game_state = state
+        try:
+            return self._explore(state, move, ())
+        finally:
+            game.game_state = self._state
+
+    def best_move(self, state: GameState) -> tuple[Move, int]:
+        """Best legal move of the player to move in a fully known position and its value"""
+        player = state.players[state.turn_player]
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+        best = None
+        best_value = -1
+        for move in player.get_legal_moves(last_move):
+            value = self.move_value(state, move)
+            if SCORES[value] is not None and (best_value < 0 or SCORES[value] > SCORES[best_value]):
+                best, best_value = move, value
+                if value == WIN:
+                    break
+        if best is None:
+            return player.get_legal_moves(last_move)[0], UNKNOWN
+        return best, best_value
+
+    def solve(self) -> list[int]:
+        """Solves every position of the table, returns the number of positions of each value"""
+        counts = [0] * 4
+        state = self._state
+        flat = self._flat
+        piles = self._piles()
+        sequences = sorted(SEQUENCES, key=len, reverse=True)
+        for length in range(self.max_draw + 1):
+            for cards in range(2, 2 * self.max_cards + 1):
+                pairs = [(hand0, hand1) for hand0 in range(len(self.hands)) for hand1 in range(len(self.hands))
+                         if SIZES[self.hands[hand0]] + SIZES[self.hands[hand1]] == cards]
+                for money in range(2 * self.max_money, -1, -1):
+                    for money0 in range(max(0, money - self.max_money), min(money, self.max_money) + 1):
+                        for sequence in sequences:
+                            for initial in range(2):
+                                for hand0, hand1 in pairs:
+                                    for draw in range(self._draw_offsets[length], self._draw_offsets[length + 1]):
+                                        pile = piles[draw]
+                                        if pile is None or not self._fits(hand0, hand1, pile):
+                                            continue
+                                        self._load(hand0, hand1, pile, money0, money - money0, sequence, initial)
+                                        value = self._solve_position(state)
+                                        flat[self.index(state)] = value
+                                        counts[value] += 1
+        self.flush()
+        return counts
+
+    def _piles(self) -> list[list[Card] | None]:
+        """Draw pile of every draw index, None for piles with more copies of a card than the deck has"""
+        piles = []
+        for length in range(self.max_draw + 1):
+            for number in range(CARD_TYPES ** length):
+                pile = [_CARDS[number // CARD_TYPES ** position % CARD_TYPES] for position in range(length)]
+                piles.append(pile if all(pile.count(card) <= COPIES for card in _CARDS) else None)
+        return piles
+
+    def _fits(self, hand0: int, hand1: int, pile: list[Card]) -> bool:
+        """Whether the deck has enough copies of every card for both hands and the draw pile"""
+        first = COUNTS[self.hands[hand0]]
+        second = COUNTS[self.hands[hand1]]
+        return all(first[card._value_] + second[card._value_] + pile.count(card) <= COPIES for card in _CARDS)
+
+    def _load(self, hand0: int, hand1: int, pile: list[Card], money0: int, money1: int,
+              sequence: tuple[Move, ...], initial: int) -> None:
+        state = self._state
+        first, second = state.players
+        first.cards = Hand(hand_cards(self.hands[hand0]))
+        second.cards = Hand(hand_cards(self.hands[hand1]))
+        first.money = money0
+        second.money = money1
+        state.deck.drawPile = list(pile)
+        state.deck.discardPile = []
+        state.deck.rehash()
+        state.current_sequence = list(sequence)
+        state.initial_player = initial
+        state.turn_player = initial ^ (len(sequence) & 1)
+        state.score = [0, 0]
+
+    def _solve_position(self, state: GameState) -> int:
+        last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+        values = []
+        for move in state.players[state.turn_player].get_legal_moves(last_move):
+            value = self._explore(state, move, ())
+            if value == WIN:
+                return WIN
+            values.append(value)
+        return _best(values)
+
+    def _explore(self, state: GameState, move: Move, choices: tuple[Card, ...]) -> int:
+        """Value of the move for its player when the discards of the move start with choices"""
+        game = self._game
+        mover = state.turn_player
+        score = state.score[mover]
+        self._script[0] = choices
+        self._script[1] = 0
+        try:
+            ended = game.apply(move)
+        except _Branch as branch:
+            game.undo()
+            values = [self._explore(state, move, choices + (option,)) for option in branch.options]
+            return _best(values) if branch.player == mover else _worst(values)
+        except DeckExhaustedError:
+            game.undo()
+            return DRAW
+
+        try:
+            if ended:
+                return WIN if state.score[mover] > score else LOSS
+            value = self.value(state)
+            return value if state.turn_player == mover else _FLIPPED[value]
+        finally:
+            game.undo()
+
+    def deals(self, info: PlayerInfo) -> list[tuple[tuple[Card, ...], tuple[Card, ...]]] | None:
+        """Every way the cards hidden from the player can lie, None if some of them are not covered
+
+        Every order of the unseen cards is as likely, the first ones are the opponent's hand
+        and the rest is the draw pile, so a hand appears as often as it can be dealt.
+
+        Returns:
+            list[tuple[tuple[Card, ...], tuple[Card, ...]]]: opponent's hand and draw pile of every deal
+        """
+        unseen = hand_cards(unseen_index(info))
+        opponent_cards = info.players_card_num[info.playerId ^ 1]
+        if not 1 <= len(info.player.cards) <= self.max_cards or not 1 <= opponent_cards <= self.max_cards \
+                or len(unseen) - opponent_cards > self.max_draw or max(info.players_money) > self.max_money \
+                or tuple(info.current_sequence) not in SEQUENCE_POSITIONS:
+            return None
+        return [(deal[:opponent_cards], deal[opponent_cards:]) for deal in set(permutations(unseen))]
+
+    def score(self, info: PlayerInfo) -> float | None:
+        """Expected score of the player over the deals of the hidden cards, None if the position is not covered"""
+        deals = self.deals(info)
+        if deals is None:
+            return None
+
+        total = 0.0
+        for hand, pile in deals:
+            state = self._deal(info, hand, pile)
+            value = self.value(state)
+            if state.turn_player != info.playerId:
+                value = _FLIPPED[value]
+            if value == UNKNOWN:
+                return None
+            total += SCORES[value]
+        return total / len(deals)
+
+    def move_scores(self, info: PlayerInfo) -> dict[Move, float | None] | None:
+        """Expected score of every legal move of the player to move over the deals
+
+        Returns:
+            dict[Move, float | None] | None: None for the moves leading out of the table in some deal, None if the position is not covered
+        """
+        deals = self.deals(info)
+        if deals is None:
+            return None
+
+        last_move = info.current_sequence[-1] if info.current_sequence else Move.OK
+        scores: dict[Move, float | None] = dict.fromkeys(info.player.get_legal_moves(last_move), 0.0)
+        for hand, pile in deals:
+            state = self._deal(info, hand, pile)
+            for move, score in scores.items():
+                if score is not None:
+                    value = self._explore(state, move, ())
+                    scores[move] = None if value == UNKNOWN else score + SCORES[value]
+        for move, score in scores.items():
+            if score is not None:
+                scores[move] = score / len(deals)
+        return scores
+
+    def _deal(self, info: PlayerInfo, hand: tuple[Card, ...], pile: tuple[Card, ...]) -> GameState:
+        state = self._state
+        player = info.playerId
+        state.players[player].cards = info.player.cards.copy()
+        state.players[player ^ 1].cards = Hand(hand)
+        state.players[0].money, state.players[1].money = info.players_money
+        state.deck.drawPile = list(pile)
+        state.deck.discardPile = list(info.discarded)
+        state.deck.rehash()
+        state.current_sequence = list(info.current_sequence)
+        state.initial_player = info.initial_player
+        state.turn_player = info.initial_player ^ (len(info.current_sequence) & 1)
+        state.score = list(info.score)
+        return state
+
+def _best(values: list[int]) -> int:
+    if WIN in values:
+        return WIN
+    if UNKNOWN in values:
+        return UNKNOWN
+    return max(values)
+
+def _worst(values: list[int]) -> int:
+    if LOSS in values:
+        return LOSS
+    if UNKNOWN in values:
+        return UNKNOWN
+    return min(values)
+
+class TablebaseAgent(IAgent):
+    """Plays the moves of covered positions from a Tablebase and leaves the rest to another agent
+
+    A move is scored by its solved value averaged over every deal of the hidden cards, the best
+    scoring move is played once every move is scored or one of them wins every deal. This is perfect
+    play of the deals, not of the game with hidden cards, a move that wins some deals can lose others.
+    Discards are left to the other agent, the engine asks for them in the middle of a move,
+    when the position is not one of the table.
+    """
+    tablebase: Tablebase
+    agent: IAgent
+    covered: int
+    delegated: int
+
+    def __init__(self, tablebase: Tablebase | str, agent: IAgent | None = None) -> None:
+        """
+        Args:
+            tablebase (Tablebase | str): solved table or the .npy file it was saved to
+            agent (IAgent | None): agent playing the positions out of the table and every discard, an MCTSAgent if None
+        """
+        super().__init__()
+        self.tablebase = Tablebase(tablebase) if isinstance(tablebase, str) else tablebase
+        self.agent = agent if agent is not None else MCTSAgent()
+        self.covered = 0
+        self.delegated = 0
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        return self.agent.generate_give_card(state, card_preference)
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        scores = self.tablebase.move_scores(state)
+        if scores is not None:
+            known = [move for move, score in scores.items() if score is not None]
+            # a move winning every deal is best even if other moves leave the table
+            if known and (len(known) == len(scores) or max(scores[move] for move in known) == 1.0):
+                self.covered += 1
+                return max(known, key=scores.__getitem__)
+
+        self.delegated += 1
+        return self.agent.generate_move(state)
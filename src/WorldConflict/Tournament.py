@@ -0,0 +1,202 @@
+from .AgentRegistry import AgentFactory, create_agent
+from .Simulation import Simulator, DRAW
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from os import cpu_count
+from typing import Iterable
+import random
+
+def round_robin(names: list[str]) -> list[tuple[str, str]]:
+    """Every agent plays every other agent once"""
+    return list(combinations(names, 2))
+
+def gauntlet(challenger: str, names: list[str]) -> list[tuple[str, str]]:
+    """The challenger plays every other agent once"""
+    return [(challenger, name) for name in names if name != challenger]
+
+class MatchResult:
+    """Compact outcome of a batch of games between two agents, the only thing workers send back"""
+    first: str
+    second: str
+    first_wins: int
+    second_wins: int
+    draws: int
+    plies: int
+
+    def __init__(self, first: str, second: str) -> None:
+        self.first = first
+        self.second = second
+        self.first_wins = 0
+        self.second_wins = 0
+        self.draws = 0
+        self.plies = 0
+
+    @property
+    def games(self) -> int:
+        return self.first_wins + self.second_wins + self.draws
+
+class MatchTask:
+    first: str
+    first_factory: AgentFactory
+    second: str
+    second_factory: AgentFactory
+    games: int
+    swap_seats: bool
+    seed: int
+
+    def __init__(self, first: str, first_factory: AgentFactory, second: str, second_factory: AgentFactory,
+                 games: int, swap_seats: bool, seed: int) -> None:
+        self.first = first
+        self.first_factory = first_factory
+        self.second = second
+        self.second_factory = second_factory
+        self.games = games
+        self.swap_seats = swap_seats
+        self.seed = seed
+
+def play_match(task: MatchTask) -> MatchResult:
+    """Plays one chunk of a match, runs inside a worker process
+
+    Seats alternate from game to game, task.swap_seats puts task.first in the second seat for the first game,
+    so a chunk of any size is as fair as its games allow.
+
+    Args:
+        task (MatchTask): which agents to create and how many games to play
+
+    Returns:
+        MatchResult: the results from the point of view of task.first
+    """
+    # the chunk's own generator seeds the agents and the games, the random module is left alone
+    # since chunks also run in the caller's process
+    rng = random.Random(task.seed)
+    agents = [create_agent(task.first_factory, rng.getrandbits(64)), create_agent(task.second_factory, rng.getrandbits(64))]
+    # seatings[seat of task.first]
+    seatings = (agents, agents[::-1])
+
+    simulator = Simulator(agents, rng.getrandbits(64))
+    result = MatchResult(task.first, task.second)
+    for game in range(task.games):
+        first_seat = (game + task.swap_seats) % 2
+        simulator.game.agents = seatings[first_seat]
+        winner, plies, _ = simulator.play_game()
+        result.plies += plies
+        if winner == DRAW:
+            result.draws += 1
+        elif winner == first_seat:
+            result.first_wins += 1
+        else:
+            result.second_wins += 1
+
+    return result
+
+class Standing:
+    name: str
+    games: int
+    wins: int
+    losses: int
+    draws: int
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+
+    @property
+    def points(self) -> float:
+        return self.wins + 0.5 * self.draws
+
+    @property
+    def score_rate(self) -> float:
+        return self.points / self.games if self.games else 0.0
+
+class Tournament:
+    """Plays scheduled matches between agents on all cores and merges the results into standings"""
+    roster: dict[str, AgentFactory]
+    games_per_match: int
+    chunk_size: int
+    workers: int
+    seed: int
+    results: dict[tuple[str, str], MatchResult]
+
+    def __init__(self, roster: dict[str, AgentFactory], games_per_match: int, chunk_size: int = 500,
+                 workers: int | None = None, seed: int | None = None) -> None:
+        """
+        Args:
+            roster (dict[str, AgentFactory]): agent names and picklable factories creating them
+            games_per_match (int): games played by every scheduled pair
+            chunk_size (int): games per worker task, matches are split so every core stays busy
+            workers (int | None): number of worker processes, all cores if None, 1 runs in this process
+            seed (int | None): base seed from which every chunk gets its own seed
+        """
+        self.roster = roster
+        self.games_per_match = games_per_match
+        self.chunk_size = chunk_size
+        self.workers = workers or cpu_count() or 1
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.results = {}
+
+    def tasks(self, pairings: list[tuple[str, str]]) -> list[MatchTask]:
+        """Splits every match into chunks, seats alternate within chunks and the seat of the first game alternates between chunks"""
+        tasks = []
+        for first, second in pairings:
+            remaining = self.games_per_match
+            chunk = 0
+            while remaining > 0:
+                games = min(self.chunk_size, remaining)
+                remaining -= games
+                tasks.append(MatchTask(first, self.roster[first], second, self.roster[second],
+                                       games, chunk % 2 == 1, self.seed + len(tasks)))
+                chunk += 1
+        return tasks
+
+    def run(self, pairings: list[tuple[str, str]]) -> list[Standing]:
+        """Plays all matches of the schedule
+
+        Args:
+            pairings (list[tuple[str, str]]): schedule, e.g. from round_robin or gauntlet
+
+        Returns:
+            list[Standing]: standings of all agents, best first
+        """
+        tasks = self.tasks(pairings)
+        if self.workers == 1:
+            self._merge(map(play_match, tasks))
+        else:
+            with ProcessPoolExecutor(self.workers) as executor:
+                self._merge(executor.map(play_match, tasks))
+
+        return self.standings()
+
+    def _merge(self, chunks: Iterable[MatchResult]) -> None:
+        for chunk in chunks:
+            key = (chunk.first, chunk.second)
+            if key not in self.results:
+                self.results[key] = MatchResult(chunk.first, chunk.second)
+
+            result = self.results[key]
+            result.first_wins += chunk.first_wins
+            result.second_wins += chunk.second_wins
+            result.draws += chunk.draws
+            result.plies += chunk.plies
+
+    def standings(self) -> list[Standing]:
+        standings = {name: Standing(name) for name in self.roster}
+        for result in self.results.values():
+            for name, wins, losses in [(result.first, result.first_wins, result.second_wins),
+                                       (result.second, result.second_wins, result.first_wins)]:
+                standing = standings[name]
+                standing.games += result.games
+                standing.wins += wins
+                standing.losses += losses
+                standing.draws += result.draws
+
+        return sorted(standings.values(), key=lambda standing: standing.score_rate, reverse=True)
+
+    def report(self) -> str:
+        lines = ["STANDINGS", f"{'#':>3} {'agent':<24} {'games':>8} {'wins':>8} {'losses':>8} {'draws':>8} {'score':>7}"]
+        for place, standing in enumerate(self.standings(), 1):
+            lines.append(f"{place:>3} {standing.name:<24} {standing.games:>8} {standing.wins:>8} {standing.losses:>8} "
+                         f"{standing.draws:>8} {standing.score_rate:>7.1%}")
+        return "\n".join(lines)
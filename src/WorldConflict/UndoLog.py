@@ -0,0 +1,63 @@
+from typing import Any
+
+# kinds of journal entries, the rest of an entry is what its undo needs
+UNDO_MONEY = 0          # (UNDO_MONEY, inventory, received amount)
+UNDO_GIVE_CARD = 1      # (UNDO_GIVE_CARD, inventory, card)
+UNDO_TAKE_CARD = 2      # (UNDO_TAKE_CARD, inventory, card)
+UNDO_DRAW = 3           # (UNDO_DRAW, deck, card)
+UNDO_DISCARD = 4        # (UNDO_DISCARD, deck)
+UNDO_TURN = 5           # (UNDO_TURN, state, sequence list, sequence length, initial player, turn player, score 0, score 1)
+
+class UndoLog:
+    """Journal of the changes done to a game state, rolled back one frame at a time
+
+    Inventories and decks with a journal attached append an entry for every change they go through.
+    Entries only hold the changed values, so undoing a move costs as much as the move did.
+    """
+    entries: list[tuple[Any, ...]]
+    frames: list[int]
+
+    def __init__(self) -> None:
+        self.entries = []
+        self.frames = []
+
+    def __len__(self) -> int:
+        """Number of frames that can be undone"""
+        return len(self.frames)
+
+    def begin(self) -> None:
+        """Starts a frame, everything recorded until the next begin is undone together"""
+        self.frames.append(len(self.entries))
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.frames.clear()
+
+    def undo(self) -> None:
+        """Reverts all changes of the last frame, newest first"""
+        if not self.frames:
+            raise RuntimeError("Nothing to undo")
+
+        start = self.frames.pop()
+        entries = self.entries
+        while len(entries) > start:
+            entry = entries.pop()
+            kind = entry[0]
+            if kind == UNDO_MONEY:
+                entry[1].money -= entry[2]
+            elif kind == UNDO_GIVE_CARD:
+                entry[1].cards.remove(entry[2])
+            elif kind == UNDO_TAKE_CARD:
+                entry[1].cards.append(entry[2])
+            elif kind == UNDO_DRAW:
+                entry[1].undraw(entry[2])
+            elif kind == UNDO_DISCARD:
+                entry[1].undiscard()
+            else:
+                _, state, sequence, length, initial_player, turn_player, score0, score1 = entry
+                del sequence[length:]
+                state.current_sequence = sequence
+                state.initial_player = initial_player
+                state.turn_player = turn_player
+                state.score[0] = score0
+                state.score[1] = score1
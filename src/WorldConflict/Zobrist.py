@@ -0,0 +1,94 @@
+from array import array
+from typing import Any
+import random
+
+# keys are drawn once from a fixed seed, so hashes are the same in every process and run
+_KEY_RNG = random.Random(0x5A0B)
+
+def _keys(count: int) -> tuple[int, ...]:
+    return tuple(_KEY_RNG.getrandbits(64) for _ in range(count))
+
+_RANKS = 6                  # card values, Card.ANY included
+_MAX_COUNT = 16             # more than any pile or hand can hold of one rank
+_MAX_PILE = 16
+MONEY_SLOTS = 64            # money is hashed modulo MONEY_SLOTS
+_SEQUENCE_SLOTS = 4
+_MOVE_SLOTS = 15
+
+# COUNT_KEYS[rank][count] is toggled when a hand reaches or leaves count cards of the rank
+COUNT_KEYS = tuple(_keys(_MAX_COUNT) for _ in range(_RANKS))
+# the discard pile can grow without bound, it hashes to the sum of DISCARD_KEYS[card value] modulo 2 ** 64
+DISCARD_KEYS = _keys(_RANKS)
+# DRAW_KEYS[position][card value] for the card at that position of the draw pile
+DRAW_KEYS = tuple(_keys(_RANKS) for _ in range(_MAX_PILE))
+MONEY_KEYS = tuple(_keys(MONEY_SLOTS) for _ in range(2))
+SEQUENCE_KEYS = tuple(_keys(_MOVE_SLOTS) for _ in range(_SEQUENCE_SLOTS))
+TURN_KEYS = _keys(2)
+INITIAL_KEYS = _keys(2)
+# drawn last so the keys above stay the same, HAND_SIZE_KEYS[size] stands for a hand whose cards are hidden
+HAND_SIZE_KEYS = _keys(_MAX_PILE)
+# MOVER_KEYS[player] for the player whose move led to a search node, whose rewards the node holds
+MOVER_KEYS = _keys(2)
+
+MASK = (1 << 64) - 1
+
+def rotate(value: int, bits: int) -> int:
+    """Rotates a 64 bit value left, so that the hands of the two seats hash differently"""
+    return ((value << bits) | (value >> (64 - bits))) & MASK
+
+class TranspositionTable:
+    """Fixed size table of search results keyed by 64 bit hashes, replacing by depth
+
+    A slot is picked by the low bits of the hash and keeps the full hash to tell collisions apart.
+    A new entry replaces the one in its slot if it is for the same position or searched at least as deep,
+    so the table never grows and the most valuable results survive.
+    """
+    mask: int
+    keys: array
+    depths: array
+    values: list[Any]
+    probes: int
+    hits: int
+
+    def __init__(self, size_bits: int = 16) -> None:
+        """
+        Args:
+            size_bits (int): the table has 2 ** size_bits slots
+        """
+        size = 1 << size_bits
+        self.mask = size - 1
+        self.keys = array("Q", bytes(8 * size))
+        self.depths = array("b", [-1]) * size
+        self.values = [None] * size
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def probe(self, key: int, depth: int = 0) -> Any:
+        """Value stored for the position, None if it is missing or was searched less deep than depth"""
+        self.probes += 1
+        slot = key & self.mask
+        if self.keys[slot] != key or self.depths[slot] < depth:
+            return None
+        self.hits += 1
+        return self.values[slot]
+
+    def store(self, key: int, depth: int, value: Any) -> bool:
+        """Stores a value searched to the given depth (0 to 127), returns whether it was kept"""
+        slot = key & self.mask
+        if self.keys[slot] != key and self.depths[slot] > depth:
+            return False
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        return True
+
+    def clear(self) -> None:
+        size = len(self.values)
+        self.keys = array("Q", bytes(8 * size))
+        self.depths = array("b", [-1]) * size
+        self.values = [None] * size
+        self.probes = 0
+        self.hits = 0
@@ -0,0 +1,38 @@
+from .Benchmark import BENCHMARKS, run_benchmarks, compare, report
+from argparse import ArgumentParser
+import json
+import sys
+
+def main(argv: list[str] | None = None) -> int:
+    parser = ArgumentParser(description="Measures the speed of the game engine")
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run out of {', '.join(BENCHMARKS)}, all by default")
+    parser.add_argument("-o", "--output", help="file to save the results to as JSON")
+    parser.add_argument("-c", "--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown reported as a regression")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions of each benchmark, the fastest is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the operations per repetition")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks {', '.join(unknown)}")
+
+    results = run_benchmarks(args.benchmarks or None, args.repeat, args.scale)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            comparison = compare(results, json.load(baseline_file), args.threshold)
+
+    print(report(results, comparison))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+    if comparison and any(regressed for _, _, regressed in comparison):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+from .Tablebase import Tablebase, MAX_TABLE_MONEY, UNKNOWN, LOSS, DRAW, WIN
+from argparse import ArgumentParser
+from time import perf_counter
+import os
+
+def main(argv: list[str] | None = None) -> Tablebase:
+    parser = ArgumentParser(description="Solves the endgame positions with small hands and draw piles into a memory-mapped table, TablebaseAgent plays from it")
+    parser.add_argument("output", help=".npy file of the table, overwritten if it exists")
+    parser.add_argument("--max-cards", type=int, default=1, choices=(1, 2), help="largest hand of the solved positions")
+    parser.add_argument("--max-draw", type=int, default=2, help="largest draw pile of the solved positions")
+    parser.add_argument("--max-money", type=int, default=MAX_TABLE_MONEY, help="most coins of a player in the solved positions")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    start = perf_counter()
+    tablebase = Tablebase(args.output, args.max_cards, args.max_draw, args.max_money)
+    counts = tablebase.solve()
+    elapsed = perf_counter() - start
+
+    solved = counts[LOSS] + counts[DRAW] + counts[WIN]
+    print(f"{solved + counts[UNKNOWN]} positions in {elapsed:.1f}s, {tablebase.values.nbytes} bytes")
+    print(f"wins {counts[WIN]}, draws {counts[DRAW]}, losses {counts[LOSS]} for the player to move, {counts[UNKNOWN]} unknown")
+    return tablebase
+
+if __name__ == "__main__":
+    main()
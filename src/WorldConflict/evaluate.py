@@ -0,0 +1,28 @@
+from .AgentRegistry import resolve_agent
+from .Evaluation import Evaluation, SPRT
+from argparse import ArgumentParser
+
+def main(argv: list[str] | None = None) -> Evaluation:
+    parser = ArgumentParser(description="Plays two agents against each other until a sequential test decides whether the first is stronger")
+    parser.add_argument("first", help="tested agent, a registered name, name=argument (e.g. cfr=DIRECTORY) or module:ClassName")
+    parser.add_argument("second", help="reference agent, a registered name, name=argument or module:ClassName")
+    parser.add_argument("--elo0", type=float, default=0.0, help="Elo difference of the null hypothesis")
+    parser.add_argument("--elo1", type=float, default=20.0, help="Elo difference of the alternative hypothesis")
+    parser.add_argument("--alpha", type=float, default=0.05, help="false positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="false negative rate")
+    parser.add_argument("-n", "--max-games", type=int, default=100000, help="games after which the test stops undecided")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, all cores by default")
+    parser.add_argument("--chunk-size", type=int, default=20, help="games per worker task")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    second = args.second if args.second != args.first else f"{args.second}#2"
+    evaluation = Evaluation(args.first, resolve_agent(args.first), second, resolve_agent(args.second),
+                            SPRT(args.elo0, args.elo1, args.alpha, args.beta), args.max_games, args.chunk_size,
+                            args.workers, args.seed)
+    evaluation.run()
+    print(evaluation.report())
+    return evaluation
+
+if __name__ == "__main__":
+    main()
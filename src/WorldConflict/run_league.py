@@ -0,0 +1,41 @@
+from .AgentRegistry import resolve_agent
+from .League import League
+from argparse import ArgumentParser
+from os import cpu_count
+import os
+
+def main(argv: list[str] | None = None) -> League:
+    parser = ArgumentParser(description="Rates a population of agents, playing the matches that tell the most about their ratings")
+    parser.add_argument("agents", nargs="+", help="registered agent names, name=argument (e.g. cfr=DIRECTORY) or module:ClassName, repeated names get numbered")
+    parser.add_argument("-r", "--rounds", type=int, default=10)
+    parser.add_argument("-m", "--matches", type=int, default=None, help="matches per round, one per worker by default")
+    parser.add_argument("-n", "--games", type=int, default=100, help="games per match")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, all cores by default")
+    parser.add_argument("--state", default=None, help="JSON file the league is resumed from and saved to after every round")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    roster = {}
+    for spec in args.agents:
+        name = spec
+        suffix = 2
+        while name in roster:
+            name = f"{spec}#{suffix}"
+            suffix += 1
+        roster[name] = resolve_agent(spec)
+
+    league = League(roster, args.games, args.workers, args.seed)
+    if args.state and os.path.exists(args.state):
+        league.load(args.state)
+
+    matches = args.matches or args.workers or cpu_count() or 1
+    for _ in range(args.rounds):
+        league.run_round(matches)
+        if args.state:
+            league.save(args.state)
+
+    print(league.report())
+    return league
+
+if __name__ == "__main__":
+    main()
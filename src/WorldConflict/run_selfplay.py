@@ -0,0 +1,27 @@
+from .AgentRegistry import resolve_agent
+from .SelfPlay import SelfPlay, SelfPlayStats
+from argparse import ArgumentParser
+
+def main(argv: list[str] | None = None) -> SelfPlayStats:
+    parser = ArgumentParser(description="Writes the decisions of self-play games as training data shards")
+    parser.add_argument("agents", nargs="*", default=["random"], help="agent of each seat, one agent plays both seats")
+    parser.add_argument("-n", "--games", type=int, default=10000)
+    parser.add_argument("-o", "--output", default="selfplay", help="directory the shards are written to")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, all cores by default")
+    parser.add_argument("--shard-size", type=int, default=1 << 16, help="decisions per shard")
+    parser.add_argument("--queue-size", type=int, default=16, help="batches waiting to be written before workers block")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if len(args.agents) > 2:
+        parser.error("at most two agents can be given")
+    factories = [resolve_agent(spec) for spec in args.agents]
+    if len(factories) == 1:
+        factories *= 2
+
+    stats = SelfPlay(factories, args.output, args.shard_size, args.workers, args.queue_size, seed=args.seed).run(args.games)
+    print(stats.report())
+    return stats
+
+if __name__ == "__main__":
+    main()
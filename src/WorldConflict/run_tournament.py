@@ -0,0 +1,33 @@
+from .AgentRegistry import resolve_agent
+from .Tournament import Tournament, round_robin, gauntlet
+from argparse import ArgumentParser
+
+def main(argv: list[str] | None = None) -> Tournament:
+    parser = ArgumentParser(description="Plays a round robin or gauntlet between agents on all cores")
+    parser.add_argument("agents", nargs="+", help="registered agent names, name=argument (e.g. cfr=DIRECTORY) or module:ClassName, repeated names get numbered")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="games per match")
+    parser.add_argument("--gauntlet", action="store_true", help="only the first agent plays against all the others")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, all cores by default")
+    parser.add_argument("--chunk-size", type=int, default=500, help="games per worker task")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    roster = {}
+    for spec in args.agents:
+        name = spec
+        suffix = 2
+        while name in roster:
+            name = f"{spec}#{suffix}"
+            suffix += 1
+        roster[name] = resolve_agent(spec)
+
+    names = list(roster)
+    pairings = gauntlet(names[0], names) if args.gauntlet else round_robin(names)
+
+    tournament = Tournament(roster, args.games, args.chunk_size, args.workers, args.seed)
+    tournament.run(pairings)
+    print(tournament.report())
+    return tournament
+
+if __name__ == "__main__":
+    main()
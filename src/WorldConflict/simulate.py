@@ -0,0 +1,59 @@
+from .AgentRegistry import resolve_agent
+from .Simulation import Simulator, SimulationStats
+from .Profiler import Profiler
+from .ReplayLog import ReplayWriter, GameRecorder
+from argparse import ArgumentParser
+import random
+
+def main(argv: list[str] | None = None) -> SimulationStats:
+    parser = ArgumentParser(description="Plays games between two agents without any interactive output")
+    parser.add_argument("agent1", nargs="?", default="random", help="registered agent name, name=argument or module:ClassName")
+    parser.add_argument("agent2", nargs="?", default="random", help="registered agent name, name=argument or module:ClassName")
+    parser.add_argument("-n", "--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("--report-every", type=int, default=0, help="print intermediate results every N games")
+    parser.add_argument("--seed", type=int, default=None, help="seed making the whole run reproducible")
+    parser.add_argument("--profile", action="store_true", help="time the game phases and agent decisions, printed with every report")
+    parser.add_argument("--profile-out", default=None, help="write the profile histograms as JSON to this path, implies --profile")
+    parser.add_argument("--record", default=None, help="directory to write the binary replays of all games to")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    names = [args.agent1, args.agent2]
+    simulator = Simulator([resolve_agent(args.agent1)(), resolve_agent(args.agent2)()])
+    writer = None
+    if args.record:
+        writer = ReplayWriter(args.record)
+        simulator.game.enable_recording(GameRecorder(writer))
+    profiler = None
+    if args.profile or args.profile_out:
+        profiler = Profiler()
+        simulator.game.enable_profiling(profiler)
+
+    stats = SimulationStats()
+    chunk = args.report_every if args.report_every > 0 else args.games
+    remaining = args.games
+    while remaining > 0:
+        simulator.run(min(chunk, remaining), stats)
+        remaining -= chunk
+        if remaining > 0:
+            print(stats.report(names))
+            if profiler is not None:
+                print(profiler.report())
+
+    if profiler is not None:
+        simulator.game.disable_profiling()
+    if writer is not None:
+        simulator.game.disable_recording()
+        writer.close()
+
+    print(stats.report(names))
+    if profiler is not None:
+        print(profiler.report())
+        if args.profile_out:
+            profiler.dump(args.profile_out)
+    return stats
+
+if __name__ == "__main__":
+    main()
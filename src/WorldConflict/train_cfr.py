@@ -0,0 +1,32 @@
+from .CFR import CFRTables, CFRTrainer
+from argparse import ArgumentParser
+from time import perf_counter
+
+def main(argv: list[str] | None = None) -> CFRTrainer:
+    parser = ArgumentParser(description="Trains CFR tables by outcome sampling, CFRAgent can play them afterwards")
+    parser.add_argument("-i", "--iterations", type=int, default=100000, help="number of iterations, each updates both players once")
+    parser.add_argument("-d", "--directory", default=None, help="directory of the memory-mapped tables, continued if they exist")
+    parser.add_argument("--capacity", type=int, default=1 << 22, help="rows of new tables, at most half of them can be used")
+    parser.add_argument("--exploration", type=float, default=0.6, help="probability of exploring a random move")
+    parser.add_argument("--no-plus", action="store_true", help="keep negative regrets instead of flooring them at zero")
+    parser.add_argument("--report-every", type=int, default=10000, help="print progress every N iterations")
+    parser.add_argument("--seed", type=int, default=None, help="seed making the training reproducible")
+    args = parser.parse_args(argv)
+
+    tables = CFRTables(args.capacity, args.directory)
+    trainer = CFRTrainer(tables, args.exploration, not args.no_plus, args.seed)
+
+    start = perf_counter()
+    remaining = args.iterations
+    while remaining > 0:
+        chunk = min(args.report_every, remaining) if args.report_every > 0 else remaining
+        trainer.run(chunk)
+        remaining -= chunk
+        elapsed = perf_counter() - start
+        print(f"{trainer.iterations} iterations, {tables.size} information sets ({tables.size / tables.capacity:.1%} of capacity), "
+              f"{trainer.iterations / elapsed:.0f} iterations/s")
+
+    return trainer
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+from WorldConflict.Game import Game, take_move
+from WorldConflict.IAgent import IAgent
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.GameState import PlayerInfo
+from WorldConflict.Inventory import Inventory
+from WorldConflict.CardDeck import DeckExhaustedError
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+from WorldConflict.LegalMoves import move_mask
+
+from collections import Counter
+import pytest
+
+np = pytest.importorskip("numpy")
+from WorldConflict.BatchGame import BatchGame, DEFAULT_DISCARD_ORDER
+
+class ScriptedAgent(IAgent):
+    """Plays the next scripted move and discards like BatchGame does, looking at the live inventory"""
+    next_move: Move
+    inventory: Inventory
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        if card_preference in self.inventory.cards:
+            return card_preference
+        for value in DEFAULT_DISCARD_ORDER:
+            if Card(int(value)) in self.inventory.cards:
+                return Card(int(value))
+        return Card.ANY
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        return self.next_move
+
+def assert_same(batch: BatchGame, index: int, game: Game) -> None:
+    expected = game.game_state
+    actual = batch.to_game_state(index)
+
+    for player in range(2):
+        assert Counter(actual.players[player].cards) == Counter(expected.players[player].cards)
+        assert actual.players[player].money == expected.players[player].money
+    assert actual.initial_player == expected.initial_player
+    assert actual.turn_player == expected.turn_player
+    assert actual.current_sequence == expected.current_sequence
+    assert actual.deck.drawPile == expected.deck.drawPile
+    assert Counter(actual.deck.discardPile) == Counter(expected.deck.discardPile)
+    assert actual.score == expected.score
+
+def test_deal():
+    batch = BatchGame(100, seed=1)
+
+    assert (batch.hands.sum(axis=2) == 2).all()
+    assert (batch.draw_length == 11).all()
+    assert (batch.money == 2).all()
+    for index in range(100):
+        state = batch.to_game_state(index)
+        cards = state.deck.drawPile + state.players[0].cards + state.players[1].cards
+        assert Counter(cards) == Counter([Card.ACE, Card.KING, Card.QUEEN, Card.JACK, Card.TWO] * 3)
+
+def test_exported_state_plays_on():
+    batch = BatchGame(2, seed=1)
+    state = batch.to_game_state(1)
+    state.reset()
+    assert state.deck.rng is state.rng
+
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=3)
+    game.game_state = batch.to_game_state(0)
+    game.new_game(5)
+    assert all(len(player.cards) == 2 for player in game.game_state.players)
+    assert len(game.game_state.deck.drawPile) == 11
+
+def test_legal_move_mask():
+    batch = BatchGame(3, seed=2)
+    batch.money[:, :] = [[2, 2], [5, 5], [12, 12]]
+
+    mask = batch.legal_move_mask()
+
+    for index, money in enumerate([2, 5, 12]):
+        inventory = Inventory()
+        inventory.money = money
+        assert move_mask(tuple(Move(int(value)) for value in np.flatnonzero(mask[index]))) == inventory.get_legal_move_mask(Move.OK)
+
+def test_illegal_move_forfeits():
+    batch = BatchGame(2, seed=3)
+    batch.turn_player[:] = batch.initial_player
+
+    rewards, done = batch.step(np.array([Move.BLOCK_JACK_WITH_QUEEN.value, Move.FORFEIT.value]))
+
+    assert done.all()
+    assert (rewards.sum(axis=1) == 0).all()
+    for index in range(2):
+        loser = 0 if rewards[index, 0] < 0 else 1
+        assert batch.score[index, loser] == 0 and batch.score[index, 1 - loser] == 1
+
+def test_matches_game():
+    games = 64
+    batch = BatchGame(games, seed=4)
+    rng = np.random.default_rng(5)
+
+    agents = [[ScriptedAgent(), ScriptedAgent()] for _ in range(games)]
+    engines = [Game(agents[index]) for index in range(games)]
+
+    def sync(index: int) -> None:
+        engines[index].game_state = batch.to_game_state(index)
+        for player in range(2):
+            agents[index][player].inventory = engines[index].game_state.players[player]
+
+    for index in range(games):
+        sync(index)
+
+    ended = 0
+    for _ in range(400):
+        mask = batch.legal_move_mask()
+        # mostly legal moves, sometimes an illegal one to check forfeits
+        scores = rng.random(mask.shape) + mask
+        moves = np.argmax(scores, axis=1)
+        moves[rng.random(games) < 0.01] = Move.FORFEIT.value
+        moves = np.where(np.isin(moves, [move.value for move in Move]), moves, Move.FORFEIT.value)
+
+        scores_before = [list(engine.game_state.score) for engine in engines]
+        expected_done = []
+        for index in range(games):
+            state = engines[index].game_state
+            agent = agents[index][state.turn_player]
+            agent.next_move = Move(int(moves[index]))
+            try:
+                expected_done.append(engines[index].make_move(take_move(state, state.players[state.turn_player], agent)))
+            except DeckExhaustedError:
+                expected_done.append(None)
+
+        rewards, done = batch.step(moves)
+
+        for index in range(games):
+            if expected_done[index] is None:
+                assert done[index] and batch.exhausted[index]
+                assert rewards[index].tolist() == [0, 0]
+            else:
+                assert done[index] == expected_done[index]
+
+            if done[index]:
+                ended += 1
+                if expected_done[index] is not None:
+                    expected_score = engines[index].game_state.score
+                    assert batch.score[index].tolist() == expected_score
+                    gained = [expected_score[player] - scores_before[index][player] for player in range(2)]
+                    assert rewards[index].tolist() == [gained[0] - gained[1], gained[1] - gained[0]]
+                sync(index)
+            else:
+                assert_same(batch, index, engines[index])
+
+    assert ended > games
@@ -0,0 +1,95 @@
+from WorldConflict.Belief import BeliefTracker, CLAIMED_CARD
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.Simulation import Simulator
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.IAgent import IAgent
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+from math import comb
+import random
+
+def make_state(own, opponent, discarded=(), sequence=()):
+    state = GameState(random.Random(1))
+    state.players[0].cards = own
+    state.players[1].cards = opponent
+    state.deck.discardPile = list(discarded)
+    state.current_sequence = list(sequence)
+    state.initial_player = 1
+    return state
+
+class TrackedAgent(IAgent):
+    """Random player 0 reporting the discards the game accepted, checks the tracker against the real hand"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.agent = RandomAgent(1)
+        self.tracker = BeliefTracker(0)
+        self.game = None
+        self.decisions = 0
+
+    def generate_give_card(self, state, card_preference):
+        card = self.agent.generate_give_card(state, card_preference)
+        cards = self.game.game_state.players[0].cards
+        if card in cards and (card_preference == Card.ANY or card == card_preference or card_preference not in cards):
+            self.tracker.gave(card)
+        return card
+
+    def generate_move(self, state):
+        tracker = self.tracker
+        tracker.observe(state)
+        real = self.game.game_state.players[1].cards
+        assert tracker.probability(real) > 0
+        assert abs(sum(tracker.weights.values()) - 1) < 1e-9
+        for card in (Card.ACE, Card.KING, Card.QUEEN, Card.JACK, Card.TWO):
+            assert 0 <= tracker.holds(card) <= tracker.expected(card) + 1e-9
+        self.decisions += 1
+        return self.agent.generate_move(state)
+
+def test_prior_is_hypergeometric():
+    tracker = BeliefTracker(0)
+    tracker.reset(PlayerInfo(make_state([Card.QUEEN, Card.ACE], [Card.KING, Card.TWO], [Card.QUEEN]), 0))
+
+    # 12 unseen cards, one queen among them
+    assert abs(tracker.holds(Card.QUEEN) - (1 - comb(11, 2) / comb(12, 2))) < 1e-12
+    assert abs(tracker.holds(Card.KING) - (1 - comb(9, 2) / comb(12, 2))) < 1e-12
+    assert abs(tracker.expected(Card.JACK) - 2 * 3 / 12) < 1e-12
+    assert tracker.probability([Card.QUEEN, Card.QUEEN]) == 0
+
+def test_claim_and_reveal():
+    tracker = BeliefTracker(0, bluff_rate=0.5)
+    tracker.reset(PlayerInfo(make_state([Card.QUEEN, Card.ACE], [Card.KING, Card.TWO]), 0))
+    prior = tracker.holds(Card.KING)
+
+    tracker.claim(Card.KING)
+    tracker._normalize()
+    assert tracker.holds(Card.KING) > prior
+
+    tracker.reveal(Card.KING, False)
+    tracker._normalize()
+    assert tracker.holds(Card.KING) == 0
+
+def test_resolved_claim_reveals_card():
+    state = make_state([Card.QUEEN, Card.ACE], [Card.KING, Card.TWO], sequence=[Move.PLAY_KING])
+    tracker = BeliefTracker(0)
+    tracker.reset(PlayerInfo(state, 0))
+    assert CLAIMED_CARD[Move.PLAY_KING] == Card.KING
+
+    # the king is given away and replaced, then the opponent starts a new sequence
+    state.players[1].cards = [Card.TWO, Card.JACK]
+    state.deck.discardPile = [Card.KING]
+    state.current_sequence = [Move.PLAY_PLUS_ONE]
+    tracker.observe(PlayerInfo(state, 0))
+
+    assert abs(sum(tracker.weights.values()) - 1) < 1e-12
+    assert tracker.probability([Card.TWO, Card.JACK]) > 0
+    assert tracker.expected(Card.KING) <= 2 * 2 / 11 + 1e-12
+
+def test_tracks_random_games():
+    agent = TrackedAgent()
+    simulator = Simulator([agent, RandomAgent(2)], 3)
+    agent.game = simulator.game
+
+    for _ in range(300):
+        simulator.play_game()
+
+    assert agent.decisions > 1000
@@ -0,0 +1,43 @@
+from WorldConflict.Benchmark import BENCHMARKS, run_benchmarks, compare, report
+from WorldConflict.bench import main
+
+import json
+import pytest
+
+def test_run_all():
+    results = run_benchmarks(repeat=1, scale=0.005)
+
+    assert set(results["results"]) == set(BENCHMARKS)
+    for result in results["results"].values():
+        assert result["ops_per_sec"] > 0
+        assert result["ns_per_op"] > 0
+
+def test_compare():
+    baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}, "c": {"ops_per_sec": 100.0}}}
+    current = {"results": {"a": {"ops_per_sec": 95.0}, "b": {"ops_per_sec": 80.0}, "d": {"ops_per_sec": 1.0}}}
+
+    comparison = compare(current, baseline, threshold=0.1)
+
+    assert comparison == [("a", 0.95, False), ("b", 0.8, True)]
+
+def test_report():
+    current = {"results": {"a": {"ops_per_sec": 80.0, "ns_per_op": 1.25e7}}}
+
+    text = report(current, [("a", 0.8, True)])
+
+    assert "REGRESSION" in text
+    assert "0.80x" in text
+
+def test_cli(tmp_path, capsys):
+    output = tmp_path / "baseline.json"
+    assert main(["deck_discard", "--repeat", "1", "--scale", "0.01", "-o", str(output)]) == 0
+
+    baseline = json.loads(output.read_text())
+    baseline["results"]["deck_discard"]["ops_per_sec"] *= 1000
+    output.write_text(json.dumps(baseline))
+
+    assert main(["deck_discard", "--repeat", "1", "--scale", "0.01", "-c", str(output)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        main(["nonexistent"])
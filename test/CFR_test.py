@@ -0,0 +1,107 @@
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.Simulation import Simulator
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from WorldConflict.CFR import CFRTables, CFRTrainer, CFRAgent, info_set_key, regret_matching
+from WorldConflict.train_cfr import main
+from WorldConflict.AgentRegistry import resolve_agent, create_agent
+from WorldConflict import run_tournament, evaluate
+
+def make_info(player: int) -> PlayerInfo:
+    game_state = GameState()
+    game_state.players[0].cards = [Card.KING, Card.TWO]
+    game_state.players[1].cards = [Card.ACE]
+    game_state.players[1].money = 4
+    game_state.deck.discardPile = [Card.JACK, Card.TWO]
+    game_state.current_sequence = [Move.PLAY_TWO]
+    game_state.initial_player = 0
+    return PlayerInfo(game_state, player)
+
+def test_info_set_key():
+    info = make_info(0)
+    same = make_info(0)
+    same.discarded = (Card.TWO, Card.JACK)
+    same.score = (3, 1)
+
+    assert info_set_key(info) == info_set_key(same)
+    assert info_set_key(info) != info_set_key(make_info(1))
+    assert info_set_key(info) < 1 << 48
+
+    info.current_sequence = (Move.PLAY_TWO, Move.BLOCK_TWO_WITH_TWO)
+    assert info_set_key(info) != info_set_key(same)
+
+def test_tables():
+    tables = CFRTables(capacity=8)
+
+    rows = [tables.row(key) for key in (0, 5, 1 << 40)]
+
+    assert len(set(rows)) == 3
+    assert tables.size == 3
+    assert tables.row(5) == rows[1]
+    assert tables.find(1 << 40) == rows[2]
+    assert tables.find(7) == -1
+
+    tables.row(6)
+    with pytest.raises(RuntimeError):
+        tables.row(7)
+
+def test_regret_matching():
+    legal = np.zeros(15)
+    legal[[0, 1, 2]] = 1
+    regrets = np.zeros(15)
+    regrets[[0, 1, 3]] = [3, -1, 5]
+
+    assert regret_matching(regrets, legal)[[0, 1, 2, 3]].tolist() == [1, 0, 0, 0]
+    assert regret_matching(np.zeros(15), legal)[[0, 1, 2]].tolist() == pytest.approx([1 / 3] * 3)
+
+def test_memory_mapped(tmp_path):
+    trainer = CFRTrainer(CFRTables(1 << 12, str(tmp_path)), seed=1)
+    trainer.run(50)
+    size = trainer.tables.size
+    strategy_sums = np.array(trainer.tables.strategy_sums)
+
+    reopened = CFRTables(directory=str(tmp_path))
+
+    assert reopened.capacity == 1 << 12
+    assert reopened.size == size > 0
+    assert np.array_equal(reopened.strategy_sums, strategy_sums)
+
+def test_trained_agent():
+    trainer = CFRTrainer(seed=1)
+    trainer.run(1500)
+
+    stats = Simulator([CFRAgent(trainer.tables, seed=2), RandomAgent(3)], seed=4).run(600)
+
+    assert stats.wins[0] > stats.wins[1]
+
+def test_untrained_agent():
+    agent = CFRAgent(seed=1)
+
+    assert agent.generate_move(make_info(1)) in (Move.OK, Move.CALL_BLUFF, Move.BLOCK_TWO_WITH_ACE, Move.BLOCK_TWO_WITH_TWO)
+
+def test_cli(tmp_path, capsys):
+    trainer = main(["-i", "20", "-d", str(tmp_path), "--capacity", "4096", "--report-every", "10", "--seed", "1"])
+
+    assert trainer.iterations == 20
+    assert "20 iterations" in capsys.readouterr().out
+
+def test_agent_from_command_line(tmp_path, capsys):
+    main(["-i", "50", "-d", str(tmp_path), "--capacity", "65536", "--report-every", "0", "--seed", "1"])
+    spec = f"cfr={tmp_path}"
+
+    agent = create_agent(resolve_agent(spec), 3)
+    assert isinstance(agent, CFRAgent)
+    assert agent.tables.size > 0
+    with pytest.raises(ValueError):
+        resolve_agent("nonexistent=1")
+
+    tournament = run_tournament.main([spec, "random", "-n", "20", "-j", "1", "--seed", "2"])
+    assert tournament.results[(spec, "random")].games == 20
+    evaluation = evaluate.main([spec, "random", "-n", "20", "-j", "1", "--seed", "2"])
+    assert evaluation.test.games > 0
@@ -3,6 +3,7 @@ from WorldConflict.Card import Card
 from collections import Counter
 from copy import deepcopy
 import pytest
+import random
 
 def test_init():
     deck = CardDeck()
@@ -42,3 +43,14 @@ def test_discard():
     assert ret1 == False
     assert ret2 == True
     assert deck.discardPile == [Card.KING]
+
+def test_seeded_shuffle():
+    deck1 = CardDeck(random.Random(3))
+    deck2 = CardDeck(random.Random(3))
+
+    assert deck1.drawPile == deck2.drawPile
+
+    deck1.shuffle()
+    deck2.shuffle()
+
+    assert deck1.drawPile == deck2.drawPile
@@ -0,0 +1,89 @@
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.GameState import PlayerInfo
+from WorldConflict.IAgent import IAgent
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from WorldConflict.Environment import Environment, ACTION_SIZE, ENVIRONMENT_OBSERVATION_SIZE, DECISION_OFFSET, \
+    DISCARD_ACTION_OFFSET
+from WorldConflict.ResumableGame import DISCARD_DECISION
+
+def test_random_episodes():
+    env = Environment(RandomAgent(1), seed=2)
+    rng = random.Random(3)
+    rewards = []
+    discards = 0
+
+    for _ in range(200):
+        observation, legal_mask = env.reset()
+        done = False
+        while not done:
+            assert observation.shape == (ENVIRONMENT_OBSERVATION_SIZE,) and legal_mask.shape == (ACTION_SIZE,)
+            discard = env.decision.kind == DISCARD_DECISION
+            assert observation[DECISION_OFFSET] == discard
+            legal = np.flatnonzero(legal_mask)
+            assert all((action >= DISCARD_ACTION_OFFSET) == discard for action in legal)
+            discards += discard
+            observation, reward, done, legal_mask = env.step(int(rng.choice(legal)))
+        rewards.append(reward)
+        assert not legal_mask.any()
+
+    assert discards > 0
+    assert set(rewards) <= {-1.0, 0.0, 1.0}
+    assert rewards.count(1.0) > 40 and rewards.count(-1.0) > 40
+
+def test_illegal_action_forfeits():
+    env = Environment(RandomAgent(1), seed=0)
+    _, legal_mask = env.reset()
+    illegal = int(np.flatnonzero(~legal_mask)[0])
+
+    _, reward, done, _ = env.step(illegal)
+
+    assert done and reward == -1.0
+    with pytest.raises(RuntimeError):
+        env.step(Move.OK.value)
+
+def test_buffers_reused():
+    env = Environment(RandomAgent(1), seed=0)
+
+    observation, legal_mask = env.reset()
+    action = int(np.flatnonzero(legal_mask)[0])
+    next_observation, _, _, next_mask = env.step(action)
+
+    assert next_observation is observation and next_mask is legal_mask
+
+class AcceptingAgent(IAgent):
+    """Lets every move through and only ever collects a coin, so no card is lost before the agent's ace"""
+
+    def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+        return card_preference if card_preference in state.player.cards else state.player.cards[0]
+
+    def generate_move(self, state: PlayerInfo) -> Move:
+        return Move.OK if state.current_sequence else Move.PLAY_PLUS_ONE
+
+def test_discards_after_ace():
+    # the discards after the ace's draws have to be masked from the hand holding the drawn cards
+    for seed in range(30):
+        for choice in range(4):
+            env = Environment(AcceptingAgent(), seed=seed)
+            _, legal_mask = env.reset()
+            ace_played = False
+            while True:
+                decision = env.decision
+                legal = np.flatnonzero(legal_mask)
+                if decision.kind == DISCARD_DECISION:
+                    action = int(legal[choice % len(legal)])
+                elif ace_played:
+                    break
+                elif not decision.info.current_sequence:
+                    action = Move.PLAY_ACE.value
+                    ace_played = True
+                else:
+                    action = Move.OK.value
+                _, _, done, legal_mask = env.step(action)
+                assert not done
@@ -0,0 +1,74 @@
+from WorldConflict.Evaluation import Evaluation, SPRT, ACCEPTED, REJECTED, INCONCLUSIVE, elo_to_score, score_to_elo
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.IAgent import IAgent
+from WorldConflict.Move import Move
+from WorldConflict.evaluate import main
+
+import pytest
+
+class ForfeitAgent(IAgent):
+    def generate_give_card(self, state, card_preference):
+        return state.player.cards[0]
+
+    def generate_move(self, state):
+        return Move.FORFEIT
+
+def test_elo_conversion():
+    assert elo_to_score(0) == 0.5
+    assert abs(score_to_elo(elo_to_score(35)) - 35) < 1e-9
+    assert score_to_elo(0.75) > 0 > score_to_elo(0.25)
+
+def test_sprt_bounds():
+    with pytest.raises(ValueError):
+        SPRT(10, 0)
+
+    test = SPRT()
+    assert test.status() is None
+    test.add(60, 10, 30)
+    assert test.llr() > 0
+    test.add(600, 100, 300)
+    assert test.status() == ACCEPTED
+
+    test = SPRT()
+    test.add(300, 100, 400)
+    assert test.status() == REJECTED
+
+def test_confidence_interval_narrows():
+    test = SPRT()
+    test.add(30, 0, 20)
+    low, high = test.confidence_interval()
+    assert low < 0.6 < high
+    test.add(2970, 0, 1980)
+    assert test.confidence_interval()[0] > low and test.confidence_interval()[1] < high
+    elo_low, elo_high = test.elo_interval()
+    assert elo_low < score_to_elo(0.6) < elo_high
+
+def test_clear_cut_stops_early():
+    evaluation = Evaluation("random", RandomAgent, "forfeit", ForfeitAgent, SPRT(alpha=0.01, beta=0.01),
+                            max_games=10000, chunk_size=20, workers=1, seed=1)
+
+    assert evaluation.run() == ACCEPTED
+    assert evaluation.test.games < 200
+    assert evaluation.test.losses == 0
+
+def test_workers_stop_at_the_decision():
+    evaluation = Evaluation("random", RandomAgent, "forfeit", ForfeitAgent, SPRT(alpha=0.01, beta=0.01),
+                            max_games=10000, workers=2, seed=1)
+
+    assert evaluation.chunk_size == 20
+    assert evaluation.run() == ACCEPTED
+    # the test is checked after every chunk, the pending ones are cancelled
+    assert evaluation.test.games < 100
+
+def test_equal_agents_do_not_accept():
+    evaluation = Evaluation("a", RandomAgent, "b", RandomAgent, max_games=400, chunk_size=100, workers=2, seed=4)
+
+    assert evaluation.run() in (REJECTED, INCONCLUSIVE)
+    assert evaluation.test.games <= 400
+    assert "EVALUATION a vs b" in evaluation.report()
+
+def test_cli():
+    evaluation = main(["random", "random", "-n", "100", "-j", "1", "--chunk-size", "50", "--seed", "3"])
+
+    assert evaluation.second == "random#2"
+    assert evaluation.result is not None
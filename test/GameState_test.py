@@ -0,0 +1,43 @@
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+def test_player_info_snapshot():
+    game_state = GameState()
+    game_state.players[0].cards.extend([Card.ACE, Card.KING])
+    game_state.players[1].cards.extend([Card.TWO])
+    game_state.players[1].money = 5
+    game_state.current_sequence = [Move.PLAY_JACK]
+    game_state.initial_player = 1
+    game_state.deck.discardPile = [Card.QUEEN]
+
+    info = PlayerInfo(game_state, 0)
+
+    assert info.playerId == 0
+    assert info.initial_player == 1
+    assert info.player.cards == [Card.ACE, Card.KING]
+    assert info.players_card_num == (2, 1)
+    assert info.players_money == (2, 5)
+    assert info.current_sequence == (Move.PLAY_JACK,)
+    assert info.score == (0, 0)
+    assert info.discarded == (Card.QUEEN,)
+
+def test_player_info_isolated():
+    game_state = GameState()
+    game_state.players[0].cards.append(Card.ACE)
+
+    info = PlayerInfo(game_state, 0)
+    info.player.cards.append(Card.KING)
+    info.player.money = 100
+
+    assert game_state.players[0].cards == [Card.ACE]
+    assert game_state.players[0].money == 2
+
+    game_state.players[0].cards.append(Card.TWO)
+    game_state.current_sequence.append(Move.PLAY_TWO)
+    game_state.score[0] += 1
+
+    assert info.player.cards == [Card.ACE, Card.KING]
+    assert info.current_sequence == ()
+    assert info.score == (0, 0)
+    assert info.players_card_num == (1, 0)
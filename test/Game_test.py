@@ -67,6 +67,32 @@ def test_ace_ok():
     assert Counter(game_state.deck.drawPile) == Counter([])
     assert game_state.deck.discardPile == [Card.ACE, Card.JACK, Card.TWO]
 
+def test_discards_see_current_hand():
+    class RecordingMockAgent(MockAgent):
+        hands: list[Counter]
+
+        def generate_give_card(self, state: PlayerInfo, card_preference: Card) -> Card:
+            self.hands.append(Counter(state.player.cards))
+            return super().generate_give_card(state, card_preference)
+
+    agent1 = RecordingMockAgent([Move.PLAY_ACE], [Card.ACE, Card.JACK, Card.TWO])
+    agent1.hands = []
+    agent2 = MockAgent([Move.OK], [])
+    game = Game([agent1, agent2])
+    game_state = game.game_state
+    game_state.deck.drawPile = [Card.JACK, Card.JACK, Card.TWO]
+    game_state.initial_player = game_state.turn_player = 0
+    game_state.players[0].cards = [Card.ACE, Card.ACE]
+    game_state.players[1].cards = [Card.QUEEN, Card.QUEEN]
+
+    game.make_move(take_move(game_state, game_state.players[0], agent1))
+    game.make_move(take_move(game_state, game_state.players[1], agent2))
+
+    # every discard after the ace is asked with the cards drawn and the earlier discards gone
+    assert agent1.hands == [Counter([Card.ACE, Card.ACE]),
+                            Counter([Card.ACE, Card.TWO, Card.JACK, Card.JACK]),
+                            Counter([Card.ACE, Card.TWO, Card.JACK])]
+
 def test_king_ok():
     agent1 = MockAgent([Move.PLAY_KING], [Card.KING])
     agent2 = MockAgent([Move.OK], [])
@@ -760,3 +786,40 @@ def test_longer_game():
     assert game_state.deck.discardPile == [Card.TWO, Card.KING, Card.QUEEN, Card.JACK, Card.QUEEN]
 
     assert game_state.score == [0, 1]
+
+def test_seeded_deal():
+    game1 = Game([MockAgent([], []), MockAgent([], [])], seed=42)
+    game2 = Game([MockAgent([], []), MockAgent([], [])], seed=42)
+
+    for _ in range(5):
+        assert game1.game_seed == game2.game_seed
+        assert game1.game_state.initial_player == game2.game_state.initial_player
+        assert game1.game_state.players[0].cards == game2.game_state.players[0].cards
+        assert game1.game_state.players[1].cards == game2.game_state.players[1].cards
+        assert game1.game_state.deck.drawPile == game2.game_state.deck.drawPile
+        game1.new_game()
+        game2.new_game()
+
+def test_replay_from_seed():
+    game = Game([MockAgent([], []), MockAgent([], [])], seed=7)
+    game.new_game()
+    seed = game.game_seed
+    initial_player = game.game_state.initial_player
+    hands = [list(inventory.cards) for inventory in game.game_state.players]
+    draw_pile = list(game.game_state.deck.drawPile)
+
+    game.new_game()
+    game.new_game(seed)
+
+    assert game.game_seed == seed
+    assert game.game_state.initial_player == initial_player
+    assert [inventory.cards for inventory in game.game_state.players] == hands
+    assert game.game_state.deck.drawPile == draw_pile
+
+def test_different_seeds():
+    deals = set()
+    for seed in range(20):
+        game = Game([MockAgent([], []), MockAgent([], [])], seed=seed)
+        deals.add(tuple(game.game_state.deck.drawPile))
+
+    assert len(deals) > 1
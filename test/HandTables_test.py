@@ -0,0 +1,65 @@
+from WorldConflict.HandTables import HAND_SLOTS, HANDS_BY_SIZE, COUNTS, AliasSampler, hand_index, hand_cards, rank, \
+    unrank, unseen_index, consistent_hands, hand_sampler, sample_deal
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.Card import Card
+from collections import Counter
+from math import comb
+import random
+
+import pytest
+
+def make_info() -> PlayerInfo:
+    state = GameState(random.Random(1))
+    state.players[0].cards = [Card.KING, Card.TWO]
+    state.players[1].cards = [Card.ACE, Card.QUEEN, Card.QUEEN]
+    state.deck.discardPile = [Card.JACK, Card.TWO, Card.TWO]
+    return PlayerInfo(state, 0)
+
+def test_rank_unrank():
+    assert sum(len(hands) for hands in HANDS_BY_SIZE) == HAND_SLOTS
+    # hands of two cards: a pair of one of 5 ranks or two different ranks
+    assert len(HANDS_BY_SIZE[2]) == 5 + comb(5, 2)
+    for index in range(HAND_SLOTS):
+        size = sum(COUNTS[index])
+        assert unrank(size, rank(index)) == index
+        assert hand_index(hand_cards(index)) == index
+
+    assert hand_cards(hand_index([Card.TWO, Card.ACE, Card.TWO])) == (Card.ACE, Card.TWO, Card.TWO)
+
+def test_consistent_hands():
+    info = make_info()
+    unseen = unseen_index(info)
+    assert hand_cards(unseen) == (Card.ACE,) * 3 + (Card.KING,) * 2 + (Card.QUEEN,) * 3 + (Card.JACK,) * 2
+
+    hands, weights = consistent_hands(unseen, 3)
+    assert sum(weights) == comb(10, 3)
+    assert hand_index([Card.TWO]) not in hands
+    assert weights[hands.index(hand_index([Card.QUEEN] * 3))] == 1
+    assert weights[hands.index(hand_index([Card.ACE, Card.QUEEN, Card.QUEEN]))] == 3 * 3
+
+def test_alias_sampler():
+    sampler = AliasSampler([10, 20, 30], [1, 2, 7])
+    rng = random.Random(2)
+    counts = Counter(sampler.sample(rng) for _ in range(20000))
+
+    assert abs(counts[10] / 20000 - 0.1) < 0.01
+    assert abs(counts[30] / 20000 - 0.7) < 0.015
+    with pytest.raises(ValueError):
+        AliasSampler([], [])
+
+def test_sample_deal():
+    info = make_info()
+    rng = random.Random(3)
+    unseen = Counter(hand_cards(unseen_index(info)))
+
+    hands = Counter()
+    for _ in range(3000):
+        hand, draw_pile = sample_deal(info, rng)
+        cards = hand_cards(hand)
+        assert len(cards) == 3 and len(draw_pile) == 7
+        assert Counter(cards) + Counter(draw_pile) == unseen
+        hands[hand] += 1
+
+    assert hand_sampler(unseen_index(info), 3) is hand_sampler(unseen_index(info), 3)
+    # three queens is dealt once in comb(10, 3) deals
+    assert hands[hand_index([Card.QUEEN] * 3)] < 3000 * 4 / comb(10, 3)
@@ -0,0 +1,74 @@
+from WorldConflict.Hand import Hand
+from WorldConflict.Inventory import Inventory
+from WorldConflict.Card import Card
+
+import pytest
+
+def test_list_behaviour():
+    hand = Hand([Card.TWO, Card.ACE, Card.TWO])
+
+    assert len(hand) == 3
+    assert list(hand) == [Card.ACE, Card.TWO, Card.TWO]
+    assert hand[0] == Card.ACE and hand[-1] == Card.TWO and hand[1:] == [Card.TWO, Card.TWO]
+    assert Card.TWO in hand and Card.KING not in hand and Card.ANY not in hand
+    assert hand.count(Card.TWO) == 2
+    assert hand == [Card.ACE, Card.TWO, Card.TWO] and hand == (Card.ACE, Card.TWO, Card.TWO)
+    assert hand != [Card.TWO, Card.TWO, Card.ACE] and hand.same_cards([Card.TWO, Card.TWO, Card.ACE])
+    assert hand != [Card.TWO, Card.ACE] and not hand.same_cards([Card.TWO, Card.ACE])
+    assert [Card.KING] + hand == [Card.KING, Card.ACE, Card.TWO, Card.TWO]
+    assert repr(hand) == repr([Card.ACE, Card.TWO, Card.TWO])
+
+    with pytest.raises(IndexError):
+        hand[3]
+
+def test_add_remove():
+    hand = Hand()
+    assert not hand
+
+    hand.append(Card.KING)
+    hand.extend([Card.QUEEN, Card.KING])
+    hand.remove(Card.KING)
+
+    assert hand == [Card.KING, Card.QUEEN]
+    with pytest.raises(ValueError):
+        hand.remove(Card.ACE)
+    with pytest.raises(ValueError):
+        hand.append(Card.ANY)
+
+    hand.clear()
+    assert len(hand) == 0 and hand == []
+
+def test_key():
+    first = Hand([Card.ACE, Card.KING])
+    second = Hand([Card.KING, Card.ACE])
+
+    assert first == second
+    assert first.key() == second.key() != Hand([Card.ACE]).key()
+    assert {first.key(): 1}[second.key()] == 1
+    with pytest.raises(TypeError):
+        hash(first)
+
+def test_listed_follows_changes():
+    hand = Hand([Card.TWO, Card.ACE])
+    assert hand.listed() == (Card.ACE, Card.TWO)
+    assert hand.listed() is Hand([Card.ACE, Card.TWO]).listed()
+
+    hand.remove(Card.TWO)
+    hand.append(Card.KING)
+    assert hand.listed() == (Card.ACE, Card.KING)
+    assert hand.key() == Hand([Card.KING, Card.ACE]).key()
+    hand.clear()
+    assert hand.listed() == () and hand.key() == 0
+
+def test_inventory_cards():
+    inventory = Inventory()
+    inventory.cards = [Card.JACK, Card.ACE]
+
+    assert isinstance(inventory.cards, Hand)
+    copy = inventory.copy()
+    copy.cards.remove(Card.JACK)
+
+    assert inventory.cards == [Card.ACE, Card.JACK]
+    assert inventory.hand_key() != copy.hand_key()
+    # reading the cards is a plain attribute lookup
+    assert inventory.__dict__["cards"] is inventory.cards
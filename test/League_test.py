@@ -0,0 +1,76 @@
+from WorldConflict.League import League, Rating, update, match_quality, DEFAULT_MU, DEFAULT_SIGMA
+from WorldConflict.Tournament import MatchResult
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.IAgent import IAgent
+from WorldConflict.Move import Move
+from WorldConflict.run_league import main
+
+class ForfeitAgent(IAgent):
+    def generate_give_card(self, state, card_preference):
+        return state.player.cards[0]
+
+    def generate_move(self, state):
+        return Move.FORFEIT
+
+def test_update_win_and_draw():
+    winner, loser = Rating(), Rating()
+    update(winner, loser, 1.0)
+
+    assert winner.mu > DEFAULT_MU > loser.mu
+    assert winner.sigma < DEFAULT_SIGMA and loser.sigma < DEFAULT_SIGMA
+    assert winner.games == loser.games == 1
+
+    strong, weak = Rating(30, 2), Rating(20, 2)
+    update(strong, weak, 0.5)
+    assert 20 < weak.mu < strong.mu < 30
+
+    update(strong, weak, 0.0)
+    assert strong.mu < 30 - 1
+
+def test_match_quality():
+    assert match_quality(Rating(25, 1), Rating(25, 1)) > match_quality(Rating(25, 1), Rating(35, 1))
+    assert match_quality(Rating(25, 1), Rating(25, 1)) > match_quality(Rating(25, 8), Rating(25, 8))
+
+def test_pairings_prefer_uncertain_agents():
+    league = League({name: RandomAgent for name in "abcd"}, workers=1, seed=1)
+    league.ratings["a"] = Rating(25, 1)
+    league.ratings["b"] = Rating(40, 1)
+    league.ratings["c"] = Rating(26, 1)
+
+    assert league.pairings(1) == [("d", "a")]
+    assert league.pairings(5) == [("d", "a"), ("b", "c")]
+
+def test_record_interleaves():
+    league = League({"a": RandomAgent, "b": RandomAgent}, workers=1)
+    result = MatchResult("a", "b")
+    result.first_wins, result.second_wins = 10, 10
+
+    league.record(result)
+
+    assert abs(league.ratings["a"].mu - league.ratings["b"].mu) < 1
+    assert league.ratings["a"].games == 20
+
+def test_rounds_rank_and_resume(tmp_path):
+    roster = {"random": RandomAgent, "forfeit": ForfeitAgent, "random#2": RandomAgent}
+    league = League(roster, games_per_match=20, workers=1, seed=3)
+    for _ in range(4):
+        league.run_round(1)
+
+    assert league.standings()[-1][0] == "forfeit"
+    assert sum(rating.games for rating in league.ratings.values()) == 2 * 4 * 20
+
+    path = str(tmp_path / "league.json")
+    league.save(path)
+    resumed = League(dict(roster), games_per_match=20, workers=1)
+    resumed.load(path)
+
+    assert resumed.matches == 4 and resumed.seed == 3
+    assert resumed.ratings["forfeit"].to_dict() == league.ratings["forfeit"].to_dict()
+
+def test_cli(tmp_path):
+    path = str(tmp_path / "league.json")
+    main(["random", "random", "-r", "2", "-m", "1", "-n", "10", "-j", "1", "--state", path, "--seed", "1"])
+    league = main(["random", "random", "-r", "1", "-m", "1", "-n", "10", "-j", "1", "--state", path])
+
+    assert league.matches == 3
+    assert league.ratings["random"].games == 30
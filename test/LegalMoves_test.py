@@ -0,0 +1,43 @@
+from WorldConflict.LegalMoves import LEGAL_MOVES, LEGAL_MOVE_MASKS, money_bucket, legal_moves, legal_move_mask, \
+    is_legal, move_mask, moves_from_mask
+from WorldConflict.Inventory import Inventory
+from WorldConflict.Move import Move
+
+def test_money_bucket():
+    assert [money_bucket(money) for money in range(13)] == [0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+def test_start_of_sequence():
+    base = [Move.PLAY_ACE, Move.PLAY_KING, Move.PLAY_TWO, Move.PLAY_PLUS_ONE, Move.PLAY_PLUS_TWO]
+
+    assert list(legal_moves(Move.OK, 2)) == base
+    assert list(legal_moves(Move.OK, 3)) == base + [Move.PLAY_JACK]
+    assert list(legal_moves(Move.OK, 7)) == base + [Move.PLAY_JACK, Move.PLAY_AFFAIR]
+    assert list(legal_moves(Move.OK, 10)) == [Move.PLAY_AFFAIR]
+    assert legal_moves(Move.CALL_BLUFF, 5) == legal_moves(Move.OK, 5)
+
+def test_responses():
+    for money in [0, 4, 8, 12]:
+        assert legal_moves(Move.PLAY_KING, money) == (Move.OK, Move.CALL_BLUFF)
+        assert legal_moves(Move.BLOCK_TWO_WITH_ACE, money) == (Move.OK, Move.CALL_BLUFF)
+        assert legal_moves(Move.PLAY_JACK, money) == (Move.OK, Move.CALL_BLUFF, Move.BLOCK_JACK_WITH_QUEEN)
+        assert legal_moves(Move.PLAY_TWO, money) == (Move.OK, Move.CALL_BLUFF, Move.BLOCK_TWO_WITH_ACE, Move.BLOCK_TWO_WITH_TWO)
+        assert legal_moves(Move.PLAY_AFFAIR, money) == (Move.OK,)
+        assert legal_moves(Move.PLAY_PLUS_TWO, money) == (Move.OK, Move.BLOCK_PLUS_TWO_WITH_KING)
+        assert legal_moves(Move.FORFEIT, money) == ()
+
+def test_masks_match_tuples():
+    for row, mask_row in zip(LEGAL_MOVES, LEGAL_MOVE_MASKS):
+        for moves, mask in zip(row, mask_row):
+            assert moves_from_mask(mask) == tuple(sorted(moves, key=lambda move: move.value))
+
+    assert legal_move_mask(Move.PLAY_PLUS_TWO, 0) == move_mask((Move.OK, Move.BLOCK_PLUS_TWO_WITH_KING))
+    assert is_legal(Move.PLAY_JACK, Move.OK, 3)
+    assert not is_legal(Move.PLAY_JACK, Move.OK, 2)
+    assert not is_legal(Move.CALL_BLUFF, Move.PLAY_PLUS_ONE, 2)
+
+def test_inventory():
+    inventory = Inventory()
+    inventory.money = 7
+
+    assert inventory.get_legal_moves(Move.OK) is LEGAL_MOVES[Move.OK.value][2]
+    assert inventory.get_legal_move_mask(Move.OK) == move_mask(inventory.get_legal_moves(Move.OK))
@@ -0,0 +1,114 @@
+from WorldConflict.MCTSAgent import MCTSAgent, heuristic_discard
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.Simulation import Simulator
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+from time import perf_counter
+import pytest
+
+def make_info() -> PlayerInfo:
+    game_state = GameState()
+    game_state.players[0].cards = [Card.KING, Card.TWO]
+    game_state.players[1].cards = [Card.ACE, Card.QUEEN]
+    game_state.players[1].money = 4
+    game_state.deck.drawPile = [Card.ACE, Card.ACE, Card.KING, Card.KING, Card.QUEEN, Card.QUEEN,
+                                Card.JACK, Card.JACK, Card.TWO]
+    game_state.deck.discardPile = [Card.JACK, Card.TWO]
+    game_state.initial_player = game_state.turn_player = 0
+    return PlayerInfo(game_state, 0)
+
+def test_heuristic_discard():
+    assert heuristic_discard([Card.ACE, Card.KING], Card.KING) == Card.KING
+    assert heuristic_discard([Card.ACE, Card.KING], Card.TWO) == Card.KING
+    assert heuristic_discard([], Card.ANY) == Card.ANY
+
+def test_search_restores_state():
+    agent = MCTSAgent(iterations=200, seed=1)
+    info = make_info()
+
+    move = agent.generate_move(info)
+
+    state = agent.game.game_state
+    assert move in info.player.get_legal_moves(Move.OK)
+    assert sum(node.visits for node in agent.root.children.values()) == 200
+    assert len(agent.game.undo_log) == 0
+    assert state.players[0].cards == [Card.KING, Card.TWO]
+    assert len(state.players[1].cards) == 2
+    assert len(state.deck.drawPile) == 9
+    assert state.deck.discardPile == [Card.JACK, Card.TWO]
+    assert state.current_sequence == []
+
+def test_transpositions_share_nodes():
+    agent = MCTSAgent(iterations=500, seed=1)
+    agent.generate_move(make_info())
+
+    parents = {}
+    stack = [agent.root]
+    while stack:
+        node = stack.pop()
+        for child in node.children.values():
+            if id(child) not in parents:
+                stack.append(child)
+            parents.setdefault(id(child), set()).add(id(node))
+    assert agent.table.hits > 0
+    assert any(len(nodes) > 1 for nodes in parents.values())
+
+    # without the table every node has one parent
+    agent = MCTSAgent(iterations=200, seed=1, table_bits=None)
+    assert agent.generate_move(make_info()) in make_info().player.get_legal_moves(Move.OK)
+    assert agent.table is None
+
+class MoverRecordingAgent(MCTSAgent):
+    """Records the players that moved into every node the search hands out"""
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.movers = {}
+        self.shared = 0
+
+    def _node(self, state, ply, mover):
+        node = super()._node(state, ply, mover)
+        if ply:
+            movers = self.movers.setdefault(id(node), (node, set()))[1]
+            self.shared += len(movers) > 0
+            movers.add(mover)
+        return node
+
+def test_shared_nodes_have_one_mover():
+    agent = MoverRecordingAgent(iterations=200, seed=1)
+    Simulator([agent, RandomAgent(2)], seed=3).run(10)
+
+    assert agent.shared > 0
+    assert all(len(movers) == 1 for _, movers in agent.movers.values())
+
+def test_single_legal_move():
+    info = make_info()
+    info.current_sequence = (Move.PLAY_PLUS_ONE,)
+
+    assert MCTSAgent(iterations=10, seed=1).generate_move(info) == Move.OK
+
+def test_time_budget():
+    agent = MCTSAgent(iterations=None, time_limit=0.05, seed=1)
+
+    start = perf_counter()
+    agent.generate_move(make_info())
+
+    assert perf_counter() - start < 0.5
+    assert agent.root.children
+
+def test_budget_required():
+    with pytest.raises(ValueError):
+        MCTSAgent(iterations=None, time_limit=None)
+
+def test_beats_random():
+    stats = Simulator([MCTSAgent(iterations=100, seed=1), RandomAgent(2)], seed=3).run(30)
+
+    assert stats.wins[0] > 2 * stats.wins[1]
+
+def test_beliefs_beat_random():
+    agent = MCTSAgent(iterations=100, seed=1, beliefs=True)
+    stats = Simulator([RandomAgent(2), agent], seed=3).run(30)
+
+    assert agent.tracker.player == 1
+    assert stats.wins[1] > 2 * stats.wins[0]
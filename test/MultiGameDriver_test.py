@@ -0,0 +1,57 @@
+from WorldConflict.MultiGameDriver import MultiGameDriver
+from WorldConflict.IBatchAgent import IBatchAgent
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.Simulation import Simulator
+
+class BatchRandomAgent(IBatchAgent):
+    """Random agent answering a batch with one call, remembers the batch sizes"""
+
+    def __init__(self, seed: int) -> None:
+        super().__init__()
+        self.agent = RandomAgent(seed)
+        self.move_batches = []
+        self.discard_batches = []
+
+    def generate_moves_batch(self, states):
+        self.move_batches.append(len(states))
+        return [self.agent.generate_move(state) for state in states]
+
+    def generate_give_cards_batch(self, states, card_preferences):
+        self.discard_batches.append(len(states))
+        return [self.agent.generate_give_card(state, preference) for state, preference in zip(states, card_preferences)]
+
+def test_batches_against_plain_agent():
+    agent = BatchRandomAgent(1)
+    driver = MultiGameDriver([agent, RandomAgent(2)], parallel_games=32, seed=3)
+
+    stats = driver.run(500)
+
+    assert stats.games == 500
+    assert stats.wins[0] + stats.wins[1] + stats.draws == 500
+    assert stats.total_plies >= 500
+    assert max(agent.move_batches) == 32
+    assert sum(agent.move_batches) > 4 * len(agent.move_batches)
+    assert agent.discard_batches
+
+def test_self_play_shares_batches():
+    agent = BatchRandomAgent(1)
+    driver = MultiGameDriver([agent, agent], parallel_games=16, seed=4)
+
+    stats = driver.run(200)
+
+    assert stats.games == 200
+    assert all(game.pending is None for game in driver.games)
+    assert sum(driver.batch_sizes) == sum(agent.move_batches) + sum(agent.discard_batches)
+
+def test_batch_agent_as_plain_agent():
+    agent = BatchRandomAgent(1)
+    stats = Simulator([agent, RandomAgent(2)], seed=5).run(20)
+
+    assert stats.games == 20
+    assert set(agent.move_batches) == {1}
+
+def test_plain_agents_only():
+    driver = MultiGameDriver([RandomAgent(1), RandomAgent(2)], parallel_games=4, seed=5)
+
+    assert driver.run(20).games == 20
+    assert driver.batch_sizes == []
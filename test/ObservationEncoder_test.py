@@ -0,0 +1,70 @@
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from WorldConflict.ObservationEncoder import ObservationEncoder, OBSERVATION_SIZE, HAND_OFFSET, DISCARD_OFFSET, \
+    MONEY_OFFSET, CARD_NUM_OFFSET, DRAW_PILE_OFFSET, INITIAL_OFFSET, SCORE_OFFSET, SEQUENCE_LENGTH_OFFSET, SEQUENCE_OFFSET
+from WorldConflict.LegalMoves import MOVE_SLOTS
+
+def make_info(player: int) -> PlayerInfo:
+    game_state = GameState()
+    game_state.players[0].cards = [Card.KING, Card.KING, Card.TWO]
+    game_state.players[0].money = 5
+    game_state.players[1].cards = [Card.ACE]
+    game_state.players[1].money = 1
+    game_state.deck.discardPile = [Card.JACK, Card.TWO]
+    game_state.current_sequence = [Move.PLAY_TWO]
+    game_state.initial_player = 1
+    game_state.score = [3, 4]
+    return PlayerInfo(game_state, player)
+
+def test_encode():
+    encoder = ObservationEncoder(4)
+
+    observation, legal_mask = encoder.encode(make_info(0))
+
+    assert observation.shape == (OBSERVATION_SIZE,)
+    assert observation[HAND_OFFSET:HAND_OFFSET + 5].tolist() == [0, 2, 0, 0, 1]
+    assert observation[DISCARD_OFFSET:DISCARD_OFFSET + 5].tolist() == [0, 0, 0, 1, 1]
+    assert observation[MONEY_OFFSET:MONEY_OFFSET + 2].tolist() == [5, 1]
+    assert observation[CARD_NUM_OFFSET:CARD_NUM_OFFSET + 2].tolist() == [3, 1]
+    assert observation[DRAW_PILE_OFFSET] == 9
+    assert observation[INITIAL_OFFSET] == 0
+    assert observation[SCORE_OFFSET:SCORE_OFFSET + 2].tolist() == [3, 4]
+    assert observation[SEQUENCE_LENGTH_OFFSET] == 1
+    assert np.flatnonzero(observation[SEQUENCE_OFFSET:]).tolist() == [Move.PLAY_TWO.value]
+    assert np.flatnonzero(legal_mask).tolist() == sorted(move.value for move in (
+        Move.OK, Move.CALL_BLUFF, Move.BLOCK_TWO_WITH_ACE, Move.BLOCK_TWO_WITH_TWO))
+
+def test_encode_batch_reuses_buffers():
+    encoder = ObservationEncoder(4)
+    infos = [make_info(0), make_info(1), make_info(0)]
+
+    observations, legal_masks = encoder.encode_batch(infos)
+    first = observations.copy()
+    again, _ = encoder.encode_batch(infos[::-1])
+
+    assert observations.shape == (3, OBSERVATION_SIZE) and legal_masks.shape == (3, MOVE_SLOTS)
+    assert np.shares_memory(observations, encoder.observations) and np.shares_memory(again, observations)
+    assert np.array_equal(observations[0], first[2])
+    assert observations[1, INITIAL_OFFSET] == 1
+    assert observations[1, SCORE_OFFSET] == 4
+
+def test_caller_buffers():
+    encoder = ObservationEncoder(1)
+    observations = np.full((2, OBSERVATION_SIZE), 7, dtype=np.float32)
+    legal_masks = np.ones((2, MOVE_SLOTS), dtype=bool)
+
+    result, _ = encoder.encode_batch([make_info(1), make_info(1)], observations, legal_masks)
+
+    assert result.base is observations or result is observations
+    assert np.array_equal(observations[0], observations[1])
+    assert observations[0, HAND_OFFSET:HAND_OFFSET + 5].tolist() == [1, 0, 0, 0, 0]
+    assert legal_masks[0].sum() == 4
+
+    with pytest.raises(ValueError):
+        encoder.encode_batch([make_info(0), make_info(1)])
@@ -0,0 +1,129 @@
+from WorldConflict.PackedState import pack_state, unpack_state, position_key, card_count, hand_size, money, \
+    initial_player, turn_player, sequence, draw_pile_size, deck_counts, score
+from WorldConflict.Simulation import Simulator
+from WorldConflict.Game import Game
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.GameState import GameState
+from WorldConflict.CardDeck import DeckExhaustedError
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+from collections import Counter
+import random
+import pytest
+
+def make_state() -> GameState:
+    game_state = GameState()
+    game_state.players[0].cards.extend([Card.KING, Card.ACE, Card.KING])
+    game_state.players[0].money = 9
+    game_state.players[1].cards.extend([Card.TWO])
+    game_state.players[1].money = 0
+    game_state.initial_player = 1
+    game_state.turn_player = 0
+    game_state.current_sequence = [Move.PLAY_TWO, Move.BLOCK_TWO_WITH_ACE]
+    game_state.deck.drawPile = [Card.QUEEN, Card.JACK, Card.TWO]
+    game_state.deck.discardPile = [Card.JACK, Card.ACE]
+    game_state.score = [7, 12]
+    return game_state
+
+def test_round_trip():
+    game_state = make_state()
+
+    packed = pack_state(game_state)
+    unpacked = unpack_state(packed)
+
+    assert Counter(unpacked.players[0].cards) == Counter(game_state.players[0].cards)
+    assert unpacked.players[0].money == 9
+    assert unpacked.players[1].cards == [Card.TWO]
+    assert unpacked.players[1].money == 0
+    assert unpacked.initial_player == 1
+    assert unpacked.turn_player == 0
+    assert unpacked.current_sequence == [Move.PLAY_TWO, Move.BLOCK_TWO_WITH_ACE]
+    assert unpacked.deck.drawPile == [Card.QUEEN, Card.JACK, Card.TWO]
+    assert unpacked.deck.discardPile == [Card.JACK, Card.ACE]
+    assert unpacked.score == [7, 12]
+    assert pack_state(unpacked) == packed
+
+def test_unpacked_state_resets():
+    unpacked = unpack_state(pack_state(make_state()), rng=random.Random(1))
+    unpacked.reset()
+
+    assert unpacked.deck.rng is unpacked.rng
+    assert len(unpacked.deck.drawPile) == 15
+    assert unpacked.players[0].cards == [] and unpacked.players[0].money == 2
+    assert unpacked.score == [7, 12]
+
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=3)
+    game.game_state = unpack_state(pack_state(make_state()))
+    game.new_game(5)
+    assert all(len(player.cards) == 2 for player in game.game_state.players)
+    assert len(game.game_state.deck.drawPile) == 11
+
+def test_unpack_in_place():
+    game_state = GameState()
+    players = game_state.players
+
+    unpack_state(pack_state(make_state()), game_state)
+
+    assert game_state.players is players
+    assert game_state.players[1].cards == [Card.TWO]
+
+def test_accessors():
+    packed = pack_state(make_state())
+
+    assert card_count(packed, 0, Card.KING) == 2
+    assert card_count(packed, 0, Card.QUEEN) == 0
+    assert hand_size(packed, 0) == 3
+    assert hand_size(packed, 1) == 1
+    assert money(packed, 0) == 9
+    assert initial_player(packed) == 1
+    assert turn_player(packed) == 0
+    assert sequence(packed) == (Move.PLAY_TWO, Move.BLOCK_TWO_WITH_ACE)
+    assert draw_pile_size(packed) == 3
+    assert deck_counts(packed) == (0, 0, 1, 1, 1)
+    assert score(packed) == (7, 12)
+
+def test_hash_and_equality():
+    packed1 = pack_state(make_state())
+    reordered = make_state()
+    reordered.players[0].cards = [Card.ACE, Card.KING, Card.KING]
+    packed2 = pack_state(reordered)
+    rescored = make_state()
+    rescored.score = [0, 0]
+    packed3 = pack_state(rescored)
+
+    assert packed1 == packed2
+    assert len({packed1, packed2}) == 1
+    assert packed1 != packed3
+    assert position_key(packed1) == position_key(packed3)
+
+def test_out_of_range():
+    game_state = make_state()
+    game_state.players[0].money = 32
+    with pytest.raises(ValueError):
+        pack_state(game_state)
+
+    game_state = make_state()
+    game_state.players[1].cards = [Card.TWO] * 4
+    with pytest.raises(ValueError):
+        pack_state(game_state)
+
+def test_round_trip_simulated():
+    simulator = Simulator([RandomAgent(3), RandomAgent(4)])
+    game = simulator.game
+
+    for _ in range(300):
+        game_state = game.game_state
+        packed = pack_state(game_state)
+        unpacked = unpack_state(packed)
+
+        assert pack_state(unpacked) == packed
+        assert unpacked.deck.drawPile == game_state.deck.drawPile
+        assert unpacked.deck.discardPile == game_state.deck.discardPile
+        for player in range(2):
+            assert Counter(unpacked.players[player].cards) == Counter(game_state.players[player].cards)
+
+        try:
+            game.process_game_step()
+        except DeckExhaustedError:
+            game.new_game()
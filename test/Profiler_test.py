@@ -0,0 +1,68 @@
+from WorldConflict.Profiler import Profiler, Histogram, ProfiledAgent
+from WorldConflict.Game import Game, PROFILED_METHODS
+from WorldConflict.Simulation import Simulator
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.simulate import main
+
+import json
+
+def test_histogram():
+    histogram = Histogram()
+
+    for duration in [100, 200, 300, 5000]:
+        histogram.add(duration)
+
+    assert histogram.count == 4
+    assert histogram.min_ns == 100
+    assert histogram.max_ns == 5000
+    assert histogram.mean_ns() == 1400
+    assert sum(histogram.buckets) == 4
+    assert histogram.percentile_ns(0.5) == 256
+    assert histogram.percentile_ns(1.0) == 5000
+
+def test_timed():
+    profiler = Profiler()
+    double = profiler.timed("double", lambda x: 2 * x)
+
+    assert double(3) == 6
+    assert double(4) == 8
+    assert profiler.histograms["double"].count == 2
+    assert "double" in profiler.report()
+
+def test_game_profiling():
+    agents = [RandomAgent(1), RandomAgent(2)]
+    simulator = Simulator(agents, seed=0)
+    profiler = Profiler()
+
+    simulator.game.enable_profiling(profiler)
+    simulator.run(50)
+
+    assert all(isinstance(agent, ProfiledAgent) for agent in simulator.game.agents)
+    assert profiler.histograms["new_game"].count == 50
+    assert profiler.histograms["make_move"].count == sum(
+        profiler.histograms[f"agent{seat}.generate_move"].count for seat in range(2))
+    assert "process_move" in profiler.histograms
+    assert "plus_one_start" in profiler.histograms
+
+    simulator.game.disable_profiling()
+    calls = profiler.histograms["make_move"].count
+    simulator.run(10)
+
+    assert list(simulator.game.agents) == agents
+    assert not any(name in simulator.game.__dict__ for name in PROFILED_METHODS)
+    assert profiler.histograms["make_move"].count == calls
+
+def test_profiled_results_unchanged():
+    plain = Simulator([RandomAgent(1), RandomAgent(2)], seed=3).run(100)
+    profiled = Simulator([RandomAgent(1), RandomAgent(2)], seed=3)
+    profiled.game.enable_profiling(Profiler())
+
+    assert profiled.run(100).length_histogram == plain.length_histogram
+
+def test_cli_profile(tmp_path, capsys):
+    path = tmp_path / "profile.json"
+
+    main(["-n", "20", "--profile-out", str(path)])
+
+    assert "make_move" in capsys.readouterr().out
+    assert json.loads(path.read_text())["new_game"]["count"] == 20
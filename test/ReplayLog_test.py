@@ -0,0 +1,78 @@
+from WorldConflict.ReplayLog import ReplayWriter, GameRecorder, encode_record, decode_record, iter_records, \
+    RESULT_UNFINISHED, DISCARD_EVENT
+from WorldConflict.Game import Game
+from WorldConflict.Simulation import Simulator
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+from WorldConflict.simulate import main
+
+import os
+
+def read_all(writer: ReplayWriter) -> list[bytes]:
+    return [record for path in writer.files for record in iter_records(path)]
+
+def test_record_round_trip():
+    deal = bytes([Card.ACE.value, Card.TWO.value, Card.KING.value, Card.KING.value])
+    events = bytes([Move.PLAY_KING.value, Move.OK.value, DISCARD_EVENT | Card.KING.value])
+
+    record = encode_record(2 ** 64 - 1, 1, deal, 0, events)
+
+    assert len(record) == 16 + len(events)
+    assert decode_record(record) == (2 ** 64 - 1, 1, (Card.ACE, Card.TWO, Card.KING, Card.KING), 0,
+                                     [Move.PLAY_KING, Move.OK, Card.KING])
+
+def test_writer_rotates(tmp_path):
+    records = [encode_record(seed, seed % 2, bytes(4), 0, bytes(seed % 50)) for seed in range(500)]
+
+    with ReplayWriter(str(tmp_path), chunk_bytes=256, max_file_bytes=2048) as writer:
+        for record in records:
+            writer.write(record)
+
+    assert len(writer.files) > 1
+    assert all(os.path.getsize(path) < 2048 + 256 + 100 for path in writer.files)
+    assert read_all(writer) == records
+
+def test_recorded_games(tmp_path):
+    writer = ReplayWriter(str(tmp_path))
+    simulator = Simulator([RandomAgent(1), RandomAgent(2)], seed=4)
+    game = simulator.game
+    seeds = []
+    game.enable_recording(GameRecorder(writer))
+
+    for _ in range(100):
+        seeds.append(game.game_seed)
+        simulator.play_game()
+
+    game.disable_recording()
+    writer.close()
+
+    records = [decode_record(record) for record in read_all(writer)]
+    assert [seed for seed, *_ in records] == seeds
+    replay = Game([RandomAgent(), RandomAgent()])
+    for seed, initial_player, deal, result, events in records:
+        replay.new_game(seed)
+        hands = replay.game_state.players
+        assert initial_player == replay.game_state.initial_player
+        assert deal == (hands[0].cards[0], hands[1].cards[0], hands[0].cards[1], hands[1].cards[1])
+        assert result in (0, 1, RESULT_UNFINISHED)
+        assert isinstance(events[0], Move)
+    assert not any(name in game.__dict__ for name in ("make_move", "new_game"))
+
+def test_recording_keeps_results(tmp_path):
+    plain = Simulator([RandomAgent(1), RandomAgent(2)], seed=5).run(100)
+    recorded = Simulator([RandomAgent(1), RandomAgent(2)], seed=5)
+    with ReplayWriter(str(tmp_path)) as writer:
+        recorded.game.enable_recording(GameRecorder(writer))
+        stats = recorded.run(100)
+        recorded.game.disable_recording()
+
+    assert stats.wins == plain.wins
+    assert writer.records == 100
+
+def test_cli_record(tmp_path, capsys):
+    main(["-n", "30", "--record", str(tmp_path), "--profile"])
+
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) == 1
+    assert len(list(iter_records(os.path.join(tmp_path, files[0])))) == 30
@@ -0,0 +1,99 @@
+from WorldConflict.ReplayReader import ReplayReader, ReplayRecord, replay, INDEX_SUFFIX
+from WorldConflict.ReplayLog import ReplayWriter, GameRecorder, iter_records, RESULT_UNFINISHED
+from WorldConflict.Game import Game, take_move
+from WorldConflict.GameState import GameState
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.CardDeck import DeckExhaustedError
+
+import os
+import random
+import pytest
+
+def snapshot(game_state: GameState) -> tuple:
+    return (
+        [(list(player.cards), player.money) for player in game_state.players],
+        list(game_state.deck.drawPile),
+        list(game_state.deck.discardPile),
+        list(game_state.current_sequence),
+        game_state.initial_player,
+        game_state.turn_player,
+    )
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Records 60 games into several files, with the state after every ply of each game"""
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=7)
+    histories = []
+    with ReplayWriter(str(tmp_path), chunk_bytes=200, max_file_bytes=600) as writer:
+        game.enable_recording(GameRecorder(writer))
+        for _ in range(60):
+            state = game.game_state
+            history = [snapshot(state)]
+            try:
+                while not game.make_move(take_move(state, state.players[state.turn_player], game.agents[state.turn_player])):
+                    history.append(snapshot(state))
+                history.append(None)
+            except DeckExhaustedError:
+                pass
+            histories.append(history)
+            game.new_game()
+        game.disable_recording()
+    return str(tmp_path), writer.files, histories
+
+def test_index(corpus):
+    directory, files, _ = corpus
+    expected = [record for path in files for record in iter_records(path)]
+
+    with ReplayReader(directory) as reader:
+        assert len(files) > 1
+        assert len(reader) == 60
+        assert [reader.raw(index) for index in range(60)] == expected
+        assert reader[-1].seed == reader[59].seed
+        assert [record.seed for record in reader] == [ReplayRecord(record).seed for record in expected]
+        with pytest.raises(IndexError):
+            reader[60]
+
+    assert all(os.path.exists(path + INDEX_SUFFIX) for path in files)
+    with ReplayReader(files) as reader:
+        assert [reader.raw(index) for index in range(60)] == expected
+
+def test_replay_every_ply(corpus):
+    directory, _, histories = corpus
+
+    with ReplayReader(directory) as reader:
+        for index, history in enumerate(histories):
+            record = reader[index]
+            for ply, expected in enumerate(history):
+                if expected is not None:
+                    assert snapshot(reader.state_at(index, ply).game_state) == expected
+
+            final = replay(record).game_state
+            if record.result == RESULT_UNFINISHED:
+                assert history[-1] is not None
+            else:
+                assert final.score[record.result] == 1
+
+def test_sample(corpus):
+    directory, _, _ = corpus
+
+    with ReplayReader(directory) as reader:
+        seeds = {record.seed for record in reader}
+        sample = reader.sample(20, random.Random(0))
+
+    assert len(sample) == 20
+    assert all(record.seed in seeds for record in sample)
+
+def test_indices_are_mapped(corpus):
+    directory, files, _ = corpus
+    expected = [record for path in files for record in iter_records(path)]
+
+    with ReplayReader(files, write_index=False) as reader:
+        assert not any(os.path.exists(path + INDEX_SUFFIX) for path in files)
+        assert [reader.raw(index) for index in range(60)] == expected
+
+    with ReplayReader(directory) as reader:
+        assert len(reader._index_maps) == len(files)
+        counts = [sum(1 for _ in iter_records(path)) for path in files]
+        assert list(reader.starts) == [sum(counts[:end]) for end in range(len(files) + 1)]
+        assert [reader.raw(index) for index in range(60)] == expected
+    assert reader._index_maps == []
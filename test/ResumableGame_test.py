@@ -0,0 +1,87 @@
+from WorldConflict.ResumableGame import ResumableGame, MOVE_DECISION, DISCARD_DECISION
+from WorldConflict.Simulation import Simulator
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.GameState import GameState
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import pytest
+
+def test_matches_agents():
+    """Answering with the same agent gives the same games as letting the engine ask the agent"""
+    plain = Simulator([RandomAgent(1), RandomAgent(2)], seed=6)
+    driven = RandomAgent(1)
+    game = ResumableGame([None, RandomAgent(2)], seed=6)
+    discards = 0
+
+    for _ in range(200):
+        ended = game.new_game(plain.game.game_seed)
+        winner, _, exhausted = plain.play_game()
+        while not ended:
+            decision = game.pending
+            if decision.kind == MOVE_DECISION:
+                ended = game.answer(driven.generate_move(decision.info))
+            else:
+                discards += 1
+                ended = game.answer(driven.generate_give_card(decision.info, decision.card_preference))
+
+        assert game.exhausted == exhausted
+        if not exhausted:
+            assert game.winner == winner
+
+    assert discards > 50
+
+def test_answers_not_asked_twice():
+    game = ResumableGame([None, None], seed=0)
+    game.new_game()
+    state = game.game.game_state
+    state.players[0].cards = [Card.TWO, Card.ACE]
+    state.players[1].cards = [Card.KING, Card.JACK]
+    state.initial_player = state.turn_player = 0
+    game.pending.player = 0
+
+    assert not game.answer(Move.PLAY_TWO)
+    assert not game.answer(Move.BLOCK_TWO_WITH_ACE)
+    assert not game.answer(Move.CALL_BLUFF)
+
+    # the bluff was caught, the unblocked two is played first: player 0 gives the two away
+    assert game.pending.kind == DISCARD_DECISION and game.pending.player == 0
+    assert game.pending.card_preference == Card.TWO
+    assert not game.answer(Card.TWO)
+
+    # then the blocking player loses a card, player 0's discard is answered from memory
+    assert game.pending.kind == DISCARD_DECISION and game.pending.player == 1
+    assert state.players[0].cards == [Card.ACE, Card.TWO]
+    assert state.current_sequence == [Move.PLAY_TWO, Move.BLOCK_TWO_WITH_ACE]
+
+    assert not game.answer(Card.JACK)
+    assert state.players[1].cards == [Card.KING]
+    assert state.players[0].money == 4 and state.players[1].money == 0
+    assert len(state.players[0].cards) == 2 and state.deck.discardPile == [Card.TWO, Card.JACK]
+    assert game.pending.kind == MOVE_DECISION and game.pending.player == 1
+
+def test_answer_checks():
+    game = ResumableGame([None, RandomAgent(1)], seed=0)
+    game.new_game()
+
+    with pytest.raises(ValueError):
+        game.answer(Card.ACE)
+
+    sequence = game.game.game_state.current_sequence
+    assert game.answer(Move.PLAY_ACE if sequence else Move.OK)
+    assert game.winner == 1
+    with pytest.raises(RuntimeError):
+        game.answer(Move.OK)
+
+def test_reset_reuses_objects():
+    state = GameState()
+    players, deck = list(state.players), state.deck
+    state.players[0].cards.append(Card.ACE)
+    state.deck.draw()
+
+    state.reset()
+
+    assert state.players == players and all(a is b for a, b in zip(state.players, players))
+    assert state.deck is deck
+    assert len(deck.drawPile) == 15 and deck.discardPile == []
+    assert len(state.players[0].cards) == 0 and state.players[0].money == 2
@@ -0,0 +1,73 @@
+from WorldConflict.RandomAgent import RandomAgent
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from WorldConflict.SelfPlay import SelfPlay, ShardWriter, generate_batches, FIELDS
+from WorldConflict.Environment import ACTION_SIZE, DISCARD_ACTION_OFFSET, DECISION_OFFSET
+from WorldConflict.run_selfplay import main
+
+def load(paths):
+    shards = [np.load(path) for path in paths]
+    return {name: np.concatenate([shard[name] for shard in shards]) for name in FIELDS}
+
+def test_batches_label_decisions():
+    batches = list(generate_batches([RandomAgent, RandomAgent], 30, 100, 4, 64))
+    data = {name: np.concatenate([batch[name] for batch in batches]) for name in FIELDS}
+
+    assert set(data["game_ids"]) == set(range(100, 130))
+    rows = np.arange(len(data["actions"]))
+    assert data["legal_masks"][rows, data["actions"]].all()
+    assert ((data["actions"] >= DISCARD_ACTION_OFFSET) == (data["observations"][:, DECISION_OFFSET] == 1)).all()
+    for game_id in range(100, 130):
+        game = data["game_ids"] == game_id
+        outcomes = data["outcomes"][game]
+        players = data["players"][game]
+        # both players' decisions of a game see opposite outcomes, or both a draw
+        assert len(set(zip(players, outcomes))) <= 2
+        assert outcomes[players == 0].sum() * outcomes[players == 1].sum() <= 0
+
+def test_batches_reproducible_and_keep_random_module_state():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+
+    first = list(generate_batches([RandomAgent, RandomAgent], 10, 0, 7, 64))
+    second = list(generate_batches([RandomAgent, RandomAgent], 10, 0, 7, 64))
+
+    assert random.random() == expected
+    assert len(first) == len(second)
+    for batch, other in zip(first, second):
+        assert all(np.array_equal(batch[name], other[name]) for name in FIELDS)
+
+def test_shard_writer_exact_sizes(tmp_path):
+    writer = ShardWriter(str(tmp_path), 100)
+    for batch in generate_batches([RandomAgent, RandomAgent], 20, 0, 1, 37):
+        writer.add(batch)
+    writer.flush()
+
+    sizes = [len(np.load(path)["actions"]) for path in writer.shards]
+    assert sum(sizes) == writer.rows
+    assert all(size == 100 for size in sizes[:-1]) and 0 < sizes[-1] <= 100
+
+def test_workers_match_single_process(tmp_path):
+    single = SelfPlay([RandomAgent, RandomAgent], str(tmp_path / "single"), 500, workers=1, seed=9).run(40)
+    parallel = SelfPlay([RandomAgent, RandomAgent], str(tmp_path / "parallel"), 500, workers=2, queue_size=1,
+                        batch_rows=16, seed=9).run(40)
+
+    assert parallel.games == 40
+    data = load(parallel.shards)
+    assert set(data["game_ids"]) == set(range(40))
+    assert data["legal_masks"].shape == (parallel.rows, ACTION_SIZE)
+    # the first worker plays the first half of the games with the same seed as the single process run
+    first_half = load(single.shards)
+    first_half = first_half["actions"][first_half["game_ids"] < 20]
+    assert np.array_equal(data["actions"][data["game_ids"] < 20], first_half)
+
+def test_cli(tmp_path):
+    stats = main(["random", "-n", "10", "-o", str(tmp_path), "-j", "1", "--shard-size", "64", "--seed", "2"])
+
+    assert stats.games == 10
+    assert len(stats.shards) == -(-stats.rows // 64)
@@ -0,0 +1,87 @@
+from WorldConflict.Simulation import Simulator, SimulationStats, DRAW
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.AgentRegistry import resolve_agent
+from WorldConflict.simulate import main
+
+import os
+import subprocess
+import sys
+import pytest
+
+def test_stats_record():
+    stats = SimulationStats()
+
+    stats.record(0, 4)
+    stats.record(1, 6)
+    stats.record(DRAW, 8, exhausted=True)
+
+    assert stats.games == 3
+    assert stats.wins == [1, 1]
+    assert stats.draws == 1
+    assert stats.exhausted == 1
+    assert stats.mean_length() == 6
+    assert stats.length_stdev() == 2
+    assert stats.length_percentile(0.5) == 6
+
+def test_stats_merge():
+    stats1 = SimulationStats()
+    stats1.record(0, 4)
+    stats2 = SimulationStats()
+    stats2.record(1, 6)
+
+    stats1.merge(stats2)
+
+    assert stats1.games == 2
+    assert stats1.wins == [1, 1]
+    assert stats1.length_histogram[4] == 1 and stats1.length_histogram[6] == 1
+
+def test_run():
+    simulator = Simulator([RandomAgent(1), RandomAgent(2)])
+
+    stats = simulator.run(200)
+
+    assert stats.games == 200
+    assert stats.wins[0] + stats.wins[1] + stats.draws == 200
+    assert stats.length_histogram.total() == 200
+    assert min(stats.length_histogram) >= 2
+    assert simulator.game.game_state.current_sequence == []
+
+def test_resolve_agent():
+    assert resolve_agent("random") is RandomAgent
+    assert resolve_agent("WorldConflict.RandomAgent:RandomAgent") is RandomAgent
+
+    with pytest.raises(ValueError):
+        resolve_agent("nonexistent")
+
+    with pytest.raises(ValueError):
+        resolve_agent("WorldConflict.Simulation:SimulationStats")
+
+def test_cli(capsys):
+    stats = main(["random", "random", "-n", "50"])
+
+    assert stats.games == 50
+    assert "SIMULATION RESULTS" in capsys.readouterr().out
+
+def test_cli_seeded(capsys):
+    stats1 = main(["-n", "100", "--seed", "9"])
+    stats2 = main(["-n", "100", "--seed", "9"])
+
+    assert stats1.wins == stats2.wins
+    assert stats1.length_histogram == stats2.length_histogram
+
+def test_numpy_is_optional():
+    """Without numpy the engine and the command line tools load, numpy modules say what is missing"""
+    script = """
+import sys
+sys.modules["numpy"] = None
+from WorldConflict import Simulation, MCTSAgent, MultiGameDriver, run_tournament, evaluate
+from WorldConflict.AgentRegistry import resolve_agent
+try:
+    resolve_agent("cfr=tables")
+except ImportError as error:
+    print(error)
+"""
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                            env={**os.environ, "PYTHONPATH": source}).stdout
+    assert output.strip() == "CFR needs numpy, an optional dependency installed with pip install numpy"
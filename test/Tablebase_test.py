@@ -0,0 +1,139 @@
+from WorldConflict.Game import Game
+from WorldConflict.GameState import GameState, PlayerInfo
+from WorldConflict.CardDeck import FULL_DECK
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.HandTables import hand_cards
+from WorldConflict.Hand import CARD_TYPES
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from WorldConflict.Tablebase import Tablebase, TablebaseAgent, SEQUENCES, UNKNOWN, LOSS, DRAW, WIN, draw_offsets
+from WorldConflict.build_tablebase import main
+
+@pytest.fixture(scope="module")
+def tablebase() -> Tablebase:
+    tablebase = Tablebase(max_draw=1, max_money=3)
+    tablebase.solve()
+    return tablebase
+
+def make_state(first: list[Card], second: list[Card], pile: list[Card], money: tuple[int, int],
+               sequence: tuple[Move, ...] = (), initial: int = 0) -> GameState:
+    state = GameState(random.Random(0))
+    state.players[0].cards = first
+    state.players[1].cards = second
+    state.players[0].money, state.players[1].money = money
+    rest = list(FULL_DECK)
+    for card in first + second + pile:
+        rest.remove(card)
+    state.deck.drawPile = list(pile)
+    state.deck.discardPile = rest
+    state.current_sequence = list(sequence)
+    state.initial_player = initial
+    state.turn_player = initial ^ (len(sequence) & 1)
+    state.rehash()
+    return state
+
+def position_state(tablebase: Tablebase, position: tuple[int, ...]) -> GameState:
+    hand0, hand1, draw, money0, money1, sequence, initial = position
+    length = 0
+    while draw_offsets(length)[-1] <= draw:
+        length += 1
+    number = draw - draw_offsets(length)[length]
+    pile = [Card(number // CARD_TYPES ** place % CARD_TYPES) for place in range(length)]
+    return make_state(list(hand_cards(tablebase.hands[hand0])), list(hand_cards(tablebase.hands[hand1])), pile,
+                      (money0, money1), SEQUENCES[sequence], initial)
+
+def test_scope(tablebase: Tablebase):
+    assert tablebase.values.shape == (5, 5, 6, 4, 4, len(SEQUENCES), 2)
+    assert len(SEQUENCES) == 12
+    assert set(np.unique(tablebase.values)) == {UNKNOWN, LOSS, DRAW, WIN}
+
+    # two cards, the start of a game and too much money are out of the table
+    assert tablebase.index(make_state([Card.ACE, Card.KING], [Card.TWO], [], (2, 2))) == -1
+    assert tablebase.index(GameState(random.Random(1))) == -1
+    assert tablebase.value(make_state([Card.ACE], [Card.TWO], [], (5, 2))) == UNKNOWN
+
+def test_jack_wins(tablebase: Tablebase):
+    state = make_state([Card.JACK], [Card.KING], [Card.ACE], (3, 0))
+    assert tablebase.value(state) == WIN
+    assert tablebase.move_value(state, Move.PLAY_JACK) == WIN
+    # bluffing an ace or a king with the last card loses when it is called
+    assert tablebase.move_value(state, Move.PLAY_KING) == LOSS
+
+    # the opponent's view of the same move
+    state.current_sequence = [Move.PLAY_JACK]
+    state.turn_player = 1
+    assert tablebase.value(state) == LOSS
+
+def test_empty_draw_pile():
+    tablebase = Tablebase(max_draw=0, max_money=3)
+    tablebase.solve()
+    # whatever the ace does, the next draw exhausts the pile
+    state = make_state([Card.ACE], [Card.ACE], [], (0, 0), (Move.PLAY_ACE,))
+    assert tablebase.move_value(state, Move.OK) == DRAW
+    # a king is a bluff, so calling it removes the last card
+    state = make_state([Card.ACE], [Card.ACE], [], (0, 0), (Move.PLAY_KING,))
+    assert tablebase.move_value(state, Move.CALL_BLUFF) == WIN
+    assert tablebase.value(state) == WIN
+
+def test_won_positions_are_won(tablebase: Tablebase):
+    rng = random.Random(4)
+    won = np.argwhere(tablebase.values == WIN)
+    for row in rng.sample(range(len(won)), 200):
+        state = position_state(tablebase, tuple(int(value) for value in won[row]))
+        winner = state.turn_player
+        game = Game([RandomAgent(1), RandomAgent(2)])
+        game.game_state = state
+
+        ended = False
+        while not ended:
+            if state.turn_player == winner:
+                move, value = tablebase.best_move(state)
+                assert value == WIN
+            else:
+                last_move = state.current_sequence[-1] if state.current_sequence else Move.OK
+                move = rng.choice(state.players[state.turn_player].get_legal_moves(last_move))
+            ended = game.make_move(move)
+        assert state.score[winner] == 1 and state.score[winner ^ 1] == 0
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "table.npy")
+    solved = main([path, "--max-draw", "0", "--max-money", "2"])
+    loaded = Tablebase(path)
+
+    assert (loaded.max_cards, loaded.max_draw, loaded.max_money) == (1, 0, 2)
+    assert np.array_equal(loaded.values, solved.values)
+    state = make_state([Card.ACE], [Card.ACE], [], (0, 0), (Move.PLAY_KING,))
+    assert loaded.value(state) == WIN
+
+def test_agent(tablebase: Tablebase):
+    fallback = RandomAgent(3)
+    agent = TablebaseAgent(tablebase, fallback)
+
+    # no queen left to block the jack, whatever the opponent holds
+    state = make_state([Card.JACK], [Card.KING], [Card.ACE], (3, 0))
+    info = PlayerInfo(state, 0)
+    assert tablebase.score(info) == 1.0
+    scores = tablebase.move_scores(info)
+    assert scores[Move.PLAY_JACK] == 1.0
+    assert scores[Move.PLAY_KING] == 0.0
+    move = agent.generate_move(info)
+    assert scores[move] == 1.0
+    assert agent.covered == 1
+
+    # a queen might be the opponent's card, blocking the jack until the draw pile runs out, or the one left to draw
+    info = PlayerInfo(make_state([Card.JACK], [Card.QUEEN], [Card.ACE], (3, 0)), 0)
+    assert set(tablebase.deals(info)) == {((Card.ACE,), (Card.QUEEN,)), ((Card.QUEEN,), (Card.ACE,))}
+    assert tablebase.move_scores(info)[Move.PLAY_JACK] == 0.75
+
+    # the start of a game is played by the other agent
+    start = PlayerInfo(GameState(random.Random(2)), 0)
+    assert tablebase.move_scores(start) is None
+    assert agent.generate_move(start) in start.player.get_legal_moves(Move.OK)
+    assert agent.delegated == 1
+    assert agent.generate_give_card(info, Card.JACK) == Card.JACK
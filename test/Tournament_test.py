@@ -0,0 +1,95 @@
+from WorldConflict.Tournament import Tournament, MatchTask, play_match, round_robin, gauntlet
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.MCTSAgent import MCTSAgent
+from WorldConflict.AgentRegistry import create_agent
+from WorldConflict.run_tournament import main
+from functools import partial
+import random
+
+def test_schedules():
+    assert round_robin(["a", "b", "c"]) == [("a", "b"), ("a", "c"), ("b", "c")]
+    assert gauntlet("b", ["a", "b", "c"]) == [("b", "a"), ("b", "c")]
+
+def test_tasks_split_and_alternate():
+    tournament = Tournament({"a": RandomAgent, "b": RandomAgent}, games_per_match=250, chunk_size=100, workers=1, seed=5)
+
+    tasks = tournament.tasks([("a", "b")])
+
+    assert [task.games for task in tasks] == [100, 100, 50]
+    assert [task.swap_seats for task in tasks] == [False, True, False]
+    assert len({task.seed for task in tasks}) == 3
+
+class SeatRecordingAgent(RandomAgent):
+    """Random agent remembering the seat of every move it made"""
+    seats = []
+
+    def generate_move(self, state):
+        SeatRecordingAgent.seats.append(state.playerId)
+        return super().generate_move(state)
+
+def test_seats_alternate_within_a_chunk():
+    SeatRecordingAgent.seats.clear()
+    tournament = Tournament({"a": SeatRecordingAgent, "b": RandomAgent}, games_per_match=10, chunk_size=100,
+                            workers=1, seed=5)
+
+    tasks = tournament.tasks([("a", "b")])
+    assert len(tasks) == 1
+    tournament.run([("a", "b")])
+
+    assert set(SeatRecordingAgent.seats) == {0, 1}
+    assert tournament.results[("a", "b")].games == 10
+
+def test_play_match():
+    task = MatchTask("a", RandomAgent, "b", RandomAgent, 50, True, 11)
+
+    result = play_match(task)
+
+    assert (result.first, result.second) == ("a", "b")
+    assert result.games == 50
+    assert result.plies >= 100
+
+def test_play_match_reproducible():
+    task = MatchTask("a", RandomAgent, "b", RandomAgent, 50, False, 11)
+
+    result1 = play_match(task)
+    result2 = play_match(task)
+
+    assert (result1.first_wins, result1.second_wins, result1.draws, result1.plies) == \
+        (result2.first_wins, result2.second_wins, result2.draws, result2.plies)
+
+def test_play_match_keeps_random_module_state():
+    random.seed(3)
+    expected = random.random()
+    random.seed(3)
+
+    result = play_match(MatchTask("a", RandomAgent, "b", partial(MCTSAgent, iterations=5), 5, False, 11))
+
+    assert result.games == 5
+    assert random.random() == expected
+
+def test_create_agent_seeds():
+    assert create_agent(RandomAgent, 4).rng.random() == RandomAgent(4).rng.random()
+    assert create_agent(partial(MCTSAgent, beliefs=True), 4).rng.random() == MCTSAgent(seed=4).rng.random()
+
+    class Unseeded(RandomAgent):
+        def __init__(self) -> None:
+            super().__init__(0)
+    assert isinstance(create_agent(Unseeded, 4), Unseeded)
+
+def test_standings_merge():
+    roster = {"a": RandomAgent, "b": RandomAgent, "c": RandomAgent}
+    tournament = Tournament(roster, games_per_match=60, chunk_size=25, workers=2, seed=1)
+
+    standings = tournament.run(round_robin(list(roster)))
+
+    assert len(tournament.results) == 3
+    assert all(result.games == 60 for result in tournament.results.values())
+    assert [standing.games for standing in standings] == [120, 120, 120]
+    assert sum(standing.wins for standing in standings) == sum(standing.losses for standing in standings)
+    assert standings[0].score_rate >= standings[-1].score_rate
+
+def test_cli(capsys):
+    tournament = main(["random", "random", "-n", "20", "-j", "1", "--gauntlet"])
+
+    assert list(tournament.roster) == ["random", "random#2"]
+    assert "STANDINGS" in capsys.readouterr().out
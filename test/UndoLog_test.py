@@ -0,0 +1,101 @@
+from WorldConflict.Game import Game, take_move, GAME_ENDED
+from WorldConflict.GameState import GameState
+from WorldConflict.UndoLog import UndoLog
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.CardDeck import DeckExhaustedError
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import pytest
+
+def snapshot(game_state: GameState) -> tuple:
+    return (
+        [(list(player.cards), player.money) for player in game_state.players],
+        list(game_state.deck.drawPile),
+        list(game_state.deck.discardPile),
+        list(game_state.current_sequence),
+        game_state.initial_player,
+        game_state.turn_player,
+        list(game_state.score),
+    )
+
+def test_apply_undo_random_games():
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=5)
+
+    for _ in range(100):
+        game.new_game()
+        state = game.game_state
+        history = [snapshot(state)]
+        ended = False
+        while not ended:
+            try:
+                ended = game.apply(take_move(state, state.players[state.turn_player], game.agents[state.turn_player]))
+            except DeckExhaustedError:
+                game.undo()
+                break
+            history.append(snapshot(state))
+
+        while history:
+            assert snapshot(state) == history.pop()
+            if history:
+                game.undo()
+
+        assert len(game.undo_log) == 0
+        assert game.undo_log.entries == []
+
+def test_apply_matches_make_move():
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=8)
+    plain = Game([RandomAgent(1), RandomAgent(2)], seed=8)
+
+    for _ in range(200):
+        state = game.game_state
+        move = take_move(state, state.players[state.turn_player], game.agents[state.turn_player])
+        plain_state = plain.game_state
+        assert take_move(plain_state, plain_state.players[plain_state.turn_player], plain.agents[plain_state.turn_player]) == move
+
+        try:
+            ended = game.apply(move)
+            assert plain.make_move(move) == ended
+        except DeckExhaustedError:
+            # the plain game runs out of cards at the same point of the move
+            with pytest.raises(DeckExhaustedError):
+                plain.make_move(move)
+            ended = True
+        assert snapshot(game.game_state) == snapshot(plain.game_state)
+
+        if ended:
+            game.new_game()
+            plain.new_game()
+
+def test_undo_bluff_call():
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=0)
+    state = game.game_state
+    state.players[0].cards = [Card.QUEEN, Card.ACE]
+    state.players[1].cards = [Card.TWO, Card.KING]
+    state.initial_player = state.turn_player = 0
+    state.deck.drawPile = [Card.JACK, Card.KING]
+    before = snapshot(state)
+
+    game.apply(Move.PLAY_TWO)
+    game.apply(Move.CALL_BLUFF)
+
+    assert snapshot(state) != before
+    assert state.players[0].journal is None and state.deck.journal is None
+
+    game.undo()
+    game.undo()
+
+    assert snapshot(state) == before
+
+def test_undo_forfeit():
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=0)
+    before = snapshot(game.game_state)
+
+    assert game.apply(Move.FORFEIT) == GAME_ENDED
+    game.undo()
+
+    assert snapshot(game.game_state) == before
+
+def test_undo_empty():
+    with pytest.raises(RuntimeError):
+        UndoLog().undo()
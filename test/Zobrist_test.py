@@ -0,0 +1,154 @@
+from WorldConflict.Game import Game, take_move
+from WorldConflict.GameState import GameState
+from WorldConflict.RandomAgent import RandomAgent
+from WorldConflict.CardDeck import CardDeck, DeckExhaustedError
+from WorldConflict.PackedState import pack_state, unpack_state
+from WorldConflict.Zobrist import TranspositionTable
+from WorldConflict.Hand import Hand
+from WorldConflict.Card import Card
+from WorldConflict.Move import Move
+
+import random
+
+def scratch_hash(state: GameState) -> int:
+    """Hash of a copy whose hands and deck hashes are computed from scratch"""
+    copy = GameState(random.Random(0))
+    for player, source in zip(copy.players, state.players):
+        player.cards = Hand(list(source.cards))
+        player.money = source.money
+    copy.deck.drawPile = list(state.deck.drawPile)
+    copy.deck.discardPile = list(state.deck.discardPile)
+    copy.current_sequence = list(state.current_sequence)
+    copy.initial_player = state.initial_player
+    copy.turn_player = state.turn_player
+    return copy.rehash()
+
+def test_incremental_hash_matches_scratch():
+    game = Game([RandomAgent(1), RandomAgent(2)], seed=3)
+    for _ in range(30):
+        game.new_game()
+        state = game.game_state
+        ended = False
+        while not ended:
+            assert state.zobrist() == scratch_hash(state)
+            try:
+                ended = game.make_move(take_move(state, state.players[state.turn_player], game.agents[state.turn_player]))
+            except DeckExhaustedError:
+                break
+
+def test_undo_restores_hash():
+    game = Game([RandomAgent(4), RandomAgent(5)], seed=6)
+    for _ in range(30):
+        game.new_game()
+        state = game.game_state
+        history = [state.zobrist()]
+        ended = False
+        while not ended:
+            try:
+                ended = game.apply(take_move(state, state.players[state.turn_player], game.agents[state.turn_player]))
+            except DeckExhaustedError:
+                game.undo()
+                break
+            history.append(state.zobrist())
+
+        while history:
+            assert state.zobrist() == history.pop()
+            if history:
+                game.undo()
+
+def test_hash_distinguishes_positions():
+    state = GameState(random.Random(1))
+    base = state.rehash()
+
+    state.players[0].money += 1
+    assert state.zobrist() != base
+    state.players[0].money -= 1
+    assert state.zobrist() == base
+
+    state.turn_player ^= 1
+    assert state.zobrist() != base
+    state.turn_player ^= 1
+
+    state.current_sequence.append(Move.PLAY_KING)
+    assert state.zobrist() != base
+    state.current_sequence.clear()
+
+    # the same cards in the other seat's hand
+    state.players[0].cards.append(Card.ACE)
+    first = state.zobrist()
+    state.players[0].cards.remove(Card.ACE)
+    state.players[1].cards.append(Card.ACE)
+    assert state.zobrist() not in (base, first)
+    state.players[1].cards.remove(Card.ACE)
+    assert state.zobrist() == base
+
+def test_unpacked_state_hashes_the_same():
+    game = Game([RandomAgent(7), RandomAgent(8)], seed=9)
+    state = game.game_state
+    for _ in range(20):
+        try:
+            if game.make_move(take_move(state, state.players[state.turn_player], game.agents[state.turn_player])):
+                break
+        except DeckExhaustedError:
+            break
+    assert unpack_state(pack_state(state)).zobrist() == state.zobrist()
+
+def test_discard_hash_counts_cards():
+    deck = CardDeck(random.Random(2))
+    empty = deck.zobrist
+    for _ in range(100):
+        deck.discard(Card.KING)
+    assert deck.zobrist == deck.rehash()
+    for _ in range(100):
+        deck.undiscard()
+    assert deck.zobrist == empty
+
+def test_table_probe_and_store():
+    table = TranspositionTable(4)
+    assert len(table) == 16
+    assert table.probe(0x1234) is None
+    assert table.store(0x1234, 2, "a")
+    assert table.probe(0x1234) == "a"
+    assert table.probe(0x1234, depth=2) == "a"
+    assert table.probe(0x1234, depth=3) is None
+    assert table.hits == 2 and table.probes == 4
+
+def test_table_replaces_by_depth():
+    table = TranspositionTable(4)
+    table.store(0x10, 3, "deep")
+    # same slot, another position searched less deep
+    assert not table.store(0x20, 1, "shallow")
+    assert table.probe(0x10) == "deep"
+    assert table.probe(0x20) is None
+    assert table.store(0x20, 3, "as deep")
+    assert table.probe(0x10) is None
+    assert table.probe(0x20) == "as deep"
+    # the same position is always refreshed
+    assert table.store(0x20, 0, "new")
+    assert table.probe(0x20) == "new"
+
+    table.clear()
+    assert table.probe(0x20) is None
+    assert table.probes == 1
+
+def test_information_hash_ignores_hidden_cards():
+    state = GameState(random.Random(1))
+    state.players[1].cards = Hand([Card.ACE, Card.KING])
+    state.deck.drawPile = [Card.TWO, Card.QUEEN, Card.JACK]
+    state.rehash()
+    seen = state.information_zobrist(0)
+    opponent_view = state.information_zobrist(1)
+
+    # another deal of the cards the first player cannot see
+    state.players[1].cards = Hand([Card.TWO, Card.JACK])
+    state.deck.drawPile = [Card.KING, Card.ACE, Card.QUEEN]
+    state.rehash()
+    assert state.information_zobrist(0) == seen
+    assert state.information_zobrist(1) != opponent_view
+
+    state.players[0].money += 1
+    assert state.information_zobrist(0) != seen
+    state.players[0].money -= 1
+    # the size of the hidden hand is seen
+    state.players[1].cards.remove(Card.JACK)
+    assert state.information_zobrist(0) != seen